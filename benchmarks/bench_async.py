@@ -0,0 +1,69 @@
+"""
+API throughput with a blocking vs an async search path
+
+    python benchmarks/bench_async.py --requests 200 --latency 0.05
+
+Both apps answer /api/v1/search against a local fake Hub with a fixed
+per-request latency. The blocking app calls ``thermal_search`` inside an
+``async def`` handler, as the API used to; the async app is the real one,
+awaiting ``async_thermal_search``. Every query is distinct and the result
+cache is disabled, so each request reaches the Hub.
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+import httpx
+from fake_hub import serve
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.05)
+    args = parser.parse_args()
+
+    with serve(latency=args.latency) as hub, tempfile.TemporaryDirectory() as tmp:
+        # Read when huggingface_hub and thermal_scout are imported
+        os.environ["HF_ENDPOINT"] = hub.url
+        os.environ["THERMAL_SCOUT_INDEX"] = tmp
+        os.environ["THERMAL_SCOUT_CACHE_TTL"] = "0"
+
+        from fastapi import FastAPI
+
+        from thermal_scout.api.main import app
+        from thermal_scout.search import thermal_search
+
+        blocking = FastAPI()
+
+        @blocking.get("/api/v1/search")
+        async def search_blocking(q: str, limit: int = 10):
+            return {"models": thermal_search(q, limit=limit)}
+
+        queries = [f"{n}" for n in range(args.requests)]
+        for name, target in [("blocking", blocking), ("async", app)]:
+            elapsed = asyncio.run(burst(target, queries))
+            print(
+                f"{name:<10} {elapsed:6.2f}s  "
+                f"{len(queries) / elapsed:8.1f} req/s  "
+                f"({len(queries)} requests, {args.latency * 1e3:.0f}ms Hub latency)"
+            )
+
+
+async def burst(app, queries: list[str]) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://api") as client:
+        start = time.perf_counter()
+        responses = await asyncio.gather(
+            *(client.get("/api/v1/search", params={"q": q}) for q in queries)
+        )
+        elapsed = time.perf_counter() - start
+    assert all(r.status_code == 200 for r in responses)
+    return elapsed
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Per-model cost of thermal classification, against the original classifier
+
+    python benchmarks/bench_classify.py --rows 1000000
+"""
+
+import argparse
+import time
+
+from reference import reference_estimate_thermal_cost
+from synthetic import synthetic_models
+
+from thermal_scout.thermal import classify_batch, estimate_thermal_cost
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    models = synthetic_models(args.rows)
+
+    start = time.perf_counter()
+    original = [reference_estimate_thermal_cost(model) for model in models]
+    baseline = time.perf_counter() - start
+
+    start = time.perf_counter()
+    one_by_one = [estimate_thermal_cost(model) for model in models]
+    per_model = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batched = classify_batch(models)
+    batch = time.perf_counter() - start
+
+    assert original == one_by_one == batched
+    for name, elapsed in [
+        ("original (baseline)", baseline),
+        ("estimate_thermal_cost", per_model),
+        ("classify_batch", batch),
+    ]:
+        print(
+            f"{name:<24} {elapsed:6.2f}s  "
+            f"{elapsed / args.rows * 1e9:7.0f} ns/model  "
+            f"{args.rows / elapsed:12,.0f} models/s  "
+            f"{baseline / elapsed:5.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
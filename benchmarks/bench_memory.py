@@ -0,0 +1,93 @@
+"""
+Memory held per search result: dicts against ``ModelRecord``
+
+    python benchmarks/bench_memory.py --rows 100000
+
+Results are decoded from JSON as the Hub sends them, so every string is its
+own object as it was in the old result dicts, and tags look like the Hub's:
+library and license tags, a region, arXiv papers and base models. The
+records are built from the same dicts, which are then dropped. Both counts
+include the model id strings, which the records keep as they are.
+"""
+
+import argparse
+import gc
+import json
+import random
+import sys
+import tracemalloc
+from collections.abc import Callable
+from typing import Any
+
+from synthetic import FAMILIES, synthetic_models
+
+from thermal_scout.records import ModelRecord
+from thermal_scout.thermal import classify_batch
+
+HUB_TAGS = [
+    "license:apache-2.0",
+    "license:mit",
+    "region:us",
+    "endpoints_compatible",
+    "autotrain_compatible",
+    "text-generation-inference",
+    "en",
+    "conversational",
+]
+
+# Distinct arXiv papers cited by the listing
+PAPERS = 5000
+
+
+def hub_listing(rows: int, seed: int = 0) -> list[str]:
+    """``rows`` classified models as JSON documents"""
+    rng = random.Random(seed)
+    models = synthetic_models(rows, seed)
+    for model, thermal_cost in zip(models, classify_batch(models), strict=True):
+        model["tags"] += rng.sample(HUB_TAGS, rng.randint(3, 6))
+        paper = rng.randrange(PAPERS)
+        model["tags"].append(f"arxiv:{2301 + paper // 10000}.{paper % 10000:05d}")
+        model["tags"].append(f"base_model:{rng.choice(FAMILIES)}-{rng.randrange(50)}")
+        model["parameters"] = rng.choice([None, rng.randint(10**6, 10**11)])
+        model["thermal_cost"] = thermal_cost
+    return [json.dumps(model) for model in models]
+
+
+def retained(build: Callable[[], list[Any]]) -> tuple[int, list[Any]]:
+    """Bytes still allocated by ``build``'s result once it returns"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return after - before, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    listing = hub_listing(args.rows)
+
+    dict_bytes, dicts = retained(lambda: [json.loads(doc) for doc in listing])
+    record_bytes, records = retained(
+        lambda: [ModelRecord.from_mapping(json.loads(doc)) for doc in listing]
+    )
+    assert records == dicts
+    ids = sum(sys.getsizeof(model["modelId"]) for model in dicts) / args.rows
+
+    per_dict = dict_bytes / args.rows
+    per_record = record_bytes / args.rows
+    print(f"dict          {per_dict:7.0f} bytes/model")
+    print(f"ModelRecord   {per_record:7.0f} bytes/model  {per_dict / per_record:.1f}x")
+    print(
+        f"  without ids {per_dict - ids:7.0f} -> {per_record - ids:.0f} bytes/model  "
+        f"{(per_dict - ids) / (per_record - ids):.1f}x"
+    )
+
+
+if __name__ == "__main__":
+    main()
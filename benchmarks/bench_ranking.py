@@ -0,0 +1,50 @@
+"""
+Top-k ranking against a full sort
+
+    python benchmarks/bench_ranking.py --rows 1000000 --k 50
+
+``Ranking.top_k`` keeps a heap of ``k`` results, O(n log k); the baseline
+sorts everything, O(n log n), and slices. Both must pick the same models.
+"""
+
+import argparse
+import time
+
+from synthetic import synthetic_models
+
+from thermal_scout.ranking import parse_sort
+from thermal_scout.thermal import classify_batch
+
+ORDERS = ["thermal,downloads", "likes", "thermal,likes*recency", "relevance"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--k", type=int, default=50)
+    args = parser.parse_args()
+
+    models = synthetic_models(args.rows)
+    for model, thermal_cost in zip(models, classify_batch(models), strict=True):
+        model["thermal_cost"] = thermal_cost
+
+    for order in ORDERS:
+        ranking = parse_sort(order, query="llama instruct")
+
+        start = time.perf_counter()
+        expected = sorted(models, key=ranking.key, reverse=True)[: args.k]
+        full = time.perf_counter() - start
+
+        start = time.perf_counter()
+        top = ranking.top_k(models, args.k)
+        heap = time.perf_counter() - start
+
+        assert top == expected
+        print(
+            f"{order:<24} sort {full:6.2f}s  top_k {heap:6.2f}s  "
+            f"{args.rows / heap:12,.0f} models/s  {full / heap:4.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
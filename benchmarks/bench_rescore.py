@@ -0,0 +1,59 @@
+"""
+Re-tiering a whole snapshot when the thermal thresholds change
+
+    python benchmarks/bench_rescore.py --rows 1000000
+
+Parsing happens once (``thermal_features``); each threshold change is then a
+handful of NumPy passes over the feature columns.
+"""
+
+import argparse
+import time
+
+import numpy as np
+from synthetic import synthetic_models
+
+from thermal_scout.thermal import (
+    THERMAL_ORDER,
+    ThermalThresholds,
+    classify_batch,
+    thermal_features,
+    thermal_levels,
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    models = synthetic_models(args.rows)
+
+    start = time.perf_counter()
+    features = thermal_features(models)
+    parse = time.perf_counter() - start
+
+    expected = np.asarray([THERMAL_ORDER[c] for c in classify_batch(models)])
+    assert (thermal_levels(features) == expected).all()
+
+    variants = [
+        ThermalThresholds(),
+        ThermalThresholds(low_max=2, medium_max=4),
+        ThermalThresholds(param_bins=((0, 1), (1e9, 3), (7e9, 4), (30e9, 6))),
+    ]
+    print(f"parse once               {parse:6.2f}s")
+    for thresholds in variants:
+        best = float("inf")
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            thermal_levels(features, thresholds)
+            best = min(best, time.perf_counter() - start)
+        print(
+            f"rescore                  {best * 1e3:6.1f}ms  "
+            f"{best / args.rows * 1e9:5.1f} ns/model  {thresholds}"
+        )
+
+
+if __name__ == "__main__":
+    main()
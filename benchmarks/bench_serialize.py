@@ -0,0 +1,98 @@
+"""
+Encoding a /api/v1/search body: Pydantic models against direct JSON
+
+    python benchmarks/bench_serialize.py --limit 100
+
+The baseline is the path the endpoint used to take: a ``ModelInfo`` per
+result and a ``SearchResponse``, which FastAPI dumps, validates against the
+response model, serializes and encodes. ``search_body`` encodes the records
+in one pass; a ``cached_search_body`` hit reuses the bytes. All three must
+produce the same JSON.
+"""
+
+import argparse
+import json
+import time
+from collections.abc import Callable
+
+from synthetic import synthetic_models
+
+from thermal_scout.api.encoding import cached_search_body, response_cache, search_body
+from thermal_scout.api.main import ModelInfo, SearchResponse
+from thermal_scout.records import ModelRecord
+from thermal_scout.thermal import classify_batch
+
+
+def pydantic_body(results: list[ModelRecord], query: str, limit: int) -> bytes:
+    response = SearchResponse(
+        models=[
+            ModelInfo(
+                modelId=model["modelId"],
+                downloads=model.get("downloads", 0),
+                likes=model.get("likes", 0),
+                tags=model.get("tags", []),
+                pipeline_tag=model.get("pipeline_tag"),
+                library_name=model.get("library_name"),
+                parameters=model.get("parameters"),
+                thermal_cost=model.get("thermal_cost", "Unknown"),
+            )
+            for model in results
+        ],
+        query=query,
+        limit=limit,
+        thermal_aware=True,
+    )
+    # What FastAPI does with a response_model: dump, validate, serialize, encode
+    validated = SearchResponse.model_validate(response.model_dump())
+    content = validated.model_dump(mode="json")
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def best_of(run: Callable[[], bytes], repeat: int, number: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            run()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--number", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    models = synthetic_models(args.limit)
+    results = [
+        ModelRecord.from_mapping(model, thermal_cost)
+        for model, thermal_cost in zip(models, classify_batch(models), strict=True)
+    ]
+    query, key = "bert", ("bert", args.limit)
+
+    cases = [
+        ("pydantic", lambda: pydantic_body(results, query, args.limit)),
+        ("search_body", lambda: search_body(results, query, args.limit, True)),
+        (
+            "cached_search_body hit",
+            lambda: cached_search_body(key, results, query, args.limit, True).body,
+        ),
+    ]
+    bodies = {name: run() for name, run in cases}
+    assert len({json.dumps(json.loads(body)) for body in bodies.values()}) == 1
+    assert len(response_cache) == 1
+
+    baseline = None
+    for name, run in cases:
+        seconds = best_of(run, args.repeat, args.number)
+        baseline = baseline or seconds
+        print(
+            f"{name:<24} {seconds * 1e6:8.1f} us/response  "
+            f"{baseline / seconds:5.1f}x  ({len(bodies[name]):,} bytes)"
+        )
+
+
+if __name__ == "__main__":
+    main()
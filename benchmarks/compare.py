@@ -0,0 +1,69 @@
+"""
+Compare two benchmark suite results
+
+    python benchmarks/compare.py results/abc1234.json results/def5678.json
+
+Prints every metric of the two runs side by side and exits with status 1
+when one got worse by more than ``--threshold`` (latencies and per-model
+costs up, throughputs down).
+"""
+
+import argparse
+import json
+import sys
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+# Metric name suffixes where a larger value is worse
+LOWER_IS_BETTER = ("_ms", "ns_per_model")
+HIGHER_IS_BETTER = ("per_second",)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("baseline", type=Path)
+    parser.add_argument("candidate", type=Path)
+    parser.add_argument("--threshold", type=float, default=0.10)
+    args = parser.parse_args()
+
+    baseline = json.loads(args.baseline.read_text())
+    candidate = json.loads(args.candidate.read_text())
+    print(f"{baseline.get('commit')} -> {candidate.get('commit')}\n")
+
+    old = dict(metrics(baseline))
+    regressions = 0
+    for name, new in metrics(candidate):
+        if name not in old:
+            continue
+        change = new / old[name] - 1 if old[name] else 0.0
+        worse = change if name.endswith(LOWER_IS_BETTER) else -change
+        flag = ""
+        if worse > args.threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        elif worse < -args.threshold:
+            flag = "  improved"
+        print(f"{name:<52} {old[name]:12.2f} {new:12.2f} {change:+8.1%}{flag}")
+
+    if regressions:
+        print(f"\n{regressions} metric(s) regressed by more than {args.threshold:.0%}")
+        sys.exit(1)
+
+
+def metrics(results: dict[str, Any], prefix: str = "") -> Iterator[tuple[str, float]]:
+    """(dotted name, value) for every compared metric in ``results``"""
+    for key, value in results.items():
+        name = f"{prefix}{key}"
+        if key == "parameters":
+            continue
+        if isinstance(value, dict):
+            yield from metrics(value, f"{name}.")
+        elif isinstance(value, int | float) and name.endswith(
+            LOWER_IS_BETTER + HIGHER_IS_BETTER
+        ):
+            yield name, value
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Local stand-in for the Hub's model endpoints, for benchmarks
+
+Serves ``synthetic_models`` at ``/api/models`` (search, filter, limit) and
+``/api/models/{id}`` with a fixed per-request latency, from a thread per
+connection so concurrent clients overlap like they would against the Hub.
+Listings are paged like the Hub's: a full page links to the next one with
+a ``cursor`` in its ``Link`` header. The same seed always serves the same
+models.
+"""
+
+import json
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import parse_qsl, unquote, urlencode, urlparse
+
+from synthetic import synthetic_models
+
+
+def hub_json(model: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "id": model["modelId"],
+        "downloads": model["downloads"],
+        "likes": model["likes"],
+        "tags": model["tags"],
+        "pipeline_tag": model["pipeline_tag"],
+        "library_name": model["library_name"],
+        # The Hub's own format, which huggingface_hub parses strictly
+        "lastModified": datetime.fromisoformat(model["lastModified"]).strftime(
+            "%Y-%m-%dT%H:%M:%S.000Z"
+        ),
+    }
+
+
+class FakeHub(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, models: list[dict[str, Any]], latency: float = 0.0):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.models = sorted(models, key=lambda m: -m["downloads"])
+        self.by_id = {m["modelId"]: m for m in models}
+        self.latency = latency
+        self.requests = 0
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: FakeHub
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def do_GET(self) -> None:
+        hub = self.server
+        hub.requests += 1
+        if hub.latency:
+            time.sleep(hub.latency)
+
+        url = urlparse(self.path)
+        pairs = parse_qsl(url.query)
+        params = dict(pairs)
+        if url.path == "/api/models":
+            search = params.get("search", "").lower()
+            task = params.get("filter")
+            limit = int(params.get("limit", 1000))
+            start = int(params.get("cursor", 0))
+            found = []
+            position = start
+            for position in range(start, len(hub.models)):
+                model = hub.models[position]
+                if search in model["modelId"].lower() and (
+                    task is None or model["pipeline_tag"] == task
+                ):
+                    found.append(hub_json(model))
+                    if len(found) >= limit:
+                        break
+            headers = {}
+            if len(found) >= limit and position + 1 < len(hub.models):
+                query = [(k, v) for k, v in pairs if k != "cursor"]
+                query.append(("cursor", str(position + 1)))
+                next_url = f"{hub.url}/api/models?{urlencode(query)}"
+                headers["Link"] = f'<{next_url}>; rel="next"'
+            self._send(200, found, headers)
+        elif url.path.startswith("/api/models/"):
+            model_id = unquote(url.path.removeprefix("/api/models/"))
+            model_id = model_id.partition("/revision/")[0]
+            model = hub.by_id.get(model_id)
+            if model is None:
+                self._send(404, {"error": "Repository not found"})
+            else:
+                self._send(200, hub_json(model))
+        else:
+            self._send(404, {"error": "Not found"})
+
+    def _send(
+        self, status: int, body: Any, headers: dict[str, str] | None = None
+    ) -> None:
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+@contextmanager
+def serve(
+    count: int = 10_000, latency: float = 0.0, seed: int = 0
+) -> Iterator[FakeHub]:
+    """Run a ``FakeHub`` with ``count`` synthetic models in a background thread"""
+    hub = FakeHub(synthetic_models(count, seed=seed), latency=latency)
+    thread = threading.Thread(target=hub.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield hub
+    finally:
+        hub.shutdown()
+        hub.server_close()
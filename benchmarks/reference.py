@@ -0,0 +1,58 @@
+"""
+The thermal classifier as it was before it was precompiled
+
+The baseline ``bench_classify`` and the suite time ``estimate_thermal_cost``
+and ``classify_batch`` against; the same code is the oracle of the
+differential test in ``tests/test_thermal.py``.
+"""
+
+import re
+from typing import Any
+
+SIZE_PATTERNS = {
+    "tiny": 1,
+    "small": 1,
+    "base": 3,
+    "large": 4,
+    "xl": 5,
+    "xxl": 6,
+}
+
+PARAM_PATTERNS = [
+    (r"(?:^|-)(\d{2,})b(?:$|-)", 5),
+    (r"(?:^|-)([7-9])b(?:$|-)", 4),
+    (r"(?:^|-)([4-6])b(?:$|-)", 4),
+    (r"(?:^|-)([1-3])b(?:$|-)", 3),
+    (r"(?:^|-)(\d+)b(?:$|-)", 4),
+    (r"(?:^|-)(\d+)m(?:$|-)", 1),
+]
+
+
+def reference_estimate_thermal_cost(model_info: dict[str, Any]) -> str:
+    """The original one-regex-at-a-time classifier"""
+    model_id = model_info.get("modelId", "").lower()
+    tags = [tag.lower() for tag in model_info.get("tags", [])]
+
+    thermal_score = 3
+    for pattern, score in SIZE_PATTERNS.items():
+        if pattern in model_id:
+            thermal_score = score
+            break
+    for pattern, score in PARAM_PATTERNS:
+        if re.search(pattern, model_id):
+            thermal_score = score
+            break
+
+    if any("tiny" in tag for tag in tags):
+        thermal_score = 1
+    elif any("efficient" in tag or "distil" in tag for tag in tags):
+        thermal_score = max(1, thermal_score - 2)
+    elif any("large" in tag or "xxl" in tag for tag in tags):
+        thermal_score = max(thermal_score, 5)
+
+    if thermal_score <= 1:
+        return "Low"
+    elif thermal_score <= 3:
+        return "Medium"
+    else:
+        return "High"
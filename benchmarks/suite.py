@@ -0,0 +1,230 @@
+"""
+Benchmark suite: classification, end-to-end search and API throughput
+
+    python benchmarks/suite.py                      # writes results/<commit>.json
+    python benchmarks/suite.py --only classify,api --output run.json
+    python benchmarks/compare.py results/abc1234.json results/def5678.json
+
+Everything runs against a local ``fake_hub`` serving deterministic synthetic
+listings with a fixed per-request latency, so runs are comparable between
+commits on the same machine. The search cache is disabled, so every search
+reaches the fake Hub.
+
+- ``classify``: ``estimate_thermal_cost`` and ``classify_batch`` per model,
+  and the original classifier they replaced as the baseline
+- ``search``: ``thermal_search`` latency, one search at a time, plain,
+  thermal-filtered and with a ``sort`` order
+- ``api``: ``/api/v1/search`` requests/sec and latency with ``--concurrency``
+  requests in flight, in process over ASGI
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+from fake_hub import serve
+from synthetic import FAMILIES, synthetic_models
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+SECTIONS = ["classify", "search", "api"]
+
+# (name, thermal_search keyword arguments)
+SEARCH_CASES = [
+    ("plain", {"limit": 10}),
+    ("max_thermal=Low", {"limit": 10, "tiers": {"Low"}}),
+    ("sort=thermal,likes", {"limit": 10, "sort": "thermal,likes", "budget": 200}),
+]
+
+QUERIES = ["", *FAMILIES]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--only", default=",".join(SECTIONS))
+    parser.add_argument("--output", type=Path)
+    parser.add_argument("--models", type=int, default=20_000, help="Fake Hub size")
+    parser.add_argument("--latency", type=float, default=0.005, help="Seconds")
+    parser.add_argument("--classify-rows", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=3, help="Best of, classify")
+    parser.add_argument("--searches", type=int, default=100, help="Per case")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+
+    sections = args.only.split(",")
+    unknown = set(sections) - set(SECTIONS)
+    if unknown:
+        parser.error(f"unknown sections: {', '.join(sorted(unknown))}")
+
+    commit = _git("rev-parse", "--short", "HEAD")
+    results: dict[str, Any] = {
+        "commit": commit,
+        "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+        "date": datetime.now(UTC).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": f"{platform.system()} {platform.machine()}",
+        "parameters": {
+            name: value for name, value in vars(args).items() if name != "output"
+        },
+    }
+
+    with serve(count=args.models, latency=args.latency) as hub:
+        _configure(hub.url)
+        if "classify" in sections:
+            results["classify"] = bench_classify(args.classify_rows, args.repeat)
+        if "search" in sections:
+            results["search"] = bench_search(args.searches)
+        if "api" in sections:
+            results["api"] = asyncio.run(bench_api(args.requests, args.concurrency))
+        results["hub_requests"] = hub.requests
+
+    output = args.output or RESULTS_DIR / f"{commit or 'unknown'}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2) + "\n")
+    print(f"\nWrote {output}")
+
+
+def _configure(hub_url: str) -> None:
+    """Point Thermal Scout at the fake Hub, with no index and no caches"""
+    state = tempfile.mkdtemp(prefix="thermal-scout-bench-")
+    # Read when huggingface_hub and thermal_scout are first imported
+    os.environ["HF_ENDPOINT"] = hub_url
+    os.environ["THERMAL_SCOUT_CACHE_DIR"] = state
+    os.environ["THERMAL_SCOUT_INDEX"] = str(Path(state) / "index")
+    os.environ["THERMAL_SCOUT_CACHE_TTL"] = "0"
+
+
+def bench_classify(rows: int, repeat: int) -> dict[str, Any]:
+    from reference import reference_estimate_thermal_cost
+
+    from thermal_scout.thermal import classify_batch, estimate_thermal_cost
+
+    models = synthetic_models(rows)
+    results = {}
+    for name, run in [
+        ("original", lambda: [reference_estimate_thermal_cost(m) for m in models]),
+        ("estimate_thermal_cost", lambda: [estimate_thermal_cost(m) for m in models]),
+        ("classify_batch", lambda: classify_batch(models)),
+    ]:
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            run()
+            timings.append(time.perf_counter() - start)
+        elapsed = min(timings)
+        results[name] = {
+            "rows": rows,
+            "ns_per_model": elapsed / rows * 1e9,
+            "models_per_second": rows / elapsed,
+        }
+        print(f"classify {name:<28} {elapsed / rows * 1e9:8.0f} ns/model")
+    return results
+
+
+def bench_search(searches: int) -> dict[str, Any]:
+    from thermal_scout.search import thermal_search
+
+    results = {}
+    for name, kwargs in SEARCH_CASES:
+        latencies = []
+        for n in range(searches):
+            query = QUERIES[n % len(QUERIES)]
+            start = time.perf_counter()
+            found = thermal_search(query, **kwargs)
+            latencies.append(time.perf_counter() - start)
+            if not found and not query:
+                raise RuntimeError(f"search {name!r} found nothing")
+        results[name] = latency_summary(latencies)
+        _print_latency(f"search {name}", results[name])
+    return results
+
+
+async def bench_api(requests: int, concurrency: int) -> dict[str, Any]:
+    import httpx
+
+    from thermal_scout.api.main import app, lifespan
+
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    errors = 0
+
+    async def one(client: httpx.AsyncClient, n: int) -> None:
+        nonlocal errors
+        params = {"q": QUERIES[n % len(QUERIES)], "limit": 10}
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.get("/api/v1/search", params=params)
+            latencies.append(time.perf_counter() - start)
+        if response.status_code != 200:
+            errors += 1
+
+    transport = httpx.ASGITransport(app=app)
+    async with (
+        lifespan(app),
+        httpx.AsyncClient(transport=transport, base_url="http://api") as client,
+    ):
+        # Open the Hub connections before timing
+        await asyncio.gather(*(one(client, n) for n in range(concurrency)))
+        latencies.clear()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one(client, n) for n in range(requests)))
+        elapsed = time.perf_counter() - start
+
+    summary = {
+        "requests": requests,
+        "concurrency": concurrency,
+        "errors": errors,
+        "requests_per_second": requests / elapsed,
+        **latency_summary(latencies),
+    }
+    _print_latency(f"api {summary['requests_per_second']:.1f} req/s", summary)
+    return summary
+
+
+def latency_summary(latencies: list[float]) -> dict[str, float]:
+    """Mean and p50/p95/p99 of ``latencies``, in milliseconds"""
+    cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+    return {
+        "count": len(latencies),
+        "mean_ms": statistics.fmean(latencies) * 1e3,
+        "p50_ms": cuts[49] * 1e3,
+        "p95_ms": cuts[94] * 1e3,
+        "p99_ms": cuts[98] * 1e3,
+    }
+
+
+def _print_latency(name: str, summary: dict[str, float]) -> None:
+    print(
+        f"{name:<37} p50 {summary['p50_ms']:8.2f}ms  "
+        f"p95 {summary['p95_ms']:8.2f}ms  p99 {summary['p99_ms']:8.2f}ms"
+    )
+
+
+def _git(*args: str) -> str | None:
+    try:
+        return subprocess.run(
+            ["git", *args],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+if __name__ == "__main__":
+    main()
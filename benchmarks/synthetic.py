@@ -0,0 +1,37 @@
+"""
+Deterministic synthetic Hub model listings for benchmarks
+"""
+
+import random
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+AUTHORS = ["google", "meta-llama", "mistralai", "Qwen", "microsoft", "openai"]
+FAMILIES = ["bert", "llama", "gpt2", "t5", "roberta", "mistral", "qwen", "phi"]
+SIZES = ["tiny", "small", "base", "large", "xl", "1b", "7b", "13b", "70b", "350m"]
+SUFFIXES = ["instruct", "chat", "uncased", "finetuned", "gguf", "v2"]
+TAGS = ["transformers", "pytorch", "safetensors", "distilled", "text-generation"]
+TASKS = ["text-generation", "text-classification", "fill-mask", None]
+EPOCH = datetime(2025, 1, 1, tzinfo=UTC)
+
+
+def synthetic_models(count: int, seed: int = 0) -> list[dict[str, Any]]:
+    """``count`` model dicts shaped like ``thermal_search`` input"""
+    rng = random.Random(seed)
+    models = []
+    for n in range(count):
+        name = "-".join([rng.choice(FAMILIES), rng.choice(SIZES), rng.choice(SUFFIXES)])
+        models.append(
+            {
+                "modelId": f"{rng.choice(AUTHORS)}/{name}-{n}",
+                "downloads": int(rng.paretovariate(1.2) * 100),
+                "likes": rng.randint(0, 5000),
+                "tags": rng.sample(TAGS, rng.randint(1, 4)),
+                "pipeline_tag": rng.choice(TASKS),
+                "library_name": "transformers",
+                "lastModified": (
+                    EPOCH - timedelta(seconds=rng.randrange(3 * 365 * 86400))
+                ).isoformat(),
+            }
+        )
+    return models
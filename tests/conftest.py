@@ -2,9 +2,208 @@
 Shared pytest fixtures and configuration for thermal-scout tests
 """
 
+import asyncio
+from datetime import UTC, datetime
+from types import SimpleNamespace
 from unittest.mock import Mock
 
+import httpx
 import pytest
+from huggingface_hub.utils import RepositoryNotFoundError
+
+
+class FakeHfApi:
+    """In-memory stand-in for HfApi that serves a fixed model listing"""
+
+    def __init__(self, models=()):
+        self.models = list(models)
+        self.calls = []
+        self.info_calls = []
+        self.fail_after = None
+        self.info_error = None
+        self.latency = 0.0  # per request, when served over HTTP
+
+    def list_models(
+        self, search=None, task=None, sort=None, direction=None, limit=None, **kwargs
+    ):
+        self.calls.append(
+            {"search": search, "task": task, "sort": sort, "limit": limit, **kwargs}
+        )
+        models = self.models
+        if search:
+            models = [m for m in models if search.lower() in m.id.lower()]
+        if task:
+            models = [m for m in models if m.pipeline_tag == task]
+        if sort:
+            attribute = {"lastModified": "last_modified"}.get(sort, sort)
+            models = sorted(
+                models, key=lambda m: getattr(m, attribute), reverse=direction == -1
+            )
+        if limit is not None:
+            models = models[:limit]
+
+        expand = kwargs.get("expand")
+        for served, model in enumerate(models):
+            if self.fail_after is not None and served >= self.fail_after:
+                raise ConnectionError("Hub connection dropped")
+            if expand is not None and "safetensors" not in expand:
+                # Like the Hub, only expanded properties are listed
+                model = SimpleNamespace(**{**vars(model), "safetensors": None})
+            yield model
+
+    def model_info(self, repo_id, revision=None, expand=None, **kwargs):
+        self.info_calls.append({"repo_id": repo_id, "revision": revision})
+        if self.info_error is not None:
+            raise self.info_error
+        for model in self.models:
+            if model.id == repo_id:
+                return model
+        raise RepositoryNotFoundError(f"{repo_id} not found")
+
+
+def model_json(model):
+    """A fake ModelInfo as the Hub's /api/models endpoints serve it"""
+    data = {
+        "id": model.id,
+        "downloads": model.downloads,
+        "likes": model.likes,
+        "tags": model.tags,
+        "pipeline_tag": model.pipeline_tag,
+        "library_name": model.library_name,
+        "lastModified": model.last_modified.strftime("%Y-%m-%dT%H:%M:%S.000Z"),
+        "sha": model.sha,
+    }
+    if model.safetensors is not None:
+        data["safetensors"] = vars(model.safetensors)
+    return data
+
+
+def hub_transport(api):
+    """httpx transport serving ``api`` (a FakeHfApi) over the Hub REST routes"""
+
+    async def handler(request):
+        if api.latency:
+            await asyncio.sleep(api.latency)
+        path = request.url.path
+        params = request.url.params
+        if path == "/api/models":
+            limit = params.get("limit")
+            models = api.list_models(
+                search=params.get("search"),
+                task=params.get("filter"),
+                sort=params.get("sort"),
+                direction=int(params["direction"]) if "direction" in params else None,
+                limit=int(limit) if limit is not None else None,
+                expand=params.get_list("expand") or None,
+            )
+            return httpx.Response(200, json=[model_json(m) for m in models])
+
+        repo_id, _, revision = path.removeprefix("/api/models/").partition("/revision/")
+        try:
+            model = api.model_info(repo_id, revision=revision or None)
+        except RepositoryNotFoundError:
+            return httpx.Response(404, json={"error": "Repository not found"})
+        return httpx.Response(200, json=model_json(model))
+
+    return httpx.MockTransport(handler)
+
+
+def fake_model(model_id, **fields):
+    """A ModelInfo-like object as returned by HfApi.list_models"""
+    defaults = {
+        "downloads": 0,
+        "likes": 0,
+        "tags": [],
+        "pipeline_tag": None,
+        "library_name": None,
+        "last_modified": datetime(2024, 1, 1, tzinfo=UTC),
+        "sha": None,
+        "safetensors": None,
+    }
+    return SimpleNamespace(id=model_id, **{**defaults, **fields})
+
+
+def safetensors(total):
+    """SafeTensorsInfo-like metadata for ``fake_model(..., safetensors=...)``"""
+    return SimpleNamespace(parameters={"BF16": total}, total=total)
+
+
+@pytest.fixture
+def fake_hf_api():
+    """Fake Hub seeded with a small listing"""
+    return FakeHfApi(
+        [
+            fake_model(
+                "google/bert-tiny",
+                downloads=500000,
+                tags=["tiny"],
+                pipeline_tag="text-classification",
+                last_modified=datetime(2024, 1, 1, tzinfo=UTC),
+            ),
+            fake_model(
+                "bert-large-uncased",
+                downloads=2000000,
+                tags=["large"],
+                pipeline_tag="fill-mask",
+                last_modified=datetime(2024, 2, 1, tzinfo=UTC),
+            ),
+            fake_model(
+                "distilbert-base-uncased",
+                downloads=1000000,
+                tags=["distilled"],
+                pipeline_tag="text-classification",
+                last_modified=datetime(2024, 3, 1, tzinfo=UTC),
+            ),
+        ]
+    )
+
+
+@pytest.fixture
+def make_fake_model():
+    """Factory for ModelInfo-like objects"""
+    return fake_model
+
+
+@pytest.fixture
+def fake_async_hub(fake_hf_api, monkeypatch):
+    """Serve ``fake_hf_api`` to async_thermal_search over HTTP"""
+    from thermal_scout.hub import AsyncHubClient
+
+    client = AsyncHubClient("http://hub.test", transport=hub_transport(fake_hf_api))
+    monkeypatch.setattr("thermal_scout.search.get_async_client", lambda: client)
+    monkeypatch.setattr("thermal_scout.details.get_async_client", lambda: client)
+    monkeypatch.setattr("thermal_scout.paging.get_async_client", lambda: client)
+    return fake_hf_api
+
+
+@pytest.fixture
+def make_safetensors():
+    """Factory for SafeTensorsInfo-like metadata"""
+    return safetensors
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache_dir(tmp_path, monkeypatch):
+    """Keep tests away from the user's local index and caches"""
+    monkeypatch.setenv("THERMAL_SCOUT_CACHE_DIR", str(tmp_path / "thermal-scout"))
+    monkeypatch.delenv("THERMAL_SCOUT_INDEX", raising=False)
+    return tmp_path / "thermal-scout"
+
+
+@pytest.fixture(autouse=True)
+def empty_search_cache():
+    """Start every test without cached search results, lookups or responses"""
+    from thermal_scout.api.compression import compressed_cache
+    from thermal_scout.api.encoding import response_cache
+    from thermal_scout.details import details_cache
+    from thermal_scout.search import search_cache
+
+    caches = [search_cache, details_cache, response_cache, compressed_cache]
+    for cache in caches:
+        cache.clear()
+    yield search_cache
+    for cache in caches:
+        cache.clear()
 
 
 @pytest.fixture
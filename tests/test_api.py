@@ -12,8 +12,8 @@ from thermal_scout.api.main import app
 
 
 @pytest.fixture
-def client():
-    """Create a test client for the FastAPI app"""
+def client(fake_async_hub):
+    """Create a test client for the FastAPI app, searching a fake Hub"""
     return TestClient(app)
 
 
@@ -162,7 +162,7 @@ class TestCORSHeaders:
 class TestErrorHandling:
     """Test error handling in API endpoints"""
 
-    @patch("thermal_scout.api.main.thermal_search")
+    @patch("thermal_scout.api.main.async_thermal_search_raising")
     def test_search_endpoint_handles_exceptions(self, mock_search, client):
         """Search endpoint should handle exceptions gracefully"""
         # Mock the search function to raise an exception
@@ -172,52 +172,44 @@ class TestErrorHandling:
         assert response.status_code == 500
         assert "Test error" in response.json()["detail"]
 
-    @patch("thermal_scout.api.main.thermal_search")
-    def test_model_details_handles_empty_results(self, mock_search, client):
+    @patch("thermal_scout.api.main.async_model_details")
+    def test_model_details_handles_empty_results(self, mock_details, client):
         """Model details should return 404 when model not found"""
-        # Mock empty results
-        mock_search.return_value = []
+        # Mock a failed lookup
+        mock_details.return_value = None
 
         response = client.get("/api/v1/models/nonexistent-model")
         assert response.status_code == 404
         assert "nonexistent-model" in response.json()["detail"]
 
-    @patch("thermal_scout.api.main.thermal_search")
-    def test_model_details_finds_exact_match(self, mock_search, client):
-        """Model details should search for exact match if first result doesn't match"""
-        # First call returns wrong model, second call returns correct one
-        mock_search.side_effect = [
-            [{"modelId": "bert-base", "thermal_cost": "Medium"}],  # Wrong model
-            [
-                {"modelId": "bert-base", "thermal_cost": "Medium"},
-                {"modelId": "bert-base-uncased", "thermal_cost": "Medium"},  # Correct model
-            ],
-        ]
+    @patch("thermal_scout.api.main.async_model_details")
+    def test_model_details_looks_up_exact_id(self, mock_details, client):
+        """Model details should look the id up directly"""
+        mock_details.return_value = {
+            "modelId": "bert-base-uncased",
+            "thermal_cost": "Medium",
+        }
 
         response = client.get("/api/v1/models/bert-base-uncased")
         assert response.status_code == 200
         assert response.json()["modelId"] == "bert-base-uncased"
+        mock_details.assert_called_once_with("bert-base-uncased")
 
-    @patch("thermal_scout.api.main.thermal_search")
-    def test_model_details_not_found_after_search(self, mock_search, client):
-        """Model details should return 404 if exact match not found after search"""
-        # Both calls return wrong models
-        mock_search.side_effect = [
-            [{"modelId": "bert-base", "thermal_cost": "Medium"}],  # Wrong model
-            [
-                {"modelId": "bert-base", "thermal_cost": "Medium"},
-                {"modelId": "bert-large", "thermal_cost": "High"},  # Still wrong
-            ],
-        ]
+    @patch("thermal_scout.api.main.async_thermal_search_raising")
+    @patch("thermal_scout.api.main.async_model_details")
+    def test_model_details_does_not_search(self, mock_details, mock_search, client):
+        """Model details should return 404 without falling back to a search"""
+        mock_details.return_value = None
 
         response = client.get("/api/v1/models/bert-base-uncased")
         assert response.status_code == 404
         assert "bert-base-uncased" in response.json()["detail"]
+        mock_search.assert_not_called()
 
-    @patch("thermal_scout.api.main.thermal_search")
-    def test_model_details_handles_general_exceptions(self, mock_search, client):
+    @patch("thermal_scout.api.main.async_model_details")
+    def test_model_details_handles_general_exceptions(self, mock_details, client):
         """Model details should handle general exceptions"""
-        mock_search.side_effect = Exception("Database error")
+        mock_details.side_effect = Exception("Database error")
 
         response = client.get("/api/v1/models/test-model")
         assert response.status_code == 500
@@ -0,0 +1,226 @@
+"""
+Tests for thermal_scout.batch, `thermal-scout batch` and /api/v1/search:batch
+"""
+
+import asyncio
+import json
+import time
+
+from fastapi.testclient import TestClient
+from typer.testing import CliRunner
+
+from thermal_scout.api.main import app
+from thermal_scout.batch import async_batch_search, unique_queries
+from thermal_scout.cli import app as cli_app
+from thermal_scout.config import MAX_BATCH_CONCURRENCY
+
+
+async def collect(results):
+    return [result async for result in results]
+
+
+def run_batch(queries, **kwargs):
+    return asyncio.run(collect(async_batch_search(queries, **kwargs)))
+
+
+def fake_search(record, delay=0.01, fail=()):
+    """An async_thermal_search_raising stand-in that records the searches in flight"""
+    in_flight = 0
+
+    async def search(query, *args):
+        nonlocal in_flight
+        in_flight += 1
+        record["peak"] = max(record.get("peak", 0), in_flight)
+        record.setdefault("queries", []).append(query)
+        try:
+            await asyncio.sleep(delay)
+            if query in fail:
+                raise ConnectionError(f"{query} failed")
+            return [{"modelId": f"{query}-model", "thermal_cost": "Low"}]
+        finally:
+            in_flight -= 1
+
+    return search
+
+
+class TestUniqueQueries:
+    """Test reading queries from lines"""
+
+    def test_strips_and_skips_blank_and_repeated_lines(self):
+        lines = ["bert\n", "\n", "  bert ", "llama\n", "   \n", "bert"]
+
+        assert list(unique_queries(lines)) == ["bert", "llama"]
+
+
+class TestAsyncBatchSearch:
+    """Test running searches concurrently"""
+
+    def test_one_result_per_distinct_query(self, fake_async_hub):
+        results = run_batch(["bert", "distil", "bert", "tiny"], limit=5)
+
+        assert sorted(r.query for r in results) == ["bert", "distil", "tiny"]
+        by_query = {r.query: r for r in results}
+        assert [m["modelId"] for m in by_query["distil"].models] == [
+            "distilbert-base-uncased"
+        ]
+        assert all(r.error is None for r in results)
+        assert len(fake_async_hub.calls) == 3
+
+    def test_concurrency_is_bounded(self, monkeypatch):
+        record = {}
+        monkeypatch.setattr(
+            "thermal_scout.batch.async_thermal_search_raising", fake_search(record)
+        )
+
+        results = run_batch([f"q{n}" for n in range(20)], concurrency=4)
+
+        assert len(results) == 20
+        assert record["peak"] == 4
+
+    def test_throughput_scales_with_concurrency(self, fake_async_hub):
+        fake_async_hub.latency = 0.05
+        queries = [f"query-{n}" for n in range(8)]
+
+        start = time.perf_counter()
+        run_batch(queries, concurrency=1)
+        serial = time.perf_counter() - start
+        start = time.perf_counter()
+        run_batch([f"other-{n}" for n in range(8)], concurrency=8)
+        concurrent = time.perf_counter() - start
+
+        assert serial >= 8 * 0.05
+        assert concurrent < serial / 3
+
+    def test_failures_are_reported_per_query(self, monkeypatch):
+        record = {}
+        search = fake_search(record, fail={"bad"})
+        monkeypatch.setattr("thermal_scout.batch.async_thermal_search_raising", search)
+
+        results = {r.query: r for r in run_batch(["good", "bad"])}
+
+        assert results["bad"].error == "bad failed"
+        assert results["bad"].models == []
+        assert results["good"].error is None
+
+    def test_closing_early_stops_the_batch(self, monkeypatch):
+        record = {}
+        monkeypatch.setattr(
+            "thermal_scout.batch.async_thermal_search_raising", fake_search(record)
+        )
+
+        async def first():
+            results = async_batch_search([f"q{n}" for n in range(100)], concurrency=2)
+            result = await anext(results)
+            await results.aclose()
+            return result
+
+        asyncio.run(first())
+
+        assert len(record["queries"]) < 10
+
+
+class TestBatchEndpoint:
+    """Test POST /api/v1/search:batch"""
+
+    def test_streams_a_line_per_query(self, fake_async_hub):
+        response = TestClient(app).post(
+            "/api/v1/search:batch",
+            json={"queries": ["bert", "tiny", "bert"], "limit": 2, "concurrency": 2},
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        records = {
+            record["query"]: record
+            for record in map(json.loads, response.text.splitlines())
+        }
+        assert set(records) == {"bert", "tiny"}
+        assert records["tiny"]["models"][0]["modelId"] == "google/bert-tiny"
+        assert "lastModified" not in records["tiny"]["models"][0]
+
+    def test_failed_queries_carry_an_error(self, monkeypatch):
+        search = fake_search({}, fail={"bad"})
+        monkeypatch.setattr("thermal_scout.batch.async_thermal_search_raising", search)
+
+        response = TestClient(app).post(
+            "/api/v1/search:batch", json={"queries": ["bad"]}
+        )
+
+        assert response.json() == {"query": "bad", "error": "bad failed"}
+
+    def test_validation(self):
+        client = TestClient(app)
+
+        for body in [
+            {"queries": []},
+            {"queries": ["bert"], "concurrency": 65},
+            {"queries": ["bert"], "sort": "warmth"},
+            {"queries": ["bert"], "max_thermal": "Warm"},
+        ]:
+            assert client.post("/api/v1/search:batch", json=body).status_code == 422
+
+
+class TestBatchCommand:
+    """Test thermal-scout batch"""
+
+    def test_writes_json_lines(self, fake_async_hub, tmp_path):
+        queries = tmp_path / "queries.txt"
+        queries.write_text("bert\ndistil\n\nbert\n")
+
+        result = CliRunner().invoke(
+            cli_app, ["batch", "--input", str(queries), "--max-thermal", "Low"]
+        )
+
+        assert result.exit_code == 0
+        records = [json.loads(line) for line in result.stdout.splitlines()]
+        assert sorted(record["query"] for record in records) == ["bert", "distil"]
+        assert all(
+            model["thermal_cost"] == "Low"
+            for record in records
+            for model in record["models"]
+        )
+
+    def test_reads_stdin(self, monkeypatch):
+        record = {}
+        monkeypatch.setattr(
+            "thermal_scout.batch.async_thermal_search_raising", fake_search(record)
+        )
+
+        result = CliRunner().invoke(cli_app, ["batch", "-i", "-"], input="a\nb\n")
+
+        assert result.exit_code == 0
+        assert sorted(record["queries"]) == ["a", "b"]
+
+    def test_exit_code_reports_failures(self, monkeypatch, tmp_path):
+        search = fake_search({}, fail={"bad"})
+        monkeypatch.setattr("thermal_scout.batch.async_thermal_search_raising", search)
+        queries = tmp_path / "queries.txt"
+        queries.write_text("good\nbad\n")
+
+        result = CliRunner().invoke(cli_app, ["batch", "-i", str(queries)])
+
+        assert result.exit_code == 1
+        assert '"error": "bad failed"' in result.stdout
+
+    def test_rejects_unknown_sort_keys(self, tmp_path):
+        queries = tmp_path / "queries.txt"
+        queries.write_text("bert\n")
+
+        result = CliRunner().invoke(
+            cli_app, ["batch", "-i", str(queries), "--sort", "warmth"]
+        )
+
+        assert result.exit_code == 2
+
+    def test_concurrency_is_capped_as_in_the_library(self, monkeypatch):
+        monkeypatch.setattr(
+            "thermal_scout.batch.async_thermal_search_raising", fake_search({})
+        )
+
+        def run(concurrency):
+            return CliRunner().invoke(
+                cli_app, ["batch", "-i", "-", "-c", str(concurrency)], input="a\n"
+            )
+
+        assert run(MAX_BATCH_CONCURRENCY).exit_code == 0
+        assert run(MAX_BATCH_CONCURRENCY + 1).exit_code == 2
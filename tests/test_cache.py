@@ -0,0 +1,553 @@
+"""
+Tests for thermal_scout.cache module and search result caching
+"""
+
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+
+from thermal_scout.api.main import app
+from thermal_scout.cache import REFRESH_WORKERS, TTLCache
+from thermal_scout.index import write_index
+from thermal_scout.search import refresh_hot_searches, search_cache, thermal_search
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise TimeoutError("condition not reached")
+        time.sleep(0.001)
+
+
+class TestTTLCache:
+    """Test expiry, LRU eviction and coalescing"""
+
+    def test_hit_after_miss(self):
+        cache = TTLCache()
+        calls = []
+
+        assert cache.get_or_compute("k", lambda: calls.append(1) or "v") == "v"
+        assert cache.get_or_compute("k", lambda: calls.append(1) or "w") == "v"
+
+        stats = cache.stats()
+        assert (stats.hits, stats.misses, len(calls)) == (1, 1, 1)
+
+    def test_entries_expire_after_ttl(self):
+        clock = FakeClock()
+        cache = TTLCache(ttl=10, clock=clock)
+        cache.get_or_compute("k", lambda: "old")
+
+        clock.now = 9.9
+        assert cache.get_or_compute("k", lambda: "new") == "old"
+        clock.now = 10.0
+        assert cache.get_or_compute("k", lambda: "new") == "new"
+        assert cache.stats().expirations == 1
+
+    def test_get_and_put(self):
+        clock = FakeClock()
+        cache = TTLCache(ttl=10, clock=clock)
+
+        assert cache.get("k") is None
+        cache.put("k", "v")
+        assert cache.get("k") == "v"
+        clock.now = 10.0
+        assert cache.get("k", "gone") == "gone"
+        stats = cache.stats()
+        assert (stats.hits, stats.misses, stats.expirations) == (1, 2, 1)
+
+    def test_least_recently_used_is_evicted(self):
+        cache = TTLCache(maxsize=2)
+        cache.get_or_compute("a", lambda: 1)
+        cache.get_or_compute("b", lambda: 2)
+        cache.get_or_compute("a", lambda: 1)  # "b" is now least recent
+        cache.get_or_compute("c", lambda: 3)
+
+        assert cache.get_or_compute("a", lambda: "recomputed") == 1
+        assert cache.get_or_compute("b", lambda: "recomputed") == "recomputed"
+        assert cache.stats().evictions == 2
+
+    def test_shrinking_evicts(self):
+        cache = TTLCache(maxsize=4)
+        for key in "abcd":
+            cache.get_or_compute(key, lambda: 0)
+
+        cache.configure(maxsize=1)
+
+        assert len(cache) == 1
+        assert cache.stats().evictions == 3
+
+    def test_errors_are_not_cached(self):
+        cache = TTLCache()
+
+        def fail():
+            raise ConnectionError("Hub unreachable")
+
+        with pytest.raises(ConnectionError):
+            cache.get_or_compute("k", fail)
+        assert cache.get_or_compute("k", lambda: "v") == "v"
+
+    def test_zero_ttl_disables_storage(self):
+        cache = TTLCache(ttl=0)
+        cache.get_or_compute("k", lambda: 1)
+
+        assert cache.get_or_compute("k", lambda: 2) == 2
+        assert len(cache) == 0
+
+    def test_concurrent_misses_are_coalesced(self):
+        cache = TTLCache()
+        release = threading.Event()
+        calls = []
+
+        def compute():
+            calls.append(1)
+            release.wait()
+            return "v"
+
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(cache.get_or_compute("k", compute))
+            )
+            for _ in range(20)
+        ]
+        for thread in threads:
+            thread.start()
+        wait_for(lambda: cache.stats().coalesced == 19)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        assert results == ["v"] * 20
+        assert len(calls) == 1
+
+    def test_waiters_receive_the_error(self):
+        cache = TTLCache()
+        release = threading.Event()
+
+        def fail():
+            release.wait()
+            raise ConnectionError("Hub unreachable")
+
+        errors = []
+
+        def call():
+            try:
+                cache.get_or_compute("k", fail)
+            except ConnectionError as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=call) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        wait_for(lambda: cache.stats().coalesced == 4)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        assert len(errors) == 5
+
+
+class TestAsyncTTLCache:
+    """Test coroutine computations"""
+
+    def test_concurrent_misses_are_coalesced(self):
+        cache = TTLCache()
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "v"
+
+        async def burst():
+            return await asyncio.gather(
+                *(cache.aget_or_compute("k", compute) for _ in range(20))
+            )
+
+        assert asyncio.run(burst()) == ["v"] * 20
+        assert len(calls) == 1
+        assert cache.stats().coalesced == 19
+
+    def test_errors_reach_waiters_and_are_not_cached(self):
+        cache = TTLCache()
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise ConnectionError("Hub unreachable")
+
+        async def burst():
+            return await asyncio.gather(
+                *(cache.aget_or_compute("k", fail) for _ in range(3)),
+                return_exceptions=True,
+            )
+
+        assert all(isinstance(r, ConnectionError) for r in asyncio.run(burst()))
+        assert len(cache) == 0
+
+    def test_cancelled_leader_does_not_cancel_waiters(self):
+        cache = TTLCache()
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "v"
+
+        async def burst():
+            leader = asyncio.create_task(cache.aget_or_compute("k", compute))
+            await asyncio.sleep(0)
+            waiters = [
+                asyncio.create_task(cache.aget_or_compute("k", compute))
+                for _ in range(3)
+            ]
+            await asyncio.sleep(0)
+            leader.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await leader
+            return await asyncio.gather(*waiters)
+
+        assert asyncio.run(burst()) == ["v"] * 3
+        assert len(calls) == 1
+        assert cache.get_or_compute("k", lambda: "recomputed") == "v"
+
+
+class Counter:
+    """A computation returning how often it ran, optionally failing"""
+
+    def __init__(self):
+        self.calls = 0
+        self.fail = False
+
+    def __call__(self):
+        self.calls += 1
+        if self.fail:
+            raise ConnectionError("Hub unreachable")
+        return self.calls
+
+    async def acall(self):
+        return self()
+
+
+class TestStaleWhileRevalidate:
+    """Test serving stale entries while they are refreshed"""
+
+    def test_stale_entry_is_served_and_refreshed(self):
+        clock = FakeClock()
+        cache = TTLCache(ttl=10, stale=5, clock=clock)
+        compute = Counter()
+        cache.get_or_compute("k", compute)
+
+        clock.now = 12
+        assert cache.get_or_compute("k", compute) == 1
+        wait_for(lambda: cache.stats().refreshes == 1)
+
+        assert cache.get_or_compute("k", compute) == 2
+        stats = cache.stats()
+        assert (stats.hits, stats.misses, stats.stale_hits) == (2, 1, 1)
+
+    def test_refresh_callable_is_used(self):
+        clock = FakeClock()
+        cache = TTLCache(ttl=10, stale=5, clock=clock)
+        cache.get_or_compute("k", lambda: "computed", lambda: "refreshed")
+
+        clock.now = 12
+        cache.get_or_compute("k", lambda: "computed")
+        wait_for(lambda: cache.stats().refreshes == 1)
+
+        assert cache.get_or_compute("k", lambda: "computed") == "refreshed"
+
+    def test_past_the_stale_window_is_a_miss(self):
+        clock = FakeClock()
+        cache = TTLCache(ttl=10, stale=5, clock=clock)
+        compute = Counter()
+        cache.get_or_compute("k", compute)
+
+        clock.now = 15
+        assert cache.get_or_compute("k", compute) == 2
+        assert cache.stats().expirations == 1
+
+    def test_failed_refresh_keeps_the_stale_entry(self):
+        clock = FakeClock()
+        cache = TTLCache(ttl=10, stale=5, clock=clock)
+        compute = Counter()
+        cache.get_or_compute("k", compute)
+        compute.fail = True
+
+        clock.now = 12
+        assert cache.get_or_compute("k", compute) == 1
+        wait_for(lambda: compute.calls == 2)
+
+        assert cache.get_or_compute("k", compute) == 1
+        assert cache.stats().refreshes == 0
+
+    def test_refreshes_share_a_bounded_pool(self):
+        clock = FakeClock()
+        cache = TTLCache(ttl=10, stale=5, clock=clock)
+        release = threading.Event()
+        threads = set()
+
+        def refresh():
+            threads.add(threading.current_thread())
+            release.wait()
+            return "refreshed"
+
+        for key in range(3 * REFRESH_WORKERS):
+            cache.get_or_compute(key, lambda: "computed", refresh)
+        clock.now = 12
+        for key in range(3 * REFRESH_WORKERS):
+            assert cache.get_or_compute(key, lambda: "computed") == "computed"
+        release.set()
+        wait_for(lambda: cache.stats().refreshes == 3 * REFRESH_WORKERS)
+
+        assert len(threads) <= REFRESH_WORKERS
+
+    def test_async_stale_entry_is_refreshed_once(self):
+        clock = FakeClock()
+        cache = TTLCache(ttl=10, stale=5, clock=clock)
+        compute = Counter()
+
+        async def run():
+            await cache.aget_or_compute("k", compute.acall)
+            clock.now = 12
+            stale = await asyncio.gather(
+                *(cache.aget_or_compute("k", compute.acall) for _ in range(10))
+            )
+            while cache.stats().refreshes == 0:
+                await asyncio.sleep(0)
+            return stale, await cache.aget_or_compute("k", compute.acall)
+
+        stale, fresh = asyncio.run(run())
+
+        assert stale == [1] * 10
+        assert fresh == 2
+        assert compute.calls == 2
+
+
+class TestRefreshPopular:
+    """Test refreshing the most requested entries before they expire"""
+
+    def popular_cache(self, clock):
+        cache = TTLCache(ttl=10, clock=clock)
+        computes = {key: Counter() for key in "abc"}
+        for key, lookups in [("a", 3), ("b", 2), ("c", 1)]:
+            for _ in range(lookups):
+                cache.get_or_compute(key, computes[key])
+        return cache, computes
+
+    def test_top_entries_about_to_expire_are_refreshed(self):
+        clock = FakeClock()
+        cache, computes = self.popular_cache(clock)
+
+        assert asyncio.run(cache.refresh_popular(2, within=5)) == 0
+        clock.now = 6
+        assert asyncio.run(cache.refresh_popular(2, within=5)) == 2
+
+        assert [computes[key].calls for key in "abc"] == [2, 2, 1]
+        clock.now = 12
+        assert cache.get_or_compute("a", computes["a"]) == 2
+        assert cache.stats().refreshes == 2
+
+    def test_interest_decays(self):
+        clock = FakeClock()
+        cache, computes = self.popular_cache(clock)
+
+        # Three lookups of "a" are halved on each refresh: 3, 1, 0
+        refreshed = []
+        for now in [6, 12, 18]:
+            clock.now = now
+            refreshed.append(asyncio.run(cache.refresh_popular(1, within=5)))
+
+        assert refreshed == [1, 1, 0]
+        assert computes["a"].calls == 3
+
+    def test_entries_without_a_computation_are_skipped(self):
+        clock = FakeClock()
+        cache = TTLCache(ttl=10, clock=clock)
+        cache.put("k", "v")
+        cache.get("k")
+
+        clock.now = 9
+        assert asyncio.run(cache.refresh_popular(1, within=5)) == 0
+
+
+class SlowHub:
+    """Wraps a fake Hub so listings block until released"""
+
+    def __init__(self, api):
+        self.api = api
+        self.release = threading.Event()
+        self.listings = 0
+
+    def list_models(self, **kwargs):
+        self.listings += 1
+        self.release.wait(timeout=5)
+        return self.api.list_models(**kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self.api, name)
+
+
+@pytest.fixture
+def slow_hub(fake_hf_api, monkeypatch):
+    hub = SlowHub(fake_hf_api)
+    monkeypatch.setattr("thermal_scout.search.hub_api", lambda: hub)
+    return hub
+
+
+class TestSearchCache:
+    """Test caching in front of thermal_search"""
+
+    def test_repeated_search_is_served_from_cache(self, fake_hf_api, monkeypatch):
+        monkeypatch.setattr("thermal_scout.search.hub_api", lambda: fake_hf_api)
+
+        first = thermal_search("bert", limit=2)
+        second = thermal_search("bert", limit=2)
+
+        assert first == second
+        assert len(fake_hf_api.calls) == 1
+
+    def test_key_includes_every_argument(self, fake_hf_api, monkeypatch):
+        monkeypatch.setattr("thermal_scout.search.hub_api", lambda: fake_hf_api)
+
+        thermal_search("bert", limit=2)
+        thermal_search("bert", limit=3)
+        thermal_search("bert", limit=2, model_type="fill-mask")
+        thermal_search("bert", limit=2, thermal_aware=False)
+
+        assert len(fake_hf_api.calls) == 4
+
+    def test_errors_are_not_cached(self, fake_hf_api, monkeypatch):
+        monkeypatch.setattr("thermal_scout.search.hub_api", lambda: fake_hf_api)
+        fake_hf_api.fail_after = 0
+
+        assert thermal_search("bert") == []
+        fake_hf_api.fail_after = None
+        assert len(thermal_search("bert")) == 3
+
+    def test_new_index_generation_bypasses_old_results(
+        self, isolated_cache_dir, empty_search_cache
+    ):
+        path = isolated_cache_dir / "index"
+        write_index(path, [{"modelId": "bert-base", "downloads": 1}])
+        assert len(thermal_search("bert")) == 1
+
+        write_index(path, [{"modelId": f"bert-{n}", "downloads": n} for n in range(3)])
+
+        assert len(thermal_search("bert")) == 3
+        assert empty_search_cache.stats().misses == 2
+
+    def test_concurrent_searches_share_one_listing(self, slow_hub, empty_search_cache):
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(thermal_search("bert")))
+            for _ in range(100)
+        ]
+        for thread in threads:
+            thread.start()
+        wait_for(lambda: empty_search_cache.stats().coalesced == 99)
+        slow_hub.release.set()
+        for thread in threads:
+            thread.join()
+
+        assert slow_hub.listings == 1
+        assert len(results) == 100
+        assert all(len(r) == 3 for r in results)
+
+    def test_concurrent_api_requests_share_one_listing(
+        self, fake_async_hub, empty_search_cache
+    ):
+        fake_async_hub.latency = 0.05
+
+        async def burst():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://test"
+            ) as client:
+                return await asyncio.gather(
+                    *(
+                        client.get("/api/v1/search", params={"q": "bert"})
+                        for _ in range(100)
+                    )
+                )
+
+        responses = asyncio.run(burst())
+
+        assert all(r.status_code == 200 for r in responses)
+        assert len(fake_async_hub.calls) == 1
+        stats = empty_search_cache.stats()
+        assert (stats.misses, stats.coalesced) == (1, 99)
+
+    def test_stats_endpoint(self, fake_hf_api, monkeypatch):
+        monkeypatch.setattr("thermal_scout.search.hub_api", lambda: fake_hf_api)
+        thermal_search("bert")
+        thermal_search("bert")
+
+        async def get_stats():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://test"
+            ) as client:
+                return await client.get("/api/v1/cache/stats")
+
+        data = asyncio.run(get_stats()).json()
+
+        assert data["hits"] == 1
+        assert data["misses"] == 1
+        assert data["size"] == 1
+
+    def test_stale_search_is_refreshed_in_the_background(
+        self, fake_hf_api, monkeypatch, empty_search_cache
+    ):
+        monkeypatch.setattr("thermal_scout.search.hub_api", lambda: fake_hf_api)
+        clock = FakeClock()
+        monkeypatch.setattr(search_cache, "_clock", clock)
+        first = thermal_search("bert")
+
+        clock.now = search_cache.ttl + 1
+        stale = thermal_search("bert")
+        wait_for(lambda: search_cache.stats().refreshes == 1)
+
+        assert stale == first
+        assert len(fake_hf_api.calls) == 2
+        assert thermal_search("bert") == first
+        assert search_cache.stats().stale_hits == 1
+
+    def test_hot_searches_are_refreshed_before_they_expire(
+        self, fake_hf_api, monkeypatch
+    ):
+        monkeypatch.setattr("thermal_scout.search.hub_api", lambda: fake_hf_api)
+        clock = FakeClock()
+        monkeypatch.setattr(search_cache, "_clock", clock)
+        thermal_search("bert")
+        thermal_search("bert")
+        thermal_search("llama")
+        clock.now = search_cache.ttl - 0.01
+
+        async def two_rounds():
+            refresher = asyncio.create_task(refresh_hot_searches(1, interval=0.01))
+            while search_cache.stats().refreshes == 0:
+                await asyncio.sleep(0.01)
+            refresher.cancel()
+
+        asyncio.run(asyncio.wait_for(two_rounds(), timeout=5))
+
+        assert [call["search"] for call in fake_hf_api.calls] == [
+            "bert",
+            "llama",
+            "bert",
+        ]
+
+    def test_refresher_is_off_with_no_top(self):
+        asyncio.run(asyncio.wait_for(refresh_hot_searches(0, interval=60), 1))
@@ -14,7 +14,7 @@ runner = CliRunner()
 class TestCLICommands:
     """Test CLI commands"""
 
-    @patch("thermal_scout.cli.thermal_search")
+    @patch("thermal_scout.search.thermal_search")
     def test_search_command_basic(self, mock_search):
         """Test basic search command"""
         # Mock search results
@@ -34,7 +34,7 @@ class TestCLICommands:
         assert "bert-base-uncased" in result.stdout
         assert "Medium" in result.stdout
 
-    @patch("thermal_scout.cli.thermal_search")
+    @patch("thermal_scout.search.thermal_search")
     def test_search_command_with_limit(self, mock_search):
         """Test search command with limit"""
         mock_search.return_value = []
@@ -42,10 +42,16 @@ class TestCLICommands:
         result = runner.invoke(app, ["search", "test", "--limit", "5"])
         assert result.exit_code == 0
         mock_search.assert_called_once_with(
-            query="test", limit=5, model_type=None, thermal_aware=True
+            query="test",
+            limit=5,
+            model_type=None,
+            thermal_aware=True,
+            tiers=None,
+            budget=None,
+            sort=None,
         )
 
-    @patch("thermal_scout.cli.thermal_search")
+    @patch("thermal_scout.search.thermal_search")
     def test_search_command_with_model_type(self, mock_search):
         """Test search command with model type filter"""
         mock_search.return_value = []
@@ -53,10 +59,16 @@ class TestCLICommands:
         result = runner.invoke(app, ["search", "llama", "--type", "text-generation"])
         assert result.exit_code == 0
         mock_search.assert_called_once_with(
-            query="llama", limit=10, model_type="text-generation", thermal_aware=True
+            query="llama",
+            limit=10,
+            model_type="text-generation",
+            thermal_aware=True,
+            tiers=None,
+            budget=None,
+            sort=None,
         )
 
-    @patch("thermal_scout.cli.thermal_search")
+    @patch("thermal_scout.search.thermal_search")
     def test_search_command_no_thermal(self, mock_search):
         """Test search command with thermal awareness disabled"""
         mock_search.return_value = []
@@ -64,10 +76,46 @@ class TestCLICommands:
         result = runner.invoke(app, ["search", "gpt", "--no-thermal"])
         assert result.exit_code == 0
         mock_search.assert_called_once_with(
-            query="gpt", limit=10, model_type=None, thermal_aware=False
+            query="gpt",
+            limit=10,
+            model_type=None,
+            thermal_aware=False,
+            tiers=None,
+            budget=None,
+            sort=None,
         )
 
-    @patch("thermal_scout.cli.thermal_search")
+    @patch("thermal_scout.search.thermal_search")
+    def test_search_command_thermal_filters(self, mock_search):
+        """Test search command with thermal filters and a fetch budget"""
+        mock_search.return_value = []
+
+        result = runner.invoke(
+            app,
+            [
+                "search",
+                "bert",
+                "--max-thermal",
+                "medium",
+                "--thermal-in",
+                "Medium,High",
+                "--fetch-budget",
+                "200",
+            ],
+        )
+        assert result.exit_code == 0
+        kwargs = mock_search.call_args.kwargs
+        assert kwargs["tiers"] == {"Medium"}
+        assert kwargs["budget"] == 200
+
+    @patch("thermal_scout.search.thermal_search")
+    def test_search_command_rejects_unknown_thermal_level(self, mock_search):
+        """Test search command with an unknown thermal level"""
+        result = runner.invoke(app, ["search", "bert", "--max-thermal", "Warm"])
+        assert result.exit_code == 2
+        mock_search.assert_not_called()
+
+    @patch("thermal_scout.search.thermal_search")
     def test_search_no_results(self, mock_search):
         """Test search with no results"""
         mock_search.return_value = []
@@ -104,7 +152,7 @@ class TestThermalEmoji:
 class TestCLIEdgeCases:
     """Test edge cases and error handling"""
 
-    @patch("thermal_scout.cli.thermal_search")
+    @patch("thermal_scout.search.thermal_search")
     def test_search_with_special_characters(self, mock_search):
         """Test search with special characters in query"""
         mock_search.return_value = []
@@ -113,7 +161,7 @@ class TestCLIEdgeCases:
         assert result.exit_code == 0
         mock_search.assert_called_once()
 
-    @patch("thermal_scout.cli.thermal_search")
+    @patch("thermal_scout.search.thermal_search")
     def test_search_with_empty_model_data(self, mock_search):
         """Test handling of incomplete model data"""
         # Mock search with missing fields
@@ -128,4 +176,4 @@ class TestCLIEdgeCases:
         result = runner.invoke(app, ["search", "test"])
         assert result.exit_code == 0
         assert "test-model" in result.stdout
-        # Should handle missing fields gracefully
\ No newline at end of file
+        # Should handle missing fields gracefully
@@ -0,0 +1,179 @@
+"""
+Tests for thermal_scout.api.compression and CompressionMiddleware
+"""
+
+import gzip
+
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+from fastapi.testclient import TestClient
+
+from thermal_scout.api.compression import (
+    CODECS,
+    Codec,
+    compress,
+    compressed_cache,
+    negotiate,
+)
+from thermal_scout.api.conditional import etag, variant_tag
+from thermal_scout.api.main import app
+from thermal_scout.api.middleware import CompressionMiddleware
+
+BODY = b'{"models":[' + b'{"modelId":"google/bert-tiny","tags":["tiny"]},' * 50 + b"]}"
+
+
+def fake_codec(name):
+    return Codec(name, range(1, 10), 5, lambda _body, level: f"{name}{level}".encode())
+
+
+FAKE_CODECS = {name: fake_codec(name) for name in ["zstd", "br", "gzip"]}
+
+
+def compressing_client():
+    inner = FastAPI()
+
+    @inner.get("/json")
+    async def json_body():
+        return Response(BODY, media_type="application/json", headers={"ETag": '"t"'})
+
+    @inner.get("/small")
+    async def small_body():
+        return Response(b"{}", media_type="application/json")
+
+    @inner.get("/binary")
+    async def binary_body():
+        return Response(BODY, media_type="application/octet-stream")
+
+    @inner.get("/text")
+    async def text_body():
+        return PlainTextResponse(BODY.decode())
+
+    @inner.get("/stream")
+    async def stream_body():
+        async def lines():
+            for _ in range(3):
+                yield BODY
+
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+    return TestClient(CompressionMiddleware(inner, minimum_size=100))
+
+
+class TestNegotiate:
+    """Test choosing a coding from Accept-Encoding"""
+
+    def test_server_preference_breaks_ties(self):
+        assert negotiate("gzip, br, zstd", FAKE_CODECS).name == "zstd"
+        assert negotiate("gzip, br", FAKE_CODECS).name == "br"
+
+    def test_quality_values(self):
+        assert negotiate("zstd;q=0.5, gzip", FAKE_CODECS).name == "gzip"
+        assert negotiate("zstd;q=0, *;q=0.1", FAKE_CODECS).name == "br"
+
+    def test_nothing_acceptable(self):
+        assert negotiate("", FAKE_CODECS) is None
+        assert negotiate("identity", FAKE_CODECS) is None
+        assert negotiate("gzip;q=0", FAKE_CODECS) is None
+        assert negotiate("gzip;q=oops", FAKE_CODECS) is None
+
+    def test_gzip_is_always_available(self):
+        assert "gzip" in CODECS
+        assert negotiate("gzip").name == "gzip"
+
+
+class TestCompress:
+    """Test compressing bodies and reusing them by ETag"""
+
+    def test_levels_are_clamped(self):
+        codec = CODECS["gzip"]
+
+        assert codec.level() == 6
+        assert codec.level(0) == 1
+        assert codec.level(99) == 9
+
+    def test_gzip_round_trip_is_deterministic(self):
+        compressed = compress(BODY, CODECS["gzip"])
+
+        assert gzip.decompress(compressed) == BODY
+        assert compress(BODY, CODECS["gzip"]) == compressed
+        assert len(compressed) < len(BODY) / 5
+
+    def test_strong_tags_are_reused(self):
+        codec = fake_codec("gzip")
+
+        first = compress(BODY, codec, tag='"t"')
+        again = compress(BODY, codec, tag='"t"')
+
+        assert again is first
+        assert compressed_cache.stats().hits == 1
+        assert compress(BODY, codec, 9, tag='"t"') == b"gzip9"
+
+    def test_weak_or_missing_tags_are_not_kept(self):
+        codec = CODECS["gzip"]
+        compress(BODY, codec)
+        compress(BODY, codec, tag='W/"t"')
+
+        assert len(compressed_cache) == 0
+
+
+class TestCompressionMiddleware:
+    """Test compressing responses in the negotiated coding"""
+
+    def test_large_json_is_compressed(self):
+        response = compressing_client().get(
+            "/json", headers={"Accept-Encoding": "gzip"}
+        )
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert response.headers["etag"] == variant_tag('"t"', "gzip")
+        assert int(response.headers["content-length"]) < len(BODY)
+        assert response.content == BODY
+
+    def test_identity_when_nothing_is_accepted(self):
+        response = compressing_client().get(
+            "/json", headers={"Accept-Encoding": "identity"}
+        )
+
+        assert "content-encoding" not in response.headers
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert response.headers["etag"] == '"t"'
+        assert response.content == BODY
+
+    def test_text_is_compressed(self):
+        response = compressing_client().get(
+            "/text", headers={"Accept-Encoding": "gzip"}
+        )
+
+        assert response.headers["content-encoding"] == "gzip"
+
+    def test_small_binary_and_streamed_bodies_are_sent_as_is(self):
+        client = compressing_client()
+
+        for path in ["/small", "/binary", "/stream"]:
+            response = client.get(path, headers={"Accept-Encoding": "gzip"})
+
+            assert "content-encoding" not in response.headers, path
+        assert response.content == BODY * 3
+
+
+class TestCompressedSearch:
+    """Test compressed /api/v1/search responses and their validators"""
+
+    def test_revalidating_a_compressed_search(self, fake_async_hub):
+        client = TestClient(CompressionMiddleware(app, minimum_size=0))
+        headers = {"Accept-Encoding": "gzip"}
+
+        first = client.get("/api/v1/search", params={"q": "bert"}, headers=headers)
+        tag = first.headers["etag"]
+        again = client.get(
+            "/api/v1/search",
+            params={"q": "bert"},
+            headers={**headers, "If-None-Match": tag},
+        )
+
+        assert first.headers["content-encoding"] == "gzip"
+        assert tag == variant_tag(etag(first.content), "gzip")
+        assert again.status_code == 304
+        assert again.headers["etag"] == tag
+        assert again.headers["vary"] == "Accept-Encoding"
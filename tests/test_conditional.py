@@ -0,0 +1,117 @@
+"""
+Tests for thermal_scout.api.conditional and HTTP caching of API responses
+"""
+
+from fastapi.testclient import TestClient
+
+from thermal_scout.api.conditional import cache_control, etag, none_match
+from thermal_scout.api.main import app
+
+
+class TestValidators:
+    """Test entity tags and If-None-Match matching"""
+
+    def test_etag_is_strong_and_follows_the_body(self):
+        tag = etag(b'{"models":[]}')
+
+        assert tag.startswith('"') and tag.endswith('"')
+        assert tag == etag(b'{"models":[]}')
+        assert tag != etag(b'{"models":[1]}')
+
+    def test_none_match(self):
+        tag = etag(b"body")
+
+        assert none_match(tag, tag)
+        assert none_match(f'"other", W/{tag}', tag)
+        assert none_match("*", tag)
+        assert not none_match('"other"', tag)
+        assert not none_match(None, tag)
+
+
+class TestCacheControl:
+    """Test freshness directives from the configuration"""
+
+    def test_defaults(self):
+        assert cache_control() == "public, max-age=60, stale-while-revalidate=300"
+
+    def test_configured(self, monkeypatch):
+        monkeypatch.setenv("THERMAL_SCOUT_HTTP_MAX_AGE", "5")
+        monkeypatch.setenv("THERMAL_SCOUT_HTTP_STALE_WHILE_REVALIDATE", "0")
+
+        assert cache_control() == "public, max-age=5"
+
+
+class TestConditionalGets:
+    """Test ETag, Cache-Control and 304 on the search and model endpoints"""
+
+    def test_search_revalidates_with_304(self, fake_async_hub):
+        client = TestClient(app)
+
+        first = client.get("/api/v1/search", params={"q": "bert"})
+        again = client.get(
+            "/api/v1/search",
+            params={"q": "bert"},
+            headers={"If-None-Match": first.headers["etag"]},
+        )
+
+        assert first.status_code == 200
+        assert first.headers["etag"] == etag(first.content)
+        assert first.headers["cache-control"] == cache_control()
+        assert again.status_code == 304
+        assert again.content == b""
+        assert again.headers["etag"] == first.headers["etag"]
+        assert again.headers["cache-control"] == cache_control()
+
+    def test_changed_results_get_a_new_body(self, fake_async_hub):
+        client = TestClient(app)
+
+        response = client.get(
+            "/api/v1/search",
+            params={"q": "bert", "limit": 1},
+            headers={"If-None-Match": etag(b"stale")},
+        )
+
+        assert response.status_code == 200
+        assert response.headers["etag"] == etag(response.content)
+
+    def test_cursor_pages_carry_validators(self, fake_async_hub):
+        client = TestClient(app)
+
+        first = client.get("/api/v1/search", params={"q": "bert", "cursor": "*"})
+        again = client.get(
+            "/api/v1/search",
+            params={"q": "bert", "cursor": "*"},
+            headers={"If-None-Match": first.headers["etag"]},
+        )
+
+        assert first.status_code == 200
+        assert again.status_code == 304
+
+    def test_model_details_revalidate_with_304(self, fake_async_hub):
+        client = TestClient(app)
+
+        first = client.get("/api/v1/models/google/bert-tiny")
+        again = client.get(
+            "/api/v1/models/google/bert-tiny",
+            headers={"If-None-Match": first.headers["etag"]},
+        )
+
+        assert first.status_code == 200
+        assert first.json()["modelId"] == "google/bert-tiny"
+        assert again.status_code == 304
+
+    def test_errors_are_not_cacheable(self, fake_async_hub):
+        response = TestClient(app).get("/api/v1/models/someone/missing")
+
+        assert response.status_code == 404
+        assert "etag" not in response.headers
+        assert "cache-control" not in response.headers
+
+    def test_failed_searches_are_not_cacheable(self, fake_async_hub):
+        fake_async_hub.fail_after = 0
+
+        response = TestClient(app).get("/api/v1/search", params={"q": "bert"})
+
+        assert response.status_code == 500
+        assert "etag" not in response.headers
+        assert "cache-control" not in response.headers
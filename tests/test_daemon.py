@@ -0,0 +1,152 @@
+"""
+Tests for thermal_scout.daemon and forwarding CLI searches to it
+"""
+
+import asyncio
+import socket
+import tempfile
+import threading
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from typer.testing import CliRunner
+
+from thermal_scout.cli import app as cli_app
+from thermal_scout.daemon import (
+    DaemonError,
+    InvalidRequest,
+    daemon_search,
+    ping,
+    request,
+    serve,
+    stop,
+)
+from thermal_scout.search import async_thermal_search
+
+
+@pytest.fixture
+def socket_path(monkeypatch):
+    """A socket path short enough for AF_UNIX, used by the CLI too"""
+    with tempfile.TemporaryDirectory(prefix="ts-") as directory:
+        path = Path(directory) / "daemon.sock"
+        monkeypatch.setenv("THERMAL_SCOUT_SOCKET", str(path))
+        yield path
+
+
+def start_daemon(path):
+    thread = threading.Thread(target=asyncio.run, args=(serve(path, preload=False),))
+    thread.start()
+    deadline = time.monotonic() + 5
+    while ping(path) is None:
+        assert thread.is_alive() and time.monotonic() < deadline
+        time.sleep(0.01)
+    return thread
+
+
+@pytest.fixture
+def daemon(socket_path, fake_async_hub):
+    """A daemon serving the fake Hub on ``socket_path``"""
+    thread = start_daemon(socket_path)
+    yield socket_path
+    stop(socket_path)
+    thread.join(5)
+
+
+def stale_socket(path):
+    """A socket file nothing listens on, as left by a killed daemon"""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.bind(str(path))
+
+
+class TestClient:
+    """Test requests when no daemon is running"""
+
+    def test_no_socket(self, socket_path):
+        assert daemon_search(socket_path, query="bert") is None
+        assert ping(socket_path) is None
+        assert not stop(socket_path)
+
+    def test_stale_socket(self, socket_path):
+        stale_socket(socket_path)
+
+        assert daemon_search(socket_path, query="bert") is None
+
+
+class TestDaemon:
+    """Test searches answered by a running daemon"""
+
+    def test_search_matches_an_in_process_search(self, daemon, empty_search_cache):
+        results = daemon_search(daemon, query="bert", limit=2)
+        empty_search_cache.clear()
+
+        assert results == asyncio.run(async_thermal_search("bert", limit=2))
+
+    def test_repeated_searches_hit_the_warm_cache(self, daemon, fake_async_hub):
+        for _ in range(3):
+            daemon_search(daemon, query="bert", sort="likes")
+
+        assert len(fake_async_hub.calls) == 1
+
+    def test_invalid_arguments(self, daemon):
+        with pytest.raises(InvalidRequest) as sort_error:
+            daemon_search(daemon, query="bert", sort="warmth")
+        with pytest.raises(InvalidRequest) as tier_error:
+            daemon_search(daemon, query="bert", max_thermal="Warm")
+
+        assert sort_error.value.field == "sort"
+        assert tier_error.value.field == "tiers"
+
+    def test_malformed_requests(self, daemon):
+        with pytest.raises(DaemonError, match="Unknown op"):
+            request({"op": "reindex"}, daemon)
+        with pytest.raises(DaemonError, match="Malformed search request"):
+            daemon_search(daemon, query="bert", page=2)
+
+    def test_refuses_to_start_twice(self, daemon):
+        with pytest.raises(RuntimeError, match="already listening"):
+            asyncio.run(serve(daemon, preload=False))
+
+    def test_replaces_a_stale_socket(self, socket_path):
+        stale_socket(socket_path)
+        thread = start_daemon(socket_path)
+
+        assert stop(socket_path)
+        thread.join(5)
+        assert not socket_path.exists()
+
+
+class TestCliForwarding:
+    """Test thermal-scout search and daemon with a daemon running"""
+
+    def test_search_is_forwarded(self, daemon):
+        with patch("thermal_scout.search.thermal_search") as search:
+            result = CliRunner().invoke(cli_app, ["search", "bert", "--limit", "2"])
+
+        assert result.exit_code == 0
+        search.assert_not_called()
+        assert "distilbert-base-uncased" in result.stdout
+
+    def test_no_daemon_searches_in_process(self, daemon):
+        with patch("thermal_scout.search.thermal_search") as search:
+            search.return_value = []
+            CliRunner().invoke(cli_app, ["search", "bert", "--no-daemon"])
+
+        search.assert_called_once()
+
+    def test_invalid_arguments_are_reported(self, daemon):
+        result = CliRunner().invoke(cli_app, ["search", "bert", "--sort", "warmth"])
+
+        assert result.exit_code == 2
+
+    def test_stop(self, daemon):
+        result = CliRunner().invoke(cli_app, ["daemon", "--stop"])
+
+        assert result.exit_code == 0
+        assert ping(daemon) is None
+
+    def test_stop_without_a_daemon(self, socket_path):
+        result = CliRunner().invoke(cli_app, ["daemon", "--stop"])
+
+        assert result.exit_code == 1
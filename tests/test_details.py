@@ -0,0 +1,193 @@
+"""
+Tests for thermal_scout.details module and the models endpoints
+"""
+
+import asyncio
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from thermal_scout import details
+from thermal_scout.api.main import app
+from thermal_scout.details import (
+    _repository_not_found,
+    async_model_details,
+    async_model_details_many,
+    model_details,
+)
+from thermal_scout.index import write_index
+
+
+@pytest.fixture
+def hub(fake_hf_api, monkeypatch):
+    monkeypatch.setattr("thermal_scout.details.hub_api", lambda: fake_hf_api)
+    return fake_hf_api
+
+
+@pytest.fixture
+def local_index(isolated_cache_dir, monkeypatch):
+    path = isolated_cache_dir / "index"
+    monkeypatch.setenv("THERMAL_SCOUT_INDEX", str(path))
+    return write_index(
+        path,
+        [
+            {"modelId": "org/model-7b", "downloads": 10},
+            {"modelId": "org/model", "downloads": 20, "pipeline_tag": "fill-mask"},
+        ],
+    )
+
+
+class CountingClient:
+    """Wraps an AsyncHubClient, recording how many lookups overlap"""
+
+    def __init__(self, client):
+        self.client = client
+        self.active = 0
+        self.peak = 0
+
+    async def model_info(self, *args, **kwargs):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(0.01)
+            return await self.client.model_info(*args, **kwargs)
+        finally:
+            self.active -= 1
+
+
+class TestIndexFind:
+    """Test exact id lookup in the local index"""
+
+    def test_exact_id(self, local_index):
+        assert local_index.find("org/model") == 1
+        assert local_index.find("org/model-7b") == 0
+
+    def test_substrings_do_not_match(self, local_index):
+        assert local_index.find("model") is None
+        assert local_index.find("org/model-7") is None
+        assert local_index.find("ORG/MODEL") is None
+
+
+class TestModelDetails:
+    """Test single model lookups"""
+
+    def test_hub_lookup(self, hub, make_safetensors):
+        hub.models[1].safetensors = make_safetensors(335_000_000)
+
+        model = model_details("bert-large-uncased")
+
+        assert model["modelId"] == "bert-large-uncased"
+        assert model["parameters"] == 335_000_000
+        assert model["thermal_cost"] == "Low"
+        assert hub.calls == []
+        assert hub.info_calls == [{"repo_id": "bert-large-uncased", "revision": None}]
+
+    def test_unknown_model(self, hub):
+        assert model_details("nobody/nothing") is None
+
+    def test_lookups_are_cached(self, hub):
+        model_details("google/bert-tiny")
+        model_details("google/bert-tiny")
+        model_details("nobody/nothing")
+        model_details("nobody/nothing")
+
+        assert len(hub.info_calls) == 2
+
+    def test_errors_are_not_cached(self, hub):
+        hub.info_error = ConnectionError("Hub unreachable")
+        assert model_details("google/bert-tiny") is None
+
+        hub.info_error = None
+        assert model_details("google/bert-tiny")["modelId"] == "google/bert-tiny"
+
+    def test_local_index_first(self, hub, local_index):
+        model = model_details("org/model")
+
+        assert model["pipeline_tag"] == "fill-mask"
+        assert hub.info_calls == []
+
+    def test_falls_back_to_hub_when_not_indexed(self, hub, local_index):
+        assert model_details("google/bert-tiny")["modelId"] == "google/bert-tiny"
+        assert len(hub.info_calls) == 1
+
+
+class TestAsyncModelDetails:
+    """Test lookups through the AsyncHubClient"""
+
+    def test_matches_sync_lookup(self, fake_async_hub, hub):
+        expected = model_details("distilbert-base-uncased")
+        details.details_cache.clear()
+
+        model = asyncio.run(async_model_details("distilbert-base-uncased"))
+
+        assert model == expected
+        assert len(fake_async_hub.info_calls) == 2
+
+    def test_unknown_model(self, fake_async_hub):
+        assert asyncio.run(async_model_details("nobody/nothing")) is None
+
+    def test_repository_not_found_statuses(self):
+        request = httpx.Request("GET", "http://hub.test/api/models/x")
+        hidden = httpx.Response(
+            401, headers={"X-Error-Code": "RepoNotFound"}, request=request
+        )
+
+        assert _repository_not_found(httpx.Response(404, request=request))
+        assert _repository_not_found(hidden)
+        assert not _repository_not_found(httpx.Response(401, request=request))
+        assert not _repository_not_found(httpx.Response(503, request=request))
+
+    def test_many_keeps_order_and_dedupes(self, fake_async_hub):
+        ids = ["google/bert-tiny", "nobody/nothing", "google/bert-tiny"]
+
+        models = asyncio.run(async_model_details_many(ids))
+
+        assert [m and m["modelId"] for m in models] == [
+            "google/bert-tiny",
+            None,
+            "google/bert-tiny",
+        ]
+        assert len(fake_async_hub.info_calls) == 2
+
+    def test_many_bounds_concurrency(self, fake_async_hub):
+        client = CountingClient(details.get_async_client())
+        ids = [f"org/model-{n}" for n in range(20)]
+
+        models = asyncio.run(
+            async_model_details_many(ids, client=client, concurrency=4)
+        )
+
+        assert models == [None] * 20
+        assert client.peak == 4
+
+
+class TestBatchGetEndpoint:
+    """Test POST /api/v1/models:batchGet"""
+
+    def test_found_and_missing(self, fake_async_hub):
+        response = TestClient(app).post(
+            "/api/v1/models:batchGet",
+            json={"ids": ["bert-large-uncased", "nobody/nothing", "google/bert-tiny"]},
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert [m["modelId"] for m in data["models"]] == [
+            "bert-large-uncased",
+            "google/bert-tiny",
+        ]
+        assert data["missing"] == ["nobody/nothing"]
+
+    def test_rejects_empty_batch(self):
+        response = TestClient(app).post("/api/v1/models:batchGet", json={"ids": []})
+
+        assert response.status_code == 422
+
+    def test_details_endpoint_uses_one_lookup(self, fake_async_hub):
+        response = TestClient(app).get("/api/v1/models/google/bert-tiny")
+
+        assert response.status_code == 200
+        assert response.json()["thermal_cost"] == "Low"
+        assert fake_async_hub.calls == []
+        assert len(fake_async_hub.info_calls) == 1
@@ -0,0 +1,122 @@
+"""
+Tests for thermal_scout.api.encoding and the /api/v1/search fast path
+"""
+
+import json
+
+from fastapi.testclient import TestClient
+
+from thermal_scout.api.encoding import (
+    cached_search_body,
+    dumps,
+    response_cache,
+    search_body,
+)
+from thermal_scout.api.main import ModelInfo, SearchResponse, app
+from thermal_scout.records import ModelRecord
+
+RESULTS = [
+    {
+        "modelId": "google/bert-tiny",
+        "downloads": 500000,
+        "likes": 200,
+        "tags": ["transformers", "tiny"],
+        "pipeline_tag": "text-classification",
+        "library_name": "transformers",
+        "parameters": 4_385_920,
+        "lastModified": "2024-05-01T12:00:00+00:00",
+        "thermal_cost": "Low",
+    },
+    {
+        "modelId": "someone/llama-7b-ünïcode",
+        "downloads": 10,
+        "likes": 0,
+        "tags": [],
+        "pipeline_tag": None,
+        "library_name": None,
+        "parameters": None,
+        "lastModified": None,
+        "thermal_cost": "High",
+    },
+]
+
+
+def records():
+    return [ModelRecord.from_mapping(model) for model in RESULTS]
+
+
+def pydantic_json(results, **fields):
+    models = [ModelInfo(**model) for model in results]
+    return SearchResponse(models=models, **fields).model_dump(mode="json")
+
+
+class TestSearchBody:
+    """Test encoding search responses without Pydantic"""
+
+    def test_matches_the_response_model(self):
+        for results in [RESULTS, records()]:
+            body = search_body(results, "bert", 10, True, "abc")
+
+            assert json.loads(body) == pydantic_json(
+                RESULTS, query="bert", limit=10, thermal_aware=True, next_cursor="abc"
+            )
+
+    def test_field_order_follows_the_schema(self):
+        body = json.loads(search_body(records(), "bert", 10, True))
+
+        assert list(body) == list(SearchResponse.model_fields)
+        assert list(body["models"][0]) == list(ModelInfo.model_fields)
+
+    def test_compact_utf8(self):
+        assert dumps({"q": "ü", "n": [1, None]}) == '{"q":"ü","n":[1,null]}'.encode()
+
+
+class TestCachedSearchBody:
+    """Test reusing encoded bodies"""
+
+    def test_same_records_reuse_the_body(self):
+        results = records()
+
+        first = cached_search_body("key", results, "bert", 10, True)
+        again = cached_search_body("key", list(results), "bert", 10, True)
+
+        assert again.body is first.body
+        assert again.etag == first.etag
+        assert response_cache.stats().hits == 1
+
+    def test_new_records_are_encoded_again(self):
+        first = cached_search_body("key", records(), "bert", 10, True)
+        changed = [ModelRecord.from_mapping(RESULTS[0], "High"), *records()[1:]]
+
+        again = cached_search_body("key", changed, "bert", 10, True)
+
+        assert again.etag != first.etag
+        assert json.loads(again.body)["models"][0]["thermal_cost"] == "High"
+
+    def test_dicts_and_empty_results_are_not_kept(self):
+        cached_search_body("dicts", RESULTS, "bert", 10, True)
+        cached_search_body("empty", [], "bert", 10, True)
+
+        assert len(response_cache) == 0
+
+
+class TestSearchEndpointEncoding:
+    """Test /api/v1/search answering with encoded bytes"""
+
+    def test_repeated_search_sends_the_same_bytes(self, fake_async_hub):
+        client = TestClient(app)
+
+        first = client.get("/api/v1/search", params={"q": "bert"})
+        again = client.get("/api/v1/search", params={"q": "bert"})
+
+        assert first.status_code == again.status_code == 200
+        assert first.headers["content-type"] == "application/json"
+        assert again.content == first.content
+        assert response_cache.stats().hits == 1
+        assert first.json()["models"][0].keys() == ModelInfo.model_fields.keys()
+
+    def test_schema_is_unchanged(self):
+        operation = app.openapi()["paths"]["/api/v1/search"]["get"]
+        schema = operation["responses"]["200"]["content"]["application/json"]
+
+        assert schema["schema"] == {"$ref": "#/components/schemas/SearchResponse"}
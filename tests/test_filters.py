@@ -0,0 +1,222 @@
+"""
+Tests for thermal filters applied while reading the search source
+"""
+
+import asyncio
+from unittest.mock import patch
+
+import httpx
+from fastapi.testclient import TestClient
+
+from thermal_scout.api.main import app
+from thermal_scout.hub import AsyncHubClient, HubSettings
+from thermal_scout.paging import async_iter_search, async_search_page
+from thermal_scout.search import (
+    async_stream_search,
+    async_thermal_search,
+    thermal_search,
+)
+
+
+def tiered_hub(ids):
+    """A client serving ``ids`` in cursor pages; "-large" ids are High"""
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        params = request.url.params
+        start = int(params.get("cursor", 0))
+        end = start + int(params["limit"])
+        body = [{"id": model_id, "tags": []} for model_id in ids[start:end]]
+        headers = {}
+        if end < len(ids):
+            next_url = request.url.copy_set_param("cursor", end)
+            headers["Link"] = f'<{next_url}>; rel="next"'
+        return httpx.Response(200, json=body, headers=headers)
+
+    settings = HubSettings(
+        "http://hub.test", timeout=5, retries=0, backoff=0, pool_size=2
+    )
+    client = AsyncHubClient(settings=settings, transport=httpx.MockTransport(handler))
+    return client, requests
+
+
+def mostly_large(count, small_every):
+    """``count`` ids, Low ("-tiny") every ``small_every`` and High otherwise"""
+    return [
+        f"org/m{n:03d}-tiny" if n % small_every == 0 else f"org/m{n:03d}-large"
+        for n in range(count)
+    ]
+
+
+def listed(requests):
+    return sum(int(request.url.params["limit"]) for request in requests)
+
+
+async def collect(stream):
+    return [model async for model in stream]
+
+
+class TestHubScan:
+    """Test filtered searches pulling Hub pages until enough models match"""
+
+    def test_unfiltered_search_fetches_exactly_limit(self):
+        client, requests = tiered_hub(mostly_large(50, 5))
+
+        results = asyncio.run(async_thermal_search("", limit=5, client=client))
+
+        assert len(results) == 5
+        assert len(requests) == 1
+        assert requests[0].url.params["limit"] == "5"
+
+    def test_keeps_pulling_pages_until_limit_matches(self):
+        client, requests = tiered_hub(mostly_large(200, 10))
+
+        results = asyncio.run(
+            async_thermal_search("", limit=5, client=client, tiers={"Low"})
+        )
+
+        assert [m["modelId"] for m in results] == [
+            f"org/m{n:03d}-tiny" for n in range(0, 50, 10)
+        ]
+        # Pages of 5, 10, 20 and 40 models reach the fifth match at model 40
+        assert [r.url.params["limit"] for r in requests] == ["5", "10", "20", "40"]
+
+    def test_stops_at_the_fetch_budget(self):
+        client, requests = tiered_hub(mostly_large(200, 10))
+
+        results = asyncio.run(
+            async_thermal_search("", limit=5, client=client, tiers={"Low"}, budget=25)
+        )
+
+        assert len(results) == 3
+        assert listed(requests) == 25
+
+    def test_stream_filters_in_source_order(self):
+        client, _ = tiered_hub(mostly_large(30, 3))
+
+        models = asyncio.run(
+            collect(async_stream_search("", limit=4, client=client, tiers={"High"}))
+        )
+
+        assert [m["modelId"] for m in models] == [
+            "org/m001-large",
+            "org/m002-large",
+            "org/m004-large",
+            "org/m005-large",
+        ]
+
+    @patch("thermal_scout.search.hub_api")
+    def test_sync_scan_stops_at_limit_matches(self, mock_hub_api, make_fake_model):
+        ids = mostly_large(100, 4)
+        served = []
+
+        def list_models(limit, **kwargs):
+            for model_id in ids[:limit]:
+                served.append(model_id)
+                yield make_fake_model(model_id)
+
+        mock_hub_api.return_value.list_models.side_effect = list_models
+
+        results = thermal_search("", limit=3, tiers={"Low"}, budget=50)
+
+        assert [m["modelId"] for m in results] == [
+            "org/m000-tiny",
+            "org/m004-tiny",
+            "org/m008-tiny",
+        ]
+        assert mock_hub_api.return_value.list_models.call_args.kwargs["limit"] == 50
+        # Classified three models at a time, the listing is read no further
+        assert len(served) == 9
+
+
+class TestFilteredPages:
+    """Test cursor pages of a filtered search"""
+
+    def test_hub_pages_are_filtered(self):
+        client, _ = tiered_hub(mostly_large(20, 4))
+
+        async def walk():
+            return [
+                [m["modelId"] for m in page]
+                async for page in async_iter_search(
+                    "", page_size=8, client=client, tiers={"Low"}
+                )
+            ]
+
+        assert asyncio.run(walk()) == [
+            ["org/m000-tiny", "org/m004-tiny"],
+            ["org/m008-tiny", "org/m012-tiny"],
+            ["org/m016-tiny"],
+        ]
+
+    def test_cursor_is_tied_to_its_filter(self):
+        client, _ = tiered_hub(mostly_large(20, 4))
+        page = asyncio.run(
+            async_search_page("", 8, client=client, tiers={"Low", "Medium"})
+        )
+
+        response = TestClient(app).get(
+            "/api/v1/search",
+            params={"q": "", "cursor": page.next_cursor, "max_thermal": "Low"},
+        )
+
+        assert response.status_code == 400
+
+
+class TestSearchEndpointFilters:
+    """Test thermal filter parameters on the search endpoints"""
+
+    def test_max_thermal(self, fake_async_hub):
+        response = TestClient(app).get(
+            "/api/v1/search", params={"q": "bert", "max_thermal": "Medium"}
+        )
+
+        assert response.status_code == 200
+        assert [m["modelId"] for m in response.json()["models"]] == [
+            "distilbert-base-uncased",
+            "google/bert-tiny",
+        ]
+
+    def test_thermal_in_accepts_lists_and_commas(self, fake_async_hub):
+        client = TestClient(app)
+        repeated = client.get(
+            "/api/v1/search", params={"q": "bert", "thermal_in": ["High", "Medium"]}
+        )
+        commas = client.get(
+            "/api/v1/search", params={"q": "bert", "thermal_in": "High,Medium"}
+        )
+
+        assert [m["modelId"] for m in repeated.json()["models"]] == [
+            "bert-large-uncased"
+        ]
+        assert commas.json() == repeated.json()
+
+    def test_passes_fetch_budget(self):
+        with patch("thermal_scout.api.main.async_thermal_search_raising") as search:
+            search.return_value = []
+            TestClient(app).get(
+                "/api/v1/search",
+                params={"q": "bert", "thermal_in": "Low", "fetch_budget": 50},
+            )
+
+        assert search.call_args.kwargs["tiers"] == {"Low"}
+        assert search.call_args.kwargs["budget"] == 50
+
+    def test_unknown_level_is_rejected(self):
+        client = TestClient(app)
+
+        assert (
+            client.get("/api/v1/search", params={"q": "x", "max_thermal": "Warm"})
+        ).status_code == 422
+        assert (
+            client.get("/api/v1/search:stream", params={"q": "x", "thermal_in": "?"})
+        ).status_code == 422
+
+    def test_stream(self, fake_async_hub):
+        response = TestClient(app).get(
+            "/api/v1/search:stream", params={"q": "bert", "thermal_in": "Low"}
+        )
+
+        assert response.status_code == 200
+        assert len(response.text.splitlines()) == 2
@@ -0,0 +1,292 @@
+"""
+Tests for thermal_scout.hub module and the async search path
+"""
+
+import asyncio
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from thermal_scout.api.main import app
+from thermal_scout.hub import (
+    MAX_BACKOFF,
+    AsyncHubClient,
+    HubClient,
+    HubSettings,
+    get_hub_client,
+    hub_api,
+)
+from thermal_scout.search import (
+    SORT_CANDIDATES,
+    async_thermal_search,
+    thermal_search,
+)
+
+
+def recording_transport(pages):
+    """Serves ``pages`` in order, recording each request"""
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        body, headers = pages[len(requests) - 1]
+        return httpx.Response(200, json=body, headers=headers)
+
+    return httpx.MockTransport(handler), requests
+
+
+def hub_settings(**overrides):
+    """Settings for a test Hub that retries without sleeping"""
+    values = {
+        "endpoint": "http://hub.test",
+        "timeout": 5.0,
+        "retries": 2,
+        "backoff": 0.0,
+        "pool_size": 4,
+    }
+    return HubSettings(**(values | overrides))
+
+
+def status_transport(statuses, headers=None):
+    """Answers with each of ``statuses`` in turn, then 200"""
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        status = statuses[len(requests) - 1] if len(requests) <= len(statuses) else 200
+        return httpx.Response(status, json=[], headers=headers or {})
+
+    return httpx.MockTransport(handler), requests
+
+
+class TestAsyncHubClient:
+    """Test the Hub REST calls"""
+
+    def test_list_models_query_parameters(self):
+        transport, requests = recording_transport([([{"id": "bert-base"}], {})])
+        client = AsyncHubClient("http://hub.test", transport=transport)
+
+        models = asyncio.run(
+            client.list_models(
+                search="bert",
+                task="fill-mask",
+                sort="downloads",
+                direction=-1,
+                limit=5,
+                expand=["downloads", "sha"],
+            )
+        )
+
+        assert [m.id for m in models] == ["bert-base"]
+        params = requests[0].url.params
+        assert params["search"] == "bert"
+        assert params["filter"] == "fill-mask"
+        assert params["direction"] == "-1"
+        assert params.get_list("expand") == ["downloads", "sha"]
+
+    def test_list_models_follows_link_header(self):
+        next_page = '<http://hub.test/api/models?cursor=abc>; rel="next"'
+        transport, requests = recording_transport(
+            [
+                ([{"id": "a"}, {"id": "b"}], {"Link": next_page}),
+                ([{"id": "c"}, {"id": "d"}], {}),
+            ]
+        )
+        client = AsyncHubClient("http://hub.test", transport=transport)
+
+        models = asyncio.run(client.list_models(limit=3))
+
+        assert [m.id for m in models] == ["a", "b", "c"]
+        assert requests[1].url.params["cursor"] == "abc"
+
+    def test_model_info_revision_and_safetensors(self):
+        body = {
+            "id": "org/model",
+            "sha": "a1",
+            "safetensors": {"parameters": {"F32": 5}, "total": 5},
+        }
+        transport, requests = recording_transport([(body, {})])
+        client = AsyncHubClient("http://hub.test", transport=transport)
+
+        info = asyncio.run(
+            client.model_info("org/model", revision="refs/pr/1", expand=["safetensors"])
+        )
+
+        assert info.safetensors.total == 5
+        assert requests[0].url.raw_path.startswith(
+            b"/api/models/org/model/revision/refs%2Fpr%2F1"
+        )
+
+    def test_errors_raise(self):
+        client = AsyncHubClient(
+            settings=hub_settings(),
+            transport=httpx.MockTransport(lambda _: httpx.Response(404)),
+        )
+
+        with pytest.raises(httpx.HTTPStatusError):
+            asyncio.run(client.list_models(search="bert"))
+
+
+class TestRetries:
+    """Test retry and backoff of transient Hub failures"""
+
+    def test_transient_statuses_are_retried(self):
+        transport, requests = status_transport([503, 429])
+        client = AsyncHubClient(settings=hub_settings(), transport=transport)
+
+        assert asyncio.run(client.list_models(search="bert")) == []
+        assert len(requests) == 3
+
+    def test_gives_up_after_retries(self):
+        transport, requests = status_transport([502, 502, 502, 502])
+        client = AsyncHubClient(settings=hub_settings(), transport=transport)
+
+        with pytest.raises(httpx.HTTPStatusError):
+            asyncio.run(client.list_models(search="bert"))
+        assert len(requests) == 3
+
+    def test_client_errors_are_not_retried(self):
+        transport, requests = status_transport([404])
+        client = AsyncHubClient(settings=hub_settings(), transport=transport)
+
+        with pytest.raises(httpx.HTTPStatusError):
+            asyncio.run(client.model_info("missing"))
+        assert len(requests) == 1
+
+    def test_connection_errors_are_retried(self):
+        attempts = []
+
+        def handler(request):
+            attempts.append(request)
+            if len(attempts) == 1:
+                raise httpx.ConnectError("refused", request=request)
+            return httpx.Response(200, json=[])
+
+        client = AsyncHubClient(
+            settings=hub_settings(), transport=httpx.MockTransport(handler)
+        )
+
+        assert asyncio.run(client.list_models()) == []
+        assert len(attempts) == 2
+
+    def test_backoff_doubles_and_honors_retry_after(self):
+        client = AsyncHubClient(settings=hub_settings(backoff=0.5))
+        limited = httpx.Response(429, headers={"Retry-After": "7"})
+        flooded = httpx.Response(429, headers={"Retry-After": "3600"})
+
+        assert [client._delay(n, None) for n in range(3)] == [0.5, 1.0, 2.0]
+        assert client._delay(10, None) == MAX_BACKOFF
+        assert client._delay(0, limited) == 7.0
+        assert client._delay(0, flooded) == MAX_BACKOFF
+
+
+class TestHubClient:
+    """Test the shared client manager"""
+
+    def test_session_is_pooled_with_timeout_and_retries(self):
+        hub = HubClient(hub_settings(retries=5, backoff=0.25, pool_size=16))
+
+        adapter = hub.session().get_adapter("https://huggingface.co")
+
+        assert adapter.timeout == 5.0
+        assert adapter._pool_maxsize == 16
+        assert adapter.max_retries.total == 5
+        assert adapter.max_retries.backoff_factor == 0.25
+        assert 503 in adapter.max_retries.status_forcelist
+
+    def test_one_async_client_per_loop(self):
+        hub = HubClient(hub_settings())
+
+        async def clients():
+            return hub.async_client(), hub.async_client()
+
+        first, second = asyncio.run(clients())
+        assert first is second
+        assert asyncio.run(clients())[0] is not first
+        assert len(hub._async_clients) == 1  # the closed loop's client was dropped
+
+    def test_shared_across_calls(self):
+        assert get_hub_client() is get_hub_client()
+        assert hub_api() is hub_api()
+
+    def test_lifespan_closes_async_client(self, monkeypatch):
+        hub = HubClient(hub_settings())
+        monkeypatch.setattr("thermal_scout.api.main.get_hub_client", lambda: hub)
+
+        with TestClient(app):
+            (client,) = hub._async_clients.values()
+            assert not client._client.is_closed
+
+        assert hub._async_clients == {}
+        assert client._client.is_closed
+
+
+class TestAsyncThermalSearch:
+    """Test async_thermal_search against the fake Hub"""
+
+    def test_matches_sync_search(self, fake_async_hub, monkeypatch, empty_search_cache):
+        monkeypatch.setattr("thermal_scout.search.hub_api", lambda: fake_async_hub)
+        expected = thermal_search("bert", limit=3)
+        empty_search_cache.clear()
+
+        results = asyncio.run(async_thermal_search("bert", limit=3))
+
+        assert results == expected
+        assert [r["thermal_cost"] for r in results] == ["Low", "Low", "High"]
+
+    def test_parameter_counts_are_resolved(self, fake_async_hub, make_safetensors):
+        fake_async_hub.models[1].sha = "b1"
+        fake_async_hub.models[1].safetensors = make_safetensors(335_000_000)
+
+        results = asyncio.run(async_thermal_search("bert-large", limit=1))
+
+        assert results[0]["parameters"] == 335_000_000
+        assert results[0]["thermal_cost"] == "Low"
+        # Listed with the model, so not looked up
+        assert fake_async_hub.info_calls == []
+
+    def test_missing_counts_are_not_looked_up(self, fake_async_hub):
+        for sha, model in zip("abc", fake_async_hub.models, strict=True):
+            model.sha = sha
+
+        results = asyncio.run(async_thermal_search("bert", limit=1, sort="downloads"))
+
+        assert [m["modelId"] for m in results] == ["bert-large-uncased"]
+        assert fake_async_hub.info_calls == []
+
+    def test_sorted_search_lists_a_few_candidates_per_result(self, fake_async_hub):
+        asyncio.run(async_thermal_search("bert", limit=2, sort="likes"))
+        asyncio.run(async_thermal_search("bert", limit=2, sort="likes", budget=50))
+
+        assert [call["limit"] for call in fake_async_hub.calls] == [
+            2 * SORT_CANDIDATES,
+            50,
+        ]
+
+    def test_errors_return_empty(self, fake_async_hub):
+        fake_async_hub.fail_after = 0
+
+        assert asyncio.run(async_thermal_search("bert")) == []
+
+    def test_slow_search_does_not_block_other_requests(self, fake_async_hub):
+        fake_async_hub.latency = 0.2
+        finished = []
+
+        async def request(client, path):
+            await client.get(path)
+            finished.append(path)
+
+        async def run():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://test"
+            ) as client:
+                search = asyncio.create_task(request(client, "/api/v1/search?q=bert"))
+                await asyncio.sleep(0.01)
+                await request(client, "/health")
+                await search
+
+        asyncio.run(run())
+
+        assert finished == ["/health", "/api/v1/search?q=bert"]
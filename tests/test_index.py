@@ -0,0 +1,179 @@
+"""
+Tests for thermal_scout.index module
+"""
+
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from thermal_scout.index import ModelIndex, load_default_index, write_index
+from thermal_scout.search import thermal_search
+from thermal_scout.thermal import ThermalThresholds
+
+
+@pytest.fixture
+def sample_models():
+    """Model dicts shaped like thermal_search results"""
+    return [
+        {
+            "modelId": "google/bert-tiny",
+            "downloads": 500000,
+            "likes": 200,
+            "tags": ["transformers", "tiny"],
+            "pipeline_tag": "text-classification",
+            "library_name": "transformers",
+        },
+        {
+            "modelId": "bert-large-uncased",
+            "downloads": 2000000,
+            "likes": 1000,
+            "tags": ["transformers", "large"],
+            "pipeline_tag": "fill-mask",
+            "library_name": "transformers",
+        },
+        {
+            "modelId": "distilbert-base-uncased",
+            "downloads": 1000000,
+            "likes": 500,
+            "tags": ["transformers", "distilled"],
+            "pipeline_tag": "text-classification",
+            "library_name": "transformers",
+        },
+        {
+            "modelId": "meta-llama/Llama-2-7b",
+            "downloads": 300000,
+            "likes": 4000,
+            "tags": [],
+            "pipeline_tag": None,
+            "library_name": None,
+        },
+    ]
+
+
+@pytest.fixture
+def index(tmp_path, sample_models):
+    return write_index(tmp_path / "index", sample_models)
+
+
+class TestWriteIndex:
+    """Test writing and reopening snapshots"""
+
+    def test_columns_are_memory_mapped(self, index):
+        """Numeric columns should be mapped from disk, not loaded"""
+        reopened = ModelIndex(index.path)
+        assert isinstance(reopened.columns["downloads"], np.memmap)
+        assert len(reopened) == 4
+
+    def test_round_trip_preserves_records(self, index, sample_models):
+        """Rows should materialize back into the original dicts"""
+        model = index.model(0)
+        assert model["modelId"] == "google/bert-tiny"
+        assert model["tags"] == ["transformers", "tiny"]
+        assert model["pipeline_tag"] == "text-classification"
+        assert model["thermal_cost"] == "Low"
+
+        llama = index.model(3)
+        assert llama["pipeline_tag"] is None
+        assert llama["library_name"] is None
+        assert llama["thermal_cost"] == "High"
+
+    def test_rewrite_bumps_generation(self, index, sample_models):
+        """Rewriting should publish a new generation and drop the old files"""
+        rewritten = write_index(index.path, sample_models[:2])
+        assert rewritten.generation == index.generation + 1
+        assert len(rewritten) == 2
+        assert not (index.path / f"downloads.{index.generation}.npy").exists()
+
+
+class TestRescore:
+    """Test re-tiering a snapshot from its stored thermal features"""
+
+    def test_rescore_applies_new_thresholds(self, index):
+        index.rescore(ThermalThresholds(medium_max=4))
+        costs = {m["modelId"]: m["thermal_cost"] for m in index.records()}
+
+        assert costs == {
+            "google/bert-tiny": "Low",
+            "bert-large-uncased": "High",
+            "distilbert-base-uncased": "Low",
+            "meta-llama/Llama-2-7b": "Medium",
+        }
+
+    def test_rescore_leaves_snapshot_on_disk(self, index):
+        index.rescore(ThermalThresholds(low_max=6))
+
+        assert ModelIndex(index.path).model(1)["thermal_cost"] == "High"
+
+    def test_stored_features(self, index):
+        assert index.thermal_features.param_count[3] == 7e9
+        assert isinstance(index.columns["param_count"], np.memmap)
+
+
+class TestListModels:
+    """Test querying the snapshot"""
+
+    def test_substring_match_is_case_insensitive(self, index):
+        ids = [m["modelId"] for m in index.list_models(search="BERT")]
+        assert ids == [
+            "bert-large-uncased",
+            "distilbert-base-uncased",
+            "google/bert-tiny",
+        ]
+
+    def test_match_does_not_span_adjacent_ids(self, index):
+        """A needle crossing the boundary between two ids is not a match"""
+        assert index.list_models(search="tinybert") == []
+
+    def test_task_filter(self, index):
+        ids = [m["modelId"] for m in index.list_models(task="text-classification")]
+        assert ids == ["distilbert-base-uncased", "google/bert-tiny"]
+        assert index.list_models(task="unknown-task") == []
+
+    def test_limit_keeps_most_downloaded(self, index):
+        ids = [m["modelId"] for m in index.list_models(limit=2)]
+        assert ids == ["bert-large-uncased", "distilbert-base-uncased"]
+
+    def test_tiers_filter_before_limit(self, index):
+        ids = [m["modelId"] for m in index.list_models(limit=2, tiers={"Low"})]
+        assert ids == ["distilbert-base-uncased", "google/bert-tiny"]
+        assert index.list_models(tiers=set()) == []
+
+    def test_search_with_tiers(self, index):
+        ids = [m["modelId"] for m in index.search("bert", tiers={"High"})]
+        assert ids == ["bert-large-uncased"]
+        assert len(index.ranked("bert", tiers={"Low", "High"})) == 3
+
+
+class TestSearchFromIndex:
+    """Test thermal_search answering from the local index"""
+
+    @patch("thermal_scout.search.hub_api")
+    def test_explicit_index_skips_hub(self, mock_hf_api_class, index):
+        results = thermal_search("bert", limit=3, index=index)
+
+        assert [r["thermal_cost"] for r in results] == ["Low", "Low", "High"]
+        mock_hf_api_class.assert_not_called()
+
+    @patch("thermal_scout.search.hub_api")
+    def test_default_index_is_used_when_present(
+        self, mock_hf_api_class, sample_models, isolated_cache_dir
+    ):
+        write_index(isolated_cache_dir / "index", sample_models)
+
+        results = thermal_search("llama", limit=1)
+
+        assert results[0]["modelId"] == "meta-llama/Llama-2-7b"
+        mock_hf_api_class.assert_not_called()
+
+    def test_default_index_reloads_new_generation(
+        self, sample_models, isolated_cache_dir
+    ):
+        assert load_default_index() is None
+
+        first = write_index(isolated_cache_dir / "index", sample_models)
+        assert load_default_index().generation == first.generation
+        assert load_default_index() is load_default_index()
+
+        write_index(isolated_cache_dir / "index", sample_models[:1])
+        assert len(load_default_index()) == 1
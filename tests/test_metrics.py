@@ -0,0 +1,175 @@
+"""
+Tests for thermal_scout.metrics, Server-Timing and the /metrics endpoint
+"""
+
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+from thermal_scout.api.main import app
+from thermal_scout.index import write_index
+from thermal_scout.metrics import (
+    OTHER,
+    REGISTRY,
+    Histogram,
+    request_seconds,
+    request_timings,
+    search_seconds,
+    stage_seconds,
+)
+from thermal_scout.search import thermal_search
+
+
+@pytest.fixture(autouse=True)
+def empty_registry():
+    """Start every test without recorded observations"""
+    for histogram in REGISTRY.histograms:
+        histogram.clear()
+
+
+def counts(histogram):
+    """Observation count per label set"""
+    return {labels: sum(series[:-1]) for labels, series in histogram.collect().items()}
+
+
+class TestHistogram:
+    """Test recording and rendering histograms"""
+
+    def test_renders_cumulative_buckets(self):
+        histogram = Histogram("latency_seconds", "Latency", ("route",), (0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 2.0):
+            histogram.observe(value, "/search")
+
+        assert list(histogram.render()) == [
+            "# HELP latency_seconds Latency",
+            "# TYPE latency_seconds histogram",
+            'latency_seconds_bucket{route="/search",le="0.1"} 2',
+            'latency_seconds_bucket{route="/search",le="1.0"} 3',
+            'latency_seconds_bucket{route="/search",le="+Inf"} 4',
+            'latency_seconds_sum{route="/search"} 2.65',
+            'latency_seconds_count{route="/search"} 4',
+        ]
+
+    def test_merges_per_thread_shards(self):
+        histogram = Histogram("latency_seconds", "Latency", ("stage",))
+
+        def record():
+            for _ in range(1000):
+                histogram.observe(0.001, "hub")
+
+        threads = [threading.Thread(target=record) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert counts(histogram) == {("hub",): 8000}
+        assert len(histogram._shards) == 8
+
+    def test_caps_label_sets(self):
+        histogram = Histogram("latency_seconds", "Latency", ("query",), max_series=2)
+        for query in ["a", "b", "c", "d", "c"]:
+            histogram.observe(0.01, query)
+
+        assert counts(histogram) == {("a",): 1, ("b",): 1, (OTHER,): 3}
+
+    def test_escapes_label_values(self):
+        histogram = Histogram("latency_seconds", "Latency", ("query",), (1.0,))
+        histogram.observe(0.5, 'say "hi"\n')
+
+        assert 'query="say \\"hi\\"\\n"' in list(histogram.render())[2]
+
+
+class TestSearchTimings:
+    """Test the stages recorded by thermal_search"""
+
+    def test_hub_search_stages(self, fake_hf_api, monkeypatch):
+        monkeypatch.setattr("thermal_scout.search.hub_api", lambda: fake_hf_api)
+
+        with request_timings() as timings:
+            thermal_search("bert", limit=2, model_type="fill-mask")
+
+        assert list(timings.stages) == ["hub", "classify", "rank"]
+        assert timings.cache == "miss"
+        assert counts(search_seconds) == {("miss", "fill-mask"): 1}
+        assert ("hub", "miss", "fill-mask") in counts(stage_seconds)
+
+    def test_cache_hits_skip_the_stages(self, fake_hf_api, monkeypatch):
+        monkeypatch.setattr("thermal_scout.search.hub_api", lambda: fake_hf_api)
+        thermal_search("bert")
+
+        with request_timings() as timings:
+            thermal_search("bert")
+
+        assert timings.stages == {}
+        assert timings.cache == "hit"
+        assert counts(search_seconds) == {("miss", "none"): 1, ("hit", "none"): 1}
+
+    def test_explicit_index_bypasses_the_cache(self, isolated_cache_dir):
+        index = write_index(isolated_cache_dir / "index", [{"modelId": "org/bert"}])
+
+        with request_timings() as timings:
+            thermal_search("bert", index=index)
+
+        assert list(timings.stages) == ["index", "rank"]
+        assert timings.cache == "bypass"
+
+    def test_server_timing_header_value(self):
+        with request_timings() as timings:
+            timings.cache = "miss"
+            timings.add("hub", 0.0123)
+            timings.add("hub", 0.001)
+
+        assert timings.server_timing(0.02) == (
+            'hub;dur=13.30, cache;desc="miss", total;dur=20.00'
+        )
+
+
+class TestMetricsEndpoint:
+    """Test Server-Timing headers and /metrics"""
+
+    def test_search_reports_its_stages(self, fake_async_hub):
+        client = TestClient(app)
+
+        miss = client.get("/api/v1/search", params={"q": "bert"})
+        hit = client.get("/api/v1/search", params={"q": "bert"})
+
+        assert miss.status_code == 200
+        timing = miss.headers["Server-Timing"]
+        for name in ["hub", "classify", "rank", "serialize", "total"]:
+            assert f"{name};dur=" in timing
+        assert 'cache;desc="miss"' in timing
+        assert 'cache;desc="hit"' in hit.headers["Server-Timing"]
+        assert "hub;dur=" not in hit.headers["Server-Timing"]
+
+    def test_metrics_exposition(self, fake_async_hub):
+        client = TestClient(app)
+        client.get("/api/v1/search", params={"q": "bert"})
+        client.get("/api/v1/search", params={"q": "bert"})
+
+        response = client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        body = response.text
+        assert (
+            'thermal_scout_search_seconds_count{cache="hit",model_type="none"} 1'
+            in body
+        )
+        assert (
+            'thermal_scout_search_stage_seconds_count{stage="hub",cache="miss",'
+            'model_type="none"} 1' in body
+        )
+        assert (
+            'thermal_scout_http_request_duration_seconds_count{method="GET",'
+            'route="/api/v1/search",status="200"} 2' in body
+        )
+        assert "thermal_scout_search_cache_hits_total 1.0" in body
+
+    def test_unmatched_routes_share_a_label(self):
+        client = TestClient(app)
+        client.get("/no/such/path")
+        client.get("/another/missing/path")
+
+        assert counts(request_seconds) == {("GET", "unmatched", "404"): 2}
@@ -0,0 +1,153 @@
+"""
+Tests for thermal_scout.output and `thermal-scout search --format`
+"""
+
+import csv
+import io
+import json
+import sys
+from unittest.mock import patch
+
+import pytest
+from typer.testing import CliRunner
+
+from thermal_scout.cli import app as cli_app
+from thermal_scout.output import (
+    COLUMNS,
+    CsvWriter,
+    JsonLinesWriter,
+    OutputFormat,
+    open_writer,
+)
+
+MODELS = [
+    {
+        "modelId": "google/bert-tiny",
+        "thermal_cost": "Low",
+        "downloads": 1200,
+        "likes": 5,
+        "pipeline_tag": "fill-mask",
+        "library_name": "transformers",
+        "parameters": 4_400_000,
+        "tags": ["bert", "en"],
+        "lastModified": "2024-01-02T00:00:00Z",
+    },
+    {"modelId": "someone/unknown", "thermal_cost": "Unknown"},
+]
+
+
+class TestWriters:
+    """Test each format's writer"""
+
+    def test_json_lines(self):
+        stream = io.StringIO()
+        writer = JsonLinesWriter(stream)
+
+        writer.write(MODELS[:1])
+        writer.write(MODELS[1:])
+        writer.close()
+
+        assert [json.loads(line) for line in stream.getvalue().splitlines()] == MODELS
+
+    def test_csv(self):
+        stream = io.StringIO()
+        writer = CsvWriter(stream)
+
+        writer.write(MODELS)
+        writer.close()
+
+        stream.seek(0)
+        reader = csv.DictReader(stream)
+        rows = list(reader)
+        assert reader.fieldnames == COLUMNS
+        assert rows[0]["modelId"] == "google/bert-tiny"
+        assert rows[0]["tags"] == "bert,en"
+        assert rows[0]["parameters"] == "4400000"
+        assert rows[1]["downloads"] == "0"
+        assert rows[1]["tags"] == ""
+
+    def test_csv_header_without_results(self):
+        stream = io.StringIO()
+        CsvWriter(stream).close()
+
+        assert stream.getvalue() == ",".join(COLUMNS) + "\n"
+
+    def test_arrow(self):
+        pa = pytest.importorskip("pyarrow")
+        stream = io.BytesIO()
+        writer = open_writer(OutputFormat.arrow, io.StringIO(), stream)
+
+        writer.write(MODELS[:1])
+        writer.write([])
+        writer.write(MODELS[1:])
+        writer.close()
+
+        table = pa.ipc.open_stream(stream.getvalue()).read_all()
+        assert table.column_names == COLUMNS
+        assert table.column("modelId").to_pylist() == [
+            "google/bert-tiny",
+            "someone/unknown",
+        ]
+        assert table.column("tags").to_pylist() == [["bert", "en"], []]
+        assert table.column("parameters").to_pylist() == [4_400_000, None]
+
+    def test_arrow_without_pyarrow(self, monkeypatch):
+        monkeypatch.setitem(sys.modules, "pyarrow", None)
+
+        with pytest.raises(ImportError, match=r"thermal-scout\[arrow\]"):
+            open_writer(OutputFormat.arrow, io.StringIO(), io.BytesIO())
+
+
+class TestSearchFormat:
+    """Test thermal-scout search --format"""
+
+    @patch("thermal_scout.search.thermal_search")
+    def test_json_lines(self, mock_search):
+        mock_search.return_value = MODELS
+
+        result = CliRunner().invoke(cli_app, ["search", "bert", "--format", "jsonl"])
+
+        assert result.exit_code == 0
+        assert "Searching for" not in result.stdout
+        assert [json.loads(line) for line in result.stdout.splitlines()] == MODELS
+
+    @patch("thermal_scout.search.thermal_search")
+    def test_csv(self, mock_search):
+        mock_search.return_value = MODELS
+
+        result = CliRunner().invoke(cli_app, ["search", "bert", "-f", "CSV"])
+
+        assert result.exit_code == 0
+        rows = list(csv.DictReader(io.StringIO(result.stdout)))
+        assert [row["modelId"] for row in rows] == [m["modelId"] for m in MODELS]
+
+    @patch("thermal_scout.search.thermal_search")
+    def test_no_results_writes_only_the_header(self, mock_search):
+        mock_search.return_value = []
+
+        result = CliRunner().invoke(cli_app, ["search", "bert", "--format", "csv"])
+
+        assert result.exit_code == 0
+        assert result.stdout == ",".join(COLUMNS) + "\n"
+
+    def test_all_pages(self, fake_async_hub):
+        result = CliRunner().invoke(
+            cli_app, ["search", "bert", "--all", "--format", "jsonl"]
+        )
+
+        assert result.exit_code == 0
+        records = [json.loads(line) for line in result.stdout.splitlines()]
+        assert len(records) == 3
+        assert "Listed" not in result.stdout
+
+    def test_arrow_without_pyarrow(self, monkeypatch):
+        monkeypatch.setitem(sys.modules, "pyarrow", None)
+
+        result = CliRunner().invoke(cli_app, ["search", "bert", "--format", "arrow"])
+
+        assert result.exit_code == 2
+
+    def test_rejects_unknown_formats(self):
+        result = CliRunner().invoke(cli_app, ["search", "bert", "--format", "xml"])
+
+        assert result.exit_code == 2
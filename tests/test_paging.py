@@ -0,0 +1,229 @@
+"""
+Tests for thermal_scout.paging module and cursor pagination
+"""
+
+import asyncio
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from typer.testing import CliRunner
+
+from thermal_scout.api.main import app
+from thermal_scout.cli import app as cli_app
+from thermal_scout.hub import AsyncHubClient, HubSettings
+from thermal_scout.index import write_index
+from thermal_scout.paging import (
+    FIRST_PAGE,
+    InvalidCursor,
+    async_iter_search,
+    async_search_page,
+    decode_cursor,
+    encode_cursor,
+)
+
+
+def paging_hub(count):
+    """A client over ``count`` models that the Hub serves in cursor pages"""
+    ids = [f"org/model-{n:03d}" for n in range(count)]
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        params = request.url.params
+        start = int(params.get("cursor", 0))
+        end = start + int(params["limit"])
+        body = [{"id": model_id, "tags": []} for model_id in ids[start:end]]
+        headers = {}
+        if end < count:
+            next_url = request.url.copy_set_param("cursor", end)
+            headers["Link"] = f'<{next_url}>; rel="next"'
+        return httpx.Response(200, json=body, headers=headers)
+
+    settings = HubSettings(
+        "http://hub.test", timeout=5, retries=0, backoff=0, pool_size=2
+    )
+    client = AsyncHubClient(settings=settings, transport=httpx.MockTransport(handler))
+    return client, ids, requests
+
+
+def flatten(pages):
+    return [item for page in pages for item in page]
+
+
+async def walk(query, limit, **kwargs):
+    """Every page of ``query`` as lists of ids"""
+    pages = []
+    cursor = FIRST_PAGE
+    while cursor is not None:
+        page = await async_search_page(query, limit, cursor=cursor, **kwargs)
+        pages.append([m["modelId"] for m in page.models])
+        cursor = page.next_cursor
+    return pages
+
+
+@pytest.fixture
+def local_index(isolated_cache_dir, monkeypatch):
+    path = isolated_cache_dir / "index"
+    monkeypatch.setenv("THERMAL_SCOUT_INDEX", str(path))
+    models = [
+        {"modelId": f"bert-{n:02d}", "downloads": n % 7, "pipeline_tag": "fill-mask"}
+        for n in range(25)
+    ]
+    write_index(path, models)
+    return path
+
+
+class TestCursors:
+    """Test cursor encoding"""
+
+    def test_round_trip(self):
+        state = {"q": "bert", "type": None, "gen": 3, "offset": 20}
+
+        cursor = encode_cursor(state)
+
+        assert decode_cursor(cursor) == state
+        assert cursor.isascii() and "=" not in cursor
+
+    @pytest.mark.parametrize("cursor", ["not base64!", "bm90IGpzb24", "WzFd"])
+    def test_malformed(self, cursor):
+        with pytest.raises(InvalidCursor):
+            decode_cursor(cursor)
+
+
+class TestIndexPaging:
+    """Test cursors over the local index"""
+
+    def test_pages_cover_every_result_once(self, local_index):
+        from thermal_scout.index import load_default_index
+
+        pages = asyncio.run(walk("bert", 10))
+
+        assert [len(page) for page in pages] == [10, 10, 5]
+        expected = [m["modelId"] for m in load_default_index().search("bert")]
+        assert flatten(pages) == expected
+
+    def test_result_order_is_ranked_once(self, local_index):
+        from thermal_scout.index import load_default_index
+
+        asyncio.run(walk("", 4, model_type="fill-mask"))
+
+        stats = load_default_index()._ranked.stats()
+        assert (stats.misses, stats.hits) == (1, 6)
+
+    def test_cursor_from_older_snapshot(self, local_index):
+        page = asyncio.run(async_search_page("bert", 10))
+        write_index(local_index, [{"modelId": "bert-new", "downloads": 1}])
+
+        with pytest.raises(InvalidCursor, match="snapshot"):
+            asyncio.run(async_search_page("bert", 10, cursor=page.next_cursor))
+
+    def test_cursor_from_another_search(self, local_index):
+        page = asyncio.run(async_search_page("bert", 10))
+
+        with pytest.raises(InvalidCursor, match="different search"):
+            asyncio.run(async_search_page("gpt", 10, cursor=page.next_cursor))
+
+
+class TestHubPaging:
+    """Test cursors over the Hub's listing pagination"""
+
+    def test_each_page_is_one_request(self):
+        client, ids, requests = paging_hub(25)
+
+        pages = asyncio.run(walk("", 10, client=client))
+
+        assert flatten(pages) == ids
+        assert len(requests) == 3
+        assert [r.url.params.get("cursor") for r in requests] == [None, "10", "20"]
+
+    def test_page_size_can_change_between_pages(self):
+        client, ids, requests = paging_hub(25)
+
+        async def run():
+            first = await async_search_page("", 10, client=client)
+            return await async_search_page(
+                "", 5, cursor=first.next_cursor, client=client
+            )
+
+        page = asyncio.run(run())
+
+        assert [m["modelId"] for m in page.models] == ids[10:15]
+        assert requests[1].url.params["limit"] == "5"
+
+    def test_cursor_only_reaches_the_configured_hub(self):
+        client, _, requests = paging_hub(25)
+        forged = encode_cursor({"q": "", "type": None, "hub": "cursor=20&limit=3"})
+
+        asyncio.run(async_search_page("", 5, cursor=forged, client=client))
+
+        assert requests[0].url.host == "hub.test"
+        assert requests[0].url.path == "/api/models"
+
+    def test_iter_search_follows_cursors(self):
+        client, ids, _ = paging_hub(7)
+
+        async def run():
+            return [
+                page async for page in async_iter_search("", page_size=3, client=client)
+            ]
+
+        pages = asyncio.run(run())
+
+        assert [len(page) for page in pages] == [3, 3, 1]
+        assert [m["modelId"] for m in flatten(pages)] == ids
+
+
+class TestSearchEndpointCursor:
+    """Test cursor paging on /api/v1/search"""
+
+    def test_walks_every_page(self, local_index):
+        client = TestClient(app)
+        seen = []
+        cursor = "*"
+        while cursor is not None:
+            response = client.get(
+                "/api/v1/search", params={"q": "bert", "limit": 10, "cursor": cursor}
+            )
+            assert response.status_code == 200
+            data = response.json()
+            seen += [m["modelId"] for m in data["models"]]
+            cursor = data["next_cursor"]
+
+        assert len(seen) == len(set(seen)) == 25
+
+    def test_invalid_cursor(self, local_index):
+        response = TestClient(app).get(
+            "/api/v1/search", params={"q": "bert", "cursor": "garbage!"}
+        )
+
+        assert response.status_code == 400
+
+    def test_no_cursor_without_paging(self, local_index):
+        data = TestClient(app).get("/api/v1/search", params={"q": "bert"}).json()
+
+        assert data["next_cursor"] is None
+        assert data["thermal_aware"] is True
+
+
+class TestSearchAllCommand:
+    """Test `thermal-scout search --all`"""
+
+    def test_lists_every_result(self, local_index):
+        result = CliRunner().invoke(cli_app, ["search", "bert", "--all"])
+
+        assert result.exit_code == 0
+        assert "bert-00" in result.stdout
+        assert "Listed 25 models" in result.stdout
+
+    def test_hub_results(self, fake_async_hub):
+        result = CliRunner().invoke(cli_app, ["search", "bert", "--all"])
+
+        assert result.exit_code == 0
+        assert "Listed 3 models" in result.stdout
+
+    def test_no_results(self, fake_async_hub):
+        result = CliRunner().invoke(cli_app, ["search", "nothing", "--all"])
+
+        assert result.exit_code == 0
+        assert "No models found" in result.stdout
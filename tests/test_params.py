@@ -0,0 +1,136 @@
+"""
+Tests for thermal_scout.params module
+"""
+
+import pytest
+
+from thermal_scout.index import ModelIndex
+from thermal_scout.params import ParameterCache, resolve_parameters
+from thermal_scout.search import thermal_search
+from thermal_scout.sync import sync_index
+
+
+@pytest.fixture
+def fake_hub(fake_hf_api, make_fake_model, make_safetensors, monkeypatch):
+    """Fake Hub whose models carry safetensors metadata and a sha"""
+    fake_hf_api.models = [
+        # Named tiny, but the metadata says 8B
+        make_fake_model(
+            "acme/tiny-chat",
+            downloads=300,
+            sha="a1",
+            safetensors=make_safetensors(8_030_261_248),
+        ),
+        make_fake_model(
+            "acme/chat-7b",
+            downloads=200,
+            sha="b1",
+            safetensors=make_safetensors(494_032_768),
+        ),
+        # No safetensors metadata, classified from its id
+        make_fake_model("acme/chat-70b", downloads=100, sha="c1"),
+    ]
+    monkeypatch.setattr("thermal_scout.search.hub_api", lambda: fake_hf_api)
+    return fake_hf_api
+
+
+def costs(results):
+    return {m["modelId"]: (m["parameters"], m["thermal_cost"]) for m in results}
+
+
+class TestParameterCache:
+    """Test the persistent (model id, sha) store"""
+
+    def test_values_persist_across_instances(self, tmp_path):
+        ParameterCache(tmp_path / "p.sqlite").put("acme/model", "a1", 7_000_000)
+
+        cache = ParameterCache(tmp_path / "p.sqlite")
+        assert cache.get("acme/model", "a1") == 7_000_000
+        assert cache.get("acme/model", "b2", "missing") == "missing"
+
+    def test_unknown_counts_are_remembered(self, tmp_path):
+        cache = ParameterCache(tmp_path / "p.sqlite")
+        cache.put("acme/model", "a1", None)
+
+        assert cache.get("acme/model", "a1", "missing") is None
+
+    def test_new_revision_replaces_old(self, tmp_path):
+        cache = ParameterCache(tmp_path / "p.sqlite")
+        cache.put("acme/model", "a1", 1)
+        cache.put("acme/model", "b2", 2)
+
+        assert cache.get("acme/model", "a1", "missing") == "missing"
+        assert cache.get("acme/model", "b2") == 2
+
+
+class TestSearchParameters:
+    """Test exact parameter counts in thermal_search"""
+
+    def test_exact_counts_decide_thermal_cost(self, fake_hub):
+        results = thermal_search("acme", limit=3)
+
+        assert costs(results) == {
+            "acme/tiny-chat": (8_030_261_248, "High"),
+            "acme/chat-7b": (494_032_768, "Low"),
+            "acme/chat-70b": (None, "High"),
+        }
+        assert "safetensors" in fake_hub.calls[0]["expand"]
+
+    def test_counts_come_only_from_the_listing(self, fake_hub, isolated_cache_dir):
+        thermal_search("acme", limit=3)
+        thermal_search("acme", limit=1, sort="downloads")
+
+        # Not even for the model without metadata, and nothing is stored
+        assert fake_hub.info_calls == []
+        assert not (isolated_cache_dir / "parameters.sqlite").exists()
+
+    def test_unlisted_counts_fall_back_to_the_id(self, fake_hub):
+        listed = fake_hub.list_models
+
+        def without_safetensors(**kwargs):
+            for model in listed(**kwargs):
+                yield type(model)(**{**vars(model), "safetensors": None})
+
+        fake_hub.list_models = without_safetensors
+
+        results = thermal_search("acme", limit=3)
+
+        assert costs(results)["acme/tiny-chat"] == (None, "Low")
+        assert fake_hub.info_calls == []
+
+    def test_new_revision_uses_the_new_listed_count(
+        self, fake_hub, make_safetensors, empty_search_cache
+    ):
+        thermal_search("acme", limit=3)
+        empty_search_cache.clear()
+        fake_hub.models[0].sha = "a2"
+        fake_hub.models[0].safetensors = make_safetensors(500_000_000)
+
+        results = thermal_search("acme", limit=3)
+
+        assert costs(results)["acme/tiny-chat"] == (500_000_000, "Low")
+
+    def test_listed_counts_skip_the_fetch(self, fake_hub, tmp_path):
+        models = list(fake_hub.list_models(search="acme"))
+        cache = ParameterCache(tmp_path / "p.sqlite")
+
+        totals = resolve_parameters(fake_hub, models, cache)
+
+        assert totals == [8_030_261_248, 494_032_768, None]
+        assert [c["repo_id"] for c in fake_hub.info_calls] == ["acme/chat-70b"]
+        # Only what was fetched is stored; the listing has the rest
+        assert cache.get("acme/chat-70b", "c1", "missing") is None
+        assert cache.get("acme/chat-7b", "b1", "missing") == "missing"
+
+
+class TestSyncParameters:
+    """Test parameter counts in the local index"""
+
+    def test_sync_stores_listed_counts(self, fake_hub, tmp_path):
+        sync_index(fake_hub, tmp_path)
+
+        models = {m["modelId"]: m for m in ModelIndex(tmp_path).records()}
+        assert models["acme/tiny-chat"]["parameters"] == 8_030_261_248
+        assert models["acme/tiny-chat"]["thermal_cost"] == "High"
+        assert models["acme/chat-70b"]["parameters"] is None
+        assert fake_hub.info_calls == []
@@ -0,0 +1,262 @@
+"""
+Tests for thermal_scout.ranking module and the sort parameter
+"""
+
+import random
+from datetime import UTC, datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+from typer.testing import CliRunner
+
+from thermal_scout.api.main import app
+from thermal_scout.cli import app as cli_app
+from thermal_scout.index import write_index
+from thermal_scout.ranking import (
+    DEFAULT_SORT,
+    RECENCY_HALF_LIFE_DAYS,
+    SCORERS,
+    parse_sort,
+    register_scorer,
+    top_k,
+)
+from thermal_scout.search import thermal_search
+from thermal_scout.thermal import THERMAL_LEVELS
+
+NOW = datetime(2025, 1, 1, tzinfo=UTC)
+
+
+def modified(days_ago):
+    return (NOW - timedelta(days=days_ago)).isoformat()
+
+
+def ids(models):
+    return [m["modelId"] for m in models]
+
+
+@pytest.fixture
+def models():
+    return [
+        {
+            "modelId": "org/old-popular",
+            "thermal_cost": "Low",
+            "downloads": 900,
+            "likes": 100,
+            "lastModified": modified(720),
+        },
+        {
+            "modelId": "org/new-liked",
+            "thermal_cost": "Low",
+            "downloads": 100,
+            "likes": 60,
+            "lastModified": modified(0),
+        },
+        {
+            "modelId": "org/hot-bert",
+            "thermal_cost": "High",
+            "downloads": 5000,
+            "likes": 500,
+            "tags": ["bert"],
+            "lastModified": modified(30),
+        },
+        {
+            "modelId": "org/medium",
+            "thermal_cost": "Medium",
+            "downloads": 900,
+            "likes": 0,
+            "lastModified": None,
+        },
+    ]
+
+
+class TestScorers:
+    """Test the built-in scorers"""
+
+    def test_thermal_prefers_cool_models(self):
+        score = SCORERS["thermal"](None)
+
+        assert [score({"thermal_cost": level}) for level in THERMAL_LEVELS] == [
+            0,
+            -1,
+            -2,
+        ]
+        assert score({}) == -2
+        assert score({"thermal_cost": "Unknown"}) == -3
+
+    def test_recency_halves_every_half_life(self, models):
+        score = parse_sort("recency", now=NOW.timestamp()).key
+
+        assert score(models[1]) == pytest.approx(1.0)
+        assert score(models[0]) == pytest.approx(0.5 ** (720 / RECENCY_HALF_LIFE_DAYS))
+        assert score(models[3]) == 0.0
+
+    def test_relevance_counts_query_terms(self, models):
+        score = parse_sort("relevance", query="BERT models").key
+
+        assert score(models[2]) == 3  # "bert" in the id and a tag
+        assert score(models[0]) == 0
+
+    def test_missing_counts_are_zero(self):
+        assert parse_sort("downloads,likes").key({"downloads": None}) == (0, 0)
+
+
+class TestParseSort:
+    """Test composing scorers into sort orders"""
+
+    def test_default_matches_the_original_sort(self, models):
+        expected = sorted(
+            models,
+            key=lambda m: (
+                THERMAL_LEVELS.index(m["thermal_cost"]),
+                -m["downloads"],
+            ),
+        )
+
+        assert parse_sort(DEFAULT_SORT).top_k(models, 10) == expected
+
+    def test_keys_break_ties_in_turn(self, models):
+        ranking = parse_sort("thermal,likes")
+
+        assert ids(ranking.top_k(models, 3)) == [
+            "org/old-popular",
+            "org/new-liked",
+            "org/medium",
+        ]
+
+    def test_products_weight_by_recency(self, models):
+        ranking = parse_sort("thermal,likes*recency", now=NOW.timestamp())
+
+        assert ids(ranking.top_k(models, 2)) == ["org/new-liked", "org/old-popular"]
+
+    def test_weighted_sums(self, models):
+        ranking = parse_sort("downloads + 10 * likes")
+
+        assert ids(ranking.top_k(models, 4)) == [
+            "org/hot-bert",
+            "org/old-popular",
+            "org/medium",
+            "org/new-liked",
+        ]
+
+    def test_minus_reverses_the_whole_key(self, models):
+        ranking = parse_sort("-downloads + 10 * likes")
+
+        assert ids(ranking.top_k(models, 4)) == [
+            "org/new-liked",
+            "org/medium",
+            "org/old-popular",
+            "org/hot-bert",
+        ]
+
+    @pytest.mark.parametrize("sort", ["warmth", "thermal,", "2", "likes*", ""])
+    def test_invalid_orders(self, sort):
+        with pytest.raises(ValueError):
+            parse_sort(sort)
+
+    def test_custom_scorers(self, models, monkeypatch):
+        monkeypatch.setattr("thermal_scout.ranking.SCORERS", dict(SCORERS))
+        register_scorer("short_id")(lambda _: lambda model: -len(model["modelId"]))
+
+        assert ids(parse_sort("short_id").top_k(models, 1)) == ["org/medium"]
+
+
+class TestTopK:
+    """Test the bounded heap selection"""
+
+    def test_matches_a_stable_full_sort(self):
+        rng = random.Random(0)
+        items = [{"n": n, "score": rng.randint(0, 20)} for n in range(500)]
+
+        def key(item):
+            return item["score"]
+
+        assert top_k(items, 50, key) == sorted(items, key=key, reverse=True)[:50]
+
+    def test_k_larger_than_input(self):
+        assert top_k([{"a": 1}, {"a": 2}], 5, lambda m: m["a"]) == [
+            {"a": 2},
+            {"a": 1},
+        ]
+
+
+class TestSortedSearch:
+    """Test thermal_search with an explicit sort order"""
+
+    def test_ranks_the_budget_not_just_the_first_page(self, isolated_cache_dir):
+        index = write_index(
+            isolated_cache_dir / "index",
+            [
+                {"modelId": f"model-{n}", "downloads": 100 - n, "likes": n}
+                for n in range(50)
+            ],
+        )
+
+        plain = thermal_search("", limit=3, index=index, thermal_aware=False)
+        sorted_ = thermal_search("", limit=3, index=index, sort="likes", budget=20)
+
+        assert ids(plain) == ["model-0", "model-1", "model-2"]
+        assert ids(sorted_) == ["model-19", "model-18", "model-17"]
+
+    def test_index_keeps_last_modified(self, isolated_cache_dir):
+        index = write_index(
+            isolated_cache_dir / "index",
+            [
+                {"modelId": "a", "lastModified": "2024-05-01T12:00:00+00:00"},
+                {"modelId": "b"},
+            ],
+        )
+
+        assert index.model(0)["lastModified"] == "2024-05-01T12:00:00+00:00"
+        assert index.model(1)["lastModified"] is None
+
+    def test_hub_results_carry_last_modified(self, fake_async_hub):
+        response = TestClient(app).get(
+            "/api/v1/search", params={"q": "bert", "sort": "recency"}
+        )
+
+        assert response.status_code == 200
+        assert ids(response.json()["models"]) == [
+            "distilbert-base-uncased",
+            "bert-large-uncased",
+            "google/bert-tiny",
+        ]
+        assert "lastModified" in fake_async_hub.calls[0]["expand"]
+
+
+class TestSortParameter:
+    """Test sort= on the API and --sort on the CLI"""
+
+    def test_api_passes_sort(self):
+        with patch("thermal_scout.api.main.async_thermal_search_raising") as search:
+            search.return_value = []
+            response = TestClient(app).get(
+                "/api/v1/search", params={"q": "bert", "sort": "likes*recency"}
+            )
+
+        assert response.status_code == 200
+        assert search.call_args.kwargs["sort"] == "likes*recency"
+
+    def test_api_rejects_unknown_keys(self):
+        response = TestClient(app).get(
+            "/api/v1/search", params={"q": "bert", "sort": "warmth"}
+        )
+
+        assert response.status_code == 422
+        assert "warmth" in response.json()["detail"]
+
+    def test_cli_sort(self):
+        with patch("thermal_scout.search.thermal_search") as search:
+            search.return_value = [{"modelId": "org/a", "thermal_cost": "Low"}]
+            result = CliRunner().invoke(
+                cli_app, ["search", "bert", "--sort", "thermal,likes"]
+            )
+
+        assert result.exit_code == 0
+        assert search.call_args.kwargs["sort"] == "thermal,likes"
+        assert "Results sorted by thermal,likes" in result.stdout
+
+    def test_cli_rejects_unknown_keys(self):
+        result = CliRunner().invoke(cli_app, ["search", "bert", "--sort", "warmth"])
+
+        assert result.exit_code == 2
@@ -0,0 +1,154 @@
+"""
+Tests for thermal_scout.records module
+"""
+
+import json
+import pickle
+
+import pytest
+
+from thermal_scout import records
+from thermal_scout.index import write_index
+from thermal_scout.records import KEYS, ModelRecord, TagVocabulary, shared_tags
+from thermal_scout.search import thermal_search
+from thermal_scout.thermal import ThermalTier
+
+RESULT = {
+    "modelId": "google/bert-tiny",
+    "downloads": 500000,
+    "likes": 200,
+    "tags": ["transformers", "tiny", "region:us"],
+    "pipeline_tag": "text-classification",
+    "library_name": "transformers",
+    "parameters": 4_385_920,
+    "lastModified": "2024-05-01T12:30:00.250000+00:00",
+    "thermal_cost": "Low",
+}
+
+
+class TestTagVocabulary:
+    """Test interning tags as ids"""
+
+    def test_round_trip(self):
+        vocabulary = TagVocabulary()
+
+        data = vocabulary.encode(["bert", "en", "bert"])
+
+        assert vocabulary.decode(data) == ["bert", "en", "bert"]
+        assert len(data) == 12
+        assert len(vocabulary) == 2
+
+    def test_ids_are_stable(self):
+        vocabulary = TagVocabulary()
+        first = vocabulary.id("bert")
+        vocabulary.encode(["en", "fr"])
+
+        assert vocabulary.id("bert") == first
+
+    def test_no_tags(self):
+        assert shared_tags().encode([]) == b""
+        assert shared_tags().decode(b"") == []
+
+    def test_full_shared_vocabulary_is_replaced(self, monkeypatch):
+        monkeypatch.setattr(records, "VOCABULARY_SIZE", 2)
+        monkeypatch.setattr(records, "_shared", TagVocabulary())
+        old = ModelRecord.from_mapping(RESULT)
+        new = ModelRecord.from_mapping(RESULT | {"tags": ["arxiv:1810.04805"]})
+
+        assert shared_tags() is not old._vocabulary
+        assert len(shared_tags()) == 1
+        assert old["tags"] == RESULT["tags"]
+        assert new["tags"] == ["arxiv:1810.04805"]
+
+    def test_index_rows_use_the_index_vocabulary(self, tmp_path):
+        index = write_index(tmp_path / "index", [RESULT])
+
+        record = index.model(0)
+
+        assert record["tags"] == RESULT["tags"]
+        assert record._vocabulary is index.vocabulary
+        assert index.vocabulary.names == index.tags
+
+
+class TestModelRecord:
+    """Test records behaving like result dicts"""
+
+    def test_same_items_as_the_dict(self):
+        record = ModelRecord.from_mapping(RESULT)
+
+        assert record == RESULT
+        assert dict(record) == RESULT
+        assert list(record) == list(KEYS)
+        assert record["tags"] == ["transformers", "tiny", "region:us"]
+        assert record.get("lastModified") == RESULT["lastModified"]
+
+    def test_stored_compactly(self):
+        record = ModelRecord.from_mapping(RESULT)
+
+        assert record.tier is ThermalTier.LOW
+        assert record.modified == 1714566600.25
+        assert not hasattr(record, "__dict__")
+        assert record.pipeline_tag is ModelRecord.from_mapping(RESULT).pipeline_tag
+
+    def test_unknown_values(self):
+        record = ModelRecord.from_mapping(
+            {"modelId": "someone/model", "thermal_cost": "High"}
+        )
+
+        assert record == {
+            "modelId": "someone/model",
+            "downloads": 0,
+            "likes": 0,
+            "tags": [],
+            "pipeline_tag": None,
+            "library_name": None,
+            "parameters": None,
+            "lastModified": None,
+            "thermal_cost": "High",
+        }
+
+    def test_given_thermal_cost_wins(self):
+        record = ModelRecord.from_mapping(RESULT, "Medium")
+
+        assert record["thermal_cost"] == "Medium"
+
+    def test_unknown_keys(self):
+        record = ModelRecord.from_mapping(RESULT)
+
+        with pytest.raises(KeyError):
+            record["tier"]
+        assert record.get("tier", "none") == "none"
+        assert "tier" not in record
+        assert "tags" in record
+
+    def test_read_only(self):
+        record = ModelRecord.from_mapping(RESULT)
+
+        with pytest.raises(TypeError):
+            record["likes"] = 0  # type: ignore[index]
+
+    def test_json_and_pickle(self):
+        record = ModelRecord.from_mapping(RESULT)
+
+        assert json.loads(json.dumps(dict(record))) == RESULT
+        assert pickle.loads(pickle.dumps(record)) == record
+
+
+class TestRecordsEndToEnd:
+    """Test search and the index returning records"""
+
+    def test_index_rows(self, tmp_path):
+        index = write_index(tmp_path / "index", [RESULT])
+
+        record = index.model(0)
+
+        assert isinstance(record, ModelRecord)
+        assert record == RESULT
+
+    def test_search_results(self, tmp_path):
+        index = write_index(tmp_path / "index", [RESULT])
+
+        results = thermal_search("bert", index=index)
+
+        assert [type(model) for model in results] == [ModelRecord]
+        assert results[0]["thermal_cost"] == "Low"
@@ -66,7 +66,7 @@ class TestEstimateThermalCost:
 class TestThermalSearch:
     """Test thermal search functionality"""
 
-    @patch("thermal_scout.search.HfApi")
+    @patch("thermal_scout.search.hub_api")
     def test_basic_search_returns_results(self, mock_hf_api_class, sample_model_list):
         """Basic search should return formatted results"""
         mock_api = Mock()
@@ -80,7 +80,7 @@ class TestThermalSearch:
         assert all("thermal_cost" in r for r in results)
         mock_api.list_models.assert_called_once()
 
-    @patch("thermal_scout.search.HfApi")
+    @patch("thermal_scout.search.hub_api")
     def test_thermal_aware_search_sorts_by_efficiency(
         self, mock_hf_api_class, sample_model_list
     ):
@@ -106,7 +106,7 @@ class TestThermalSearch:
                 else True
             )
 
-    @patch("thermal_scout.search.HfApi")
+    @patch("thermal_scout.search.hub_api")
     def test_non_thermal_aware_preserves_order(
         self, mock_hf_api_class, sample_model_list
     ):
@@ -122,7 +122,7 @@ class TestThermalSearch:
         expected_ids = [m.modelId for m in sample_model_list]
         assert model_ids == expected_ids
 
-    @patch("thermal_scout.search.HfApi")
+    @patch("thermal_scout.search.hub_api")
     def test_model_type_filter_applied(self, mock_hf_api_class):
         """Model type filter should be passed to API"""
         mock_api = Mock()
@@ -135,7 +135,7 @@ class TestThermalSearch:
         call_kwargs = mock_api.list_models.call_args.kwargs
         assert call_kwargs["task"] == "text-generation"
 
-    @patch("thermal_scout.search.HfApi")
+    @patch("thermal_scout.search.hub_api")
     def test_empty_results_handled_gracefully(self, mock_hf_api_class):
         """Empty search results should return empty list"""
         mock_api = Mock()
@@ -146,7 +146,7 @@ class TestThermalSearch:
 
         assert results == []
 
-    @patch("thermal_scout.search.HfApi")
+    @patch("thermal_scout.search.hub_api")
     def test_api_error_handled_gracefully(self, mock_hf_api_class):
         """API errors should be caught and return empty list"""
         mock_api = Mock()
@@ -157,20 +157,20 @@ class TestThermalSearch:
 
         assert results == []
 
-    @patch("thermal_scout.search.HfApi")
-    def test_thermal_search_gets_extra_results_for_filtering(self, mock_hf_api_class):
-        """Thermal search should request extra results for better filtering"""
+    @patch("thermal_scout.search.hub_api")
+    def test_thermal_search_does_not_over_fetch(self, mock_hf_api_class):
+        """Unfiltered thermal search should request exactly the limit"""
         mock_api = Mock()
         mock_hf_api_class.return_value = mock_api
         mock_api.list_models.return_value = []
 
         thermal_search("bert", limit=10, thermal_aware=True)
 
-        # Should request 2x limit for thermal filtering
+        # Ranking is a top-k over what was listed; nothing extra is fetched
         call_kwargs = mock_api.list_models.call_args.kwargs
-        assert call_kwargs["limit"] == 20
+        assert call_kwargs["limit"] == 10
 
-    @patch("thermal_scout.search.HfApi")
+    @patch("thermal_scout.search.hub_api")
     def test_model_attributes_preserved(self, mock_hf_api_class, sample_model_list):
         """All model attributes should be preserved in results"""
         mock_api = Mock()
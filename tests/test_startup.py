@@ -0,0 +1,70 @@
+"""
+Startup-time regression tests for the CLI
+"""
+
+import re
+import subprocess
+import sys
+
+import pytest
+
+# Imported only by the commands that need them
+HEAVY_MODULES = ["huggingface_hub", "httpx", "numpy", "fastapi", "pydantic"]
+
+# The CLI framework, which every invocation pays for
+FRAMEWORK_PACKAGES = {"typer", "click", "rich"}
+
+# Import time of thermal_scout.cli on top of the framework, in milliseconds
+IMPORT_BUDGET_MS = 50
+
+_IMPORT_TIME = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)")
+
+
+def import_times(*args):
+    """(cumulative microseconds, depth, module) per import of a python run"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return [
+        (int(match[2]), len(match[3]) // 2, match[4])
+        for match in map(_IMPORT_TIME.match, result.stderr.splitlines())
+        if match
+    ]
+
+
+def imported(*args):
+    return {module.split(".")[0] for _, _, module in import_times(*args)}
+
+
+class TestLazyImports:
+    """Test that quick commands do not load the search stack"""
+
+    @pytest.mark.parametrize("command", [["--help"], ["about"], ["search", "--help"]])
+    def test_quick_commands_skip_heavy_imports(self, command):
+        loaded = imported("-m", "thermal_scout.cli", *command)
+
+        assert loaded.isdisjoint(HEAVY_MODULES)
+
+
+class TestImportBudget:
+    """Test the import time of the CLI module itself"""
+
+    def test_cli_import_is_within_budget(self):
+        times = import_times("-c", "import thermal_scout.cli")
+
+        # Each module is listed after the modules it imported, one level deeper
+        (index,) = [
+            n for n, entry in enumerate(times) if entry[2] == "thermal_scout.cli"
+        ]
+        total, depth, _ = times[index]
+        framework = 0
+        for cumulative, child_depth, module in reversed(times[:index]):
+            if child_depth <= depth:
+                break
+            if child_depth == depth + 1 and module.split(".")[0] in FRAMEWORK_PACKAGES:
+                framework += cumulative
+
+        assert (total - framework) / 1000 < IMPORT_BUDGET_MS
@@ -0,0 +1,162 @@
+"""
+Tests for streaming search and the /api/v1/search:stream endpoint
+"""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from thermal_scout.api.main import app
+from thermal_scout.hub import AsyncHubClient, HubSettings
+from thermal_scout.index import write_index
+from thermal_scout.search import async_stream_search
+
+
+def paged_hub(pages, fail_from=None):
+    """A client serving ``pages`` of ids linked by Link headers"""
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        n = len(requests) - 1
+        if fail_from is not None and n >= fail_from:
+            return httpx.Response(500)
+        headers = {}
+        if n + 1 < len(pages):
+            headers["Link"] = f'<http://hub.test/api/models?page={n + 1}>; rel="next"'
+        body = [{"id": model_id, "tags": []} for model_id in pages[n]]
+        return httpx.Response(200, json=body, headers=headers)
+
+    settings = HubSettings(
+        "http://hub.test", timeout=5, retries=0, backoff=0, pool_size=2
+    )
+    client = AsyncHubClient(settings=settings, transport=httpx.MockTransport(handler))
+    return client, requests
+
+
+async def collect(stream):
+    return [model async for model in stream]
+
+
+class TestAsyncStreamSearch:
+    """Test the streaming search generator"""
+
+    def test_yields_in_hub_order_without_sorting(self, fake_async_hub):
+        models = asyncio.run(collect(async_stream_search("bert", limit=3)))
+
+        assert [m["modelId"] for m in models] == [
+            "bert-large-uncased",
+            "distilbert-base-uncased",
+            "google/bert-tiny",
+        ]
+        assert [m["thermal_cost"] for m in models] == ["High", "Low", "Low"]
+
+    def test_first_page_is_yielded_before_the_next_is_requested(self):
+        client, requests = paged_hub([["a-1", "a-2"], ["b-1"]])
+
+        async def first():
+            stream = async_stream_search("", limit=10, client=client)
+            model = await anext(stream)
+            await stream.aclose()
+            return model
+
+        assert asyncio.run(first())["modelId"] == "a-1"
+        assert len(requests) == 1
+
+    def test_stops_at_limit(self):
+        client, requests = paged_hub([["a-1", "a-2"], ["b-1", "b-2"], ["c-1"]])
+
+        models = asyncio.run(collect(async_stream_search("", limit=3, client=client)))
+
+        assert [m["modelId"] for m in models] == ["a-1", "a-2", "b-1"]
+        assert len(requests) == 2
+
+    def test_local_index(self, isolated_cache_dir, monkeypatch):
+        path = isolated_cache_dir / "index"
+        monkeypatch.setenv("THERMAL_SCOUT_INDEX", str(path))
+        write_index(path, [{"modelId": f"bert-{n}", "downloads": n} for n in range(5)])
+
+        models = asyncio.run(collect(async_stream_search("bert", limit=2)))
+
+        assert len(models) == 2
+
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+
+class TestStreamEndpoint:
+    """Test GET /api/v1/search:stream"""
+
+    def test_ndjson(self, fake_async_hub, client):
+        response = client.get("/api/v1/search:stream", params={"q": "bert"})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert [m["modelId"] for m in lines] == [
+            "bert-large-uncased",
+            "distilbert-base-uncased",
+            "google/bert-tiny",
+        ]
+        assert set(lines[0]) == {
+            "modelId",
+            "downloads",
+            "likes",
+            "tags",
+            "pipeline_tag",
+            "library_name",
+            "parameters",
+            "thermal_cost",
+        }
+
+    def test_server_sent_events(self, fake_async_hub, client):
+        response = client.get(
+            "/api/v1/search:stream",
+            params={"q": "bert", "limit": 2},
+            headers={"Accept": "text/event-stream"},
+        )
+
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = response.text.strip().split("\n\n")
+        assert len(events) == 3
+        assert json.loads(events[0].removeprefix("data: "))["modelId"] == (
+            "bert-large-uncased"
+        )
+        assert events[-1].startswith("event: done")
+
+    def test_no_results(self, fake_async_hub, client):
+        response = client.get("/api/v1/search:stream", params={"q": "nothing"})
+
+        assert response.status_code == 200
+        assert response.text == ""
+
+    def test_error_before_first_result(self, client, monkeypatch):
+        hub, _ = paged_hub([["a-1"]], fail_from=0)
+        monkeypatch.setattr("thermal_scout.search.get_async_client", lambda: hub)
+
+        response = client.get("/api/v1/search:stream", params={"q": "bert"})
+
+        assert response.status_code == 500
+
+    def test_error_after_first_result(self, client, monkeypatch):
+        hub, _ = paged_hub([["a-1"], ["b-1"]], fail_from=1)
+        monkeypatch.setattr("thermal_scout.search.get_async_client", lambda: hub)
+
+        response = client.get("/api/v1/search:stream", params={"q": "", "limit": 5})
+
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert response.status_code == 200
+        assert lines[0]["modelId"] == "a-1"
+        assert "error" in lines[1]
+
+    def test_limit_is_bounded(self, client):
+        response = client.get(
+            "/api/v1/search:stream", params={"q": "bert", "limit": 10_001}
+        )
+
+        assert response.status_code == 422
@@ -0,0 +1,142 @@
+"""
+Tests for thermal_scout.sync module
+"""
+
+import json
+from datetime import UTC, datetime
+
+import pytest
+from typer.testing import CliRunner
+
+from thermal_scout.cli import app
+from thermal_scout.index import ModelIndex
+from thermal_scout.sync import JOURNAL_FILE, STATE_FILE, sync_index
+
+runner = CliRunner()
+
+
+def index_ids(path):
+    return sorted(m["modelId"] for m in ModelIndex(path).records())
+
+
+class TestSyncIndex:
+    """Test incremental index synchronization"""
+
+    def test_first_sync_builds_index(self, fake_hf_api, tmp_path):
+        report = sync_index(fake_hf_api, tmp_path)
+
+        assert report.upserted == 3
+        assert report.total == 3
+        assert report.high_water_mark.startswith("2024-03-01")
+        assert index_ids(tmp_path) == [
+            "bert-large-uncased",
+            "distilbert-base-uncased",
+            "google/bert-tiny",
+        ]
+        assert fake_hf_api.calls[0]["sort"] == "lastModified"
+        assert not (tmp_path / JOURNAL_FILE).exists()
+
+    def test_second_sync_fetches_only_changes(
+        self, fake_hf_api, make_fake_model, tmp_path
+    ):
+        sync_index(fake_hf_api, tmp_path)
+        fake_hf_api.models.append(
+            make_fake_model(
+                "gpt2-xl",
+                downloads=10,
+                last_modified=datetime(2024, 4, 1, tzinfo=UTC),
+            )
+        )
+        fake_hf_api.models[0].downloads = 42
+        fake_hf_api.models[0].last_modified = datetime(2024, 5, 1, tzinfo=UTC)
+
+        report = sync_index(fake_hf_api, tmp_path)
+
+        assert report.upserted == 2
+        assert report.total == 4
+        models = {m["modelId"]: m for m in ModelIndex(tmp_path).records()}
+        assert models["google/bert-tiny"]["downloads"] == 42
+        assert models["gpt2-xl"]["thermal_cost"] == "High"
+
+    def test_unchanged_hub_is_a_no_op(self, fake_hf_api, tmp_path):
+        sync_index(fake_hf_api, tmp_path)
+        report = sync_index(fake_hf_api, tmp_path)
+
+        assert report.upserted == 0
+        assert report.total == 3
+
+    def test_full_sync_drops_deleted_models(self, fake_hf_api, tmp_path):
+        sync_index(fake_hf_api, tmp_path)
+        del fake_hf_api.models[1]
+
+        report = sync_index(fake_hf_api, tmp_path, full=True)
+
+        assert report.deleted == 1
+        assert index_ids(tmp_path) == ["distilbert-base-uncased", "google/bert-tiny"]
+
+    def test_interrupted_sync_resumes_from_journal(self, fake_hf_api, tmp_path):
+        fake_hf_api.fail_after = 2
+        with pytest.raises(ConnectionError):
+            sync_index(fake_hf_api, tmp_path)
+
+        # Nothing published yet, but the journal kept what was processed
+        assert not (tmp_path / "meta.json").exists()
+        assert len((tmp_path / JOURNAL_FILE).read_text().splitlines()) == 2
+
+        fake_hf_api.fail_after = None
+        report = sync_index(fake_hf_api, tmp_path)
+
+        assert report.resumed == 2
+        assert report.upserted == 1
+        assert report.total == 3
+        state = json.loads((tmp_path / STATE_FILE).read_text())
+        assert state["high_water_mark"].startswith("2024-03-01")
+
+    def test_torn_journal_line_is_discarded(self, fake_hf_api, tmp_path):
+        fake_hf_api.fail_after = 1
+        with pytest.raises(ConnectionError):
+            sync_index(fake_hf_api, tmp_path)
+        with (tmp_path / JOURNAL_FILE).open("a") as journal:
+            journal.write('{"lastModified": "2024')
+
+        fake_hf_api.fail_after = None
+        report = sync_index(fake_hf_api, tmp_path)
+
+        assert report.resumed == 1
+        assert report.total == 3
+
+    def test_progress_reports_rows_per_second(self, fake_hf_api, tmp_path, monkeypatch):
+        monkeypatch.setattr("thermal_scout.sync.JOURNAL_FLUSH_EVERY", 1)
+        calls = []
+
+        report = sync_index(
+            fake_hf_api, tmp_path, progress=lambda n, rate: calls.append((n, rate))
+        )
+
+        assert [n for n, _ in calls] == [1, 2, 3]
+        assert report.rows_per_second > 0
+
+
+class TestSyncCommand:
+    """Test the sync CLI command"""
+
+    def test_sync_command_reports_summary(self, fake_hf_api, tmp_path, monkeypatch):
+        monkeypatch.setattr("thermal_scout.hub.hub_api", lambda: fake_hf_api)
+
+        result = runner.invoke(app, ["sync", "--index", str(tmp_path)])
+
+        assert result.exit_code == 0
+        assert "Synced 3 models" in result.stdout
+        assert "rows/sec" in result.stdout
+        assert "Index now holds 3 models" in result.stdout
+
+    def test_sync_command_failure_exits_nonzero(
+        self, fake_hf_api, tmp_path, monkeypatch
+    ):
+        fake_hf_api.fail_after = 0
+        monkeypatch.setattr("thermal_scout.hub.hub_api", lambda: fake_hf_api)
+
+        result = runner.invoke(app, ["sync", "--index", str(tmp_path)])
+
+        assert result.exit_code == 1
+        assert "Sync failed" in result.stdout
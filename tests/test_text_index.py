@@ -0,0 +1,154 @@
+"""
+Tests for thermal_scout.text_index module
+"""
+
+import pytest
+
+from thermal_scout.index import ModelIndex, write_index
+from thermal_scout.text_index import tokenize
+
+
+def ids(results):
+    return [m["modelId"] for m in results]
+
+
+@pytest.fixture
+def index(tmp_path):
+    models = [
+        {
+            "modelId": "meta-llama/Llama-2-7b-hf",
+            "downloads": 900000,
+            "tags": ["text-generation"],
+            "pipeline_tag": "text-generation",
+        },
+        {
+            "modelId": "TinyLlama/TinyLlama-1.1B",
+            "downloads": 300000,
+            "tags": ["text-generation"],
+            "pipeline_tag": "text-generation",
+        },
+        {
+            "modelId": "google-bert/bert-base-uncased",
+            "downloads": 5000000,
+            "tags": ["fill-mask", "exbert"],
+            "pipeline_tag": "fill-mask",
+        },
+        {
+            "modelId": "distilbert/distilbert-base-uncased",
+            "downloads": 4000000,
+            "tags": ["fill-mask"],
+            "pipeline_tag": "fill-mask",
+        },
+        {
+            "modelId": "FacebookAI/roberta-base",
+            "downloads": 2000000,
+            "tags": ["fill-mask"],
+            "pipeline_tag": "fill-mask",
+        },
+        {
+            "modelId": "someone/bert-finetuned",
+            "downloads": 4000000,
+            "tags": ["text-classification"],
+            "pipeline_tag": "text-classification",
+        },
+        {"modelId": "org-a/widget", "downloads": 10},
+        {"modelId": "org-b/widget", "downloads": 1000},
+    ]
+    return write_index(tmp_path / "index", models)
+
+
+class TestTokenize:
+    """Test id and tag tokenization"""
+
+    def test_splits_on_separators(self):
+        assert tokenize("google-bert/bert_base.v2") == [
+            "google",
+            "bert",
+            "bert",
+            "base",
+            "v2",
+            "v",
+            "2",
+        ]
+
+    def test_splits_digit_letter_boundaries(self):
+        assert tokenize("Llama-2-7b") == ["llama", "2", "7b", "7", "b"]
+
+
+class TestTextSearch:
+    """Test ranked full-text search"""
+
+    def test_and_requires_every_term(self, index):
+        assert ids(index.search("bert uncased")) == [
+            "google-bert/bert-base-uncased",
+            "distilbert/distilbert-base-uncased",
+        ]
+
+    def test_or_matches_either_group(self, index):
+        assert set(ids(index.search("roberta OR tinyllama"))) == {
+            "FacebookAI/roberta-base",
+            "TinyLlama/TinyLlama-1.1B",
+        }
+
+    def test_prefix_query(self, index):
+        assert ids(index.search("llam*")) == ["meta-llama/Llama-2-7b-hf"]
+        assert ids(index.search("tiny*")) == ["TinyLlama/TinyLlama-1.1B"]
+        # Prefix-only queries do not expand to infixes
+        assert ids(index.search("ert*")) == []
+
+    def test_digit_letter_tokens_are_searchable(self, index):
+        assert ids(index.search("7b")) == ["meta-llama/Llama-2-7b-hf"]
+        assert ids(index.search("llama 2")) == ["meta-llama/Llama-2-7b-hf"]
+
+    def test_exact_token_outranks_infix(self, index):
+        """An exact 'bert' token beats 'distilbert' at equal downloads"""
+        results = ids(index.search("bert"))
+        assert results.index("someone/bert-finetuned") < results.index(
+            "distilbert/distilbert-base-uncased"
+        )
+        assert "FacebookAI/roberta-base" in results
+
+    def test_downloads_break_relevance_ties(self, index):
+        assert ids(index.search("widget")) == ["org-b/widget", "org-a/widget"]
+        assert ids(index.search("widget", limit=1)) == ["org-b/widget"]
+
+    def test_tags_are_searchable(self, index):
+        assert ids(index.search("classification")) == ["someone/bert-finetuned"]
+
+    def test_task_filter(self, index):
+        assert ids(index.search("bert", task="text-classification")) == [
+            "someone/bert-finetuned"
+        ]
+        assert index.search("bert", task="unknown-task") == []
+
+    def test_empty_query_lists_by_downloads(self, index):
+        assert ids(index.search("  ", limit=1)) == ["google-bert/bert-base-uncased"]
+
+    def test_wildcard_only_query_lists_by_downloads(self, index):
+        assert ids(index.search("*", limit=2)) == [
+            "google-bert/bert-base-uncased",
+            "distilbert/distilbert-base-uncased",
+        ]
+        assert len(index.search("* *")) == len(index)
+
+    def test_separator_only_query_matches_ids(self, index):
+        assert set(ids(index.search("."))) == {"TinyLlama/TinyLlama-1.1B"}
+
+    def test_lone_or_is_a_word(self, index):
+        assert ids(index.search("OR")) == ["org-b/widget", "org-a/widget"]
+        assert ids(index.search("OR OR")) == ["org-b/widget", "org-a/widget"]
+
+    def test_ranked_matches_search_for_queries_without_terms(self, index):
+        for query in ["*", ".", "OR"]:
+            rows = index.ranked(query)
+            assert [index.model_id(int(row)) for row in rows] == ids(
+                index.search(query)
+            )
+
+    def test_no_match(self, index):
+        assert index.search("nonexistent") == []
+
+    def test_reopened_index_uses_stored_postings(self, index):
+        reopened = ModelIndex(index.path)
+        assert ids(reopened.search("roberta")) == ["FacebookAI/roberta-base"]
+        assert reopened.text.terms == index.text.terms
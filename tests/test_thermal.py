@@ -0,0 +1,266 @@
+"""
+Tests for thermal_scout.thermal module
+"""
+
+import random
+import re
+
+import numpy as np
+import pytest
+
+from thermal_scout.thermal import (
+    THERMAL_LEVELS,
+    ThermalThresholds,
+    classify_batch,
+    estimate_thermal_cost,
+    thermal_features,
+    thermal_levels,
+    thermal_tiers,
+)
+
+
+def reference_estimate_thermal_cost(model_info):
+    """The original one-regex-at-a-time classifier, kept as the oracle"""
+    model_id = model_info.get("modelId", "").lower()
+    tags = [tag.lower() for tag in model_info.get("tags", [])]
+
+    size_patterns = {
+        "tiny": 1,
+        "small": 1,
+        "base": 3,
+        "large": 4,
+        "xl": 5,
+        "xxl": 6,
+    }
+    param_patterns = [
+        (r"(?:^|-)(\d{2,})b(?:$|-)", 5),
+        (r"(?:^|-)([7-9])b(?:$|-)", 4),
+        (r"(?:^|-)([4-6])b(?:$|-)", 4),
+        (r"(?:^|-)([1-3])b(?:$|-)", 3),
+        (r"(?:^|-)(\d+)b(?:$|-)", 4),
+        (r"(?:^|-)(\d+)m(?:$|-)", 1),
+    ]
+
+    thermal_score = 3
+    for pattern, score in size_patterns.items():
+        if pattern in model_id:
+            thermal_score = score
+            break
+    for pattern, score in param_patterns:
+        if re.search(pattern, model_id):
+            thermal_score = score
+            break
+
+    if any("tiny" in tag for tag in tags):
+        thermal_score = 1
+    elif any("efficient" in tag or "distil" in tag for tag in tags):
+        thermal_score = max(1, thermal_score - 2)
+    elif any("large" in tag or "xxl" in tag for tag in tags):
+        thermal_score = max(thermal_score, 5)
+
+    if thermal_score <= 1:
+        return "Low"
+    elif thermal_score <= 3:
+        return "Medium"
+    else:
+        return "High"
+
+
+ID_PARTS = [
+    "bert", "Llama", "gpt2", "t5", "TINY", "small", "base", "Large", "xl",
+    "xxl", "distil", "7b", "13B", "1b", "3b", "4b", "0b", "07b", "70b", "350m",
+    "125M", "1.1b", "8x7b", "b", "m", "7bm", "v2", "\u0667b", "\u0661\u0662b",
+    "instruct", "gguf", "",
+]  # fmt: skip
+TAG_PARTS = [
+    "transformers", "tiny", "Distilled", "efficient-net", "LARGE", "xxl",
+    "text-generation", "pytorch", "license:mit", "",
+]  # fmt: skip
+SEPARATORS = ["-", "-", "-", "_", "/", ".", ""]
+
+
+def generate_models(count, seed=0):
+    rng = random.Random(seed)
+    models = []
+    for _ in range(count):
+        parts = rng.choices(ID_PARTS, k=rng.randint(1, 5))
+        model_id = parts[0]
+        for part in parts[1:]:
+            model_id += rng.choice(SEPARATORS) + part
+        if rng.random() < 0.01:
+            model_id += "\n"
+        tags = rng.choices(TAG_PARTS, k=rng.randint(0, 4))
+        models.append({"modelId": model_id, "tags": tags})
+    return models
+
+
+class TestDifferential:
+    """The compiled classifier must agree with the original everywhere"""
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_matches_reference_on_generated_models(self, seed):
+        models = generate_models(4000, seed=seed)
+        expected = [reference_estimate_thermal_cost(m) for m in models]
+
+        assert [estimate_thermal_cost(m) for m in models] == expected
+        assert classify_batch(models) == expected
+
+    @pytest.mark.parametrize(
+        "model_id",
+        [
+            "model-7b-13b",  # most specific pattern wins, not leftmost
+            "model-1b-350m",
+            "model-350m-1b",
+            "model-0b",
+            "model-07b",
+            "7b-13b",
+            "model-\u0667b",  # non-ASCII digit only matches "any B"
+            "model-7b\n",
+            "base-large",
+            "xxl",
+            "",
+        ],
+    )
+    def test_matches_reference_on_edge_cases(self, model_id):
+        model = {"modelId": model_id, "tags": []}
+        assert estimate_thermal_cost(model) == reference_estimate_thermal_cost(model)
+
+    def test_missing_fields_use_defaults(self):
+        assert estimate_thermal_cost({}) == reference_estimate_thermal_cost({})
+        assert classify_batch([{}]) == ["Medium"]
+
+
+class TestClassifyBatch:
+    """Test the batch classification API"""
+
+    def test_preserves_input_order(self):
+        models = [
+            {"modelId": "bert-tiny", "tags": []},
+            {"modelId": "llama-70b", "tags": []},
+            {"modelId": "bert-base", "tags": []},
+        ]
+        assert classify_batch(models) == ["Low", "High", "Medium"]
+
+    def test_accepts_any_iterable(self):
+        models = ({"modelId": f"model-{n}m", "tags": []} for n in range(3))
+        assert classify_batch(models) == ["Low", "Low", "Low"]
+
+    def test_empty_batch(self):
+        assert classify_batch([]) == []
+
+
+def levels(models, thresholds=ThermalThresholds()):
+    codes = thermal_levels(thermal_features(models), thresholds)
+    return [THERMAL_LEVELS[code] for code in codes]
+
+
+class TestExactParameters:
+    """Test tiers from exact parameter counts"""
+
+    @pytest.mark.parametrize(
+        ("parameters", "expected"),
+        [
+            (124_439_808, "Low"),
+            (999_999_999, "Low"),
+            (1_000_000_000, "Medium"),
+            (2_779_683_840, "Medium"),
+            (3_000_000_000, "High"),
+            (70_553_706_496, "High"),
+        ],
+    )
+    def test_count_decides_tier(self, parameters, expected):
+        # The id and tags would say otherwise
+        model = {
+            "modelId": "bert-tiny-70b",
+            "tags": ["large"],
+            "parameters": parameters,
+        }
+        assert estimate_thermal_cost(model) == expected
+        assert classify_batch([model]) == [expected]
+
+    def test_missing_count_uses_heuristic(self):
+        model = {"modelId": "llama-70b", "tags": [], "parameters": None}
+        assert estimate_thermal_cost(model) == "High"
+
+
+class TestVectorized:
+    """Test column-wise scoring with NumPy"""
+
+    @pytest.mark.parametrize("seed", range(3))
+    def test_default_thresholds_match_classifier(self, seed):
+        models = generate_models(4000, seed=seed)
+        assert levels(models) == classify_batch(models)
+
+    def test_parameter_counts_are_parsed(self):
+        features = thermal_features(
+            [
+                {"modelId": "llama-2-7b"},
+                {"modelId": "model-350m-1b"},  # the count that decides the score
+                {"modelId": "bert-base"},
+            ]
+        )
+        assert features.param_count[:2].tolist() == [7e9, 1e9]
+        assert np.isnan(features.param_count[2])
+        assert features.size_score.tolist() == [0, 0, 3]
+
+    def test_tag_priority_matches_classifier(self):
+        models = [{"modelId": "llama-70b", "tags": ["large", "distilled", "tiny"]}]
+        assert levels(models) == ["Low"]
+
+    def test_changed_tier_boundaries(self):
+        models = [{"modelId": "bert-base"}, {"modelId": "llama-7b"}]
+        assert levels(models, ThermalThresholds(low_max=3)) == ["Low", "High"]
+        assert levels(models, ThermalThresholds(medium_max=4)) == [
+            "Medium",
+            "Medium",
+        ]
+
+    def test_parameter_bins(self):
+        models = [
+            {"modelId": "model-350m"},
+            {"modelId": "model-2b"},
+            {"modelId": "model-8b"},
+            {"modelId": "model-70b"},
+            {"modelId": "bert-large"},  # no count, keeps its size score
+        ]
+        thresholds = ThermalThresholds(param_bins=((0, 1), (1e9, 3), (7e9, 4)))
+        assert levels(models, thresholds) == ["Low", "Medium", "High", "High", "High"]
+
+        thresholds = ThermalThresholds(param_bins=((0, 1), (10e9, 4)))
+        assert levels(models, thresholds) == ["Low", "Low", "Low", "High", "High"]
+
+    def test_exact_parameters(self):
+        models = generate_models(1000)
+        for n, model in enumerate(models[::3]):
+            model["parameters"] = n * 37_000_000
+        assert levels(models) == classify_batch(models)
+        tiny = [{"modelId": "bert-tiny", "parameters": 5_000_000}]
+        assert levels(tiny, ThermalThresholds(parameter_bounds=(1e6, 2e6))) == ["High"]
+
+    def test_empty_columns(self):
+        assert levels([]) == []
+
+
+class TestThermalTiers:
+    """Test parsing of max_thermal / thermal_in filters"""
+
+    def test_no_filter(self):
+        assert thermal_tiers() is None
+
+    def test_max_thermal_is_a_ceiling(self):
+        assert thermal_tiers(max_thermal="Low") == {"Low"}
+        assert thermal_tiers(max_thermal="medium") == {"Low", "Medium"}
+        assert thermal_tiers(max_thermal="HIGH") == set(THERMAL_LEVELS)
+
+    def test_thermal_in(self):
+        assert thermal_tiers(thermal_in=["low", " High"]) == {"Low", "High"}
+
+    def test_both_intersect(self):
+        assert thermal_tiers("Medium", ["Medium", "High"]) == {"Medium"}
+        assert thermal_tiers("Low", ["High"]) == frozenset()
+
+    def test_unknown_level(self):
+        with pytest.raises(ValueError, match="Warm"):
+            thermal_tiers(max_thermal="Warm")
+        with pytest.raises(ValueError):
+            thermal_tiers(thermal_in=["Low", ""])
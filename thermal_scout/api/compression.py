@@ -0,0 +1,122 @@
+"""
+Content codings the API compresses responses with
+
+gzip is always available; brotli (``br``) and zstd are used when the
+``compression`` extra is installed. ``negotiate`` picks the coding a client
+prefers by its ``Accept-Encoding`` q-values, and zstd, br, gzip in that order
+among equally weighted ones.
+
+Compressing a search body costs far more than finding it in the cache, so
+``compress`` keeps compressed bodies that have a strong ``ETag`` in
+``compressed_cache`` by tag, coding and level: the tag changes with the body,
+so a hot query is compressed once per coding, not once per hit.
+"""
+
+import gzip
+from collections.abc import Callable
+from typing import NamedTuple
+
+from thermal_scout.cache import TTLCache
+from thermal_scout.config import search_cache_size, search_cache_ttl
+
+try:
+    import brotli
+except ImportError:  # the "compression" extra is not installed
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # the "compression" extra is not installed
+    zstandard = None
+
+# Compressed bodies keyed by (ETag, coding, level)
+compressed_cache = TTLCache(maxsize=search_cache_size(), ttl=search_cache_ttl())
+
+
+class Codec(NamedTuple):
+    """A content coding, the levels it accepts and the one it uses by default"""
+
+    name: str
+    levels: range
+    default_level: int
+    compress: Callable[[bytes, int], bytes]
+
+    def level(self, level: int | None = None) -> int:
+        """``level`` within this codec's range, or its default for ``None``"""
+        if level is None:
+            return self.default_level
+        return min(max(level, self.levels.start), self.levels.stop - 1)
+
+
+def _gzip(body: bytes, level: int) -> bytes:
+    # mtime=0 so the same body always compresses to the same bytes
+    return gzip.compress(body, compresslevel=level, mtime=0)
+
+
+def _brotli(body: bytes, level: int) -> bytes:
+    return brotli.compress(body, quality=level)
+
+
+def _zstd(body: bytes, level: int) -> bytes:
+    return zstandard.ZstdCompressor(level=level).compress(body)
+
+
+def available_codecs() -> dict[str, Codec]:
+    """The codecs this process can use, most preferred first"""
+    codecs = []
+    if zstandard is not None:
+        codecs.append(Codec("zstd", range(1, 23), 3, _zstd))
+    if brotli is not None:
+        codecs.append(Codec("br", range(0, 12), 4, _brotli))
+    codecs.append(Codec("gzip", range(1, 10), 6, _gzip))
+    return {codec.name: codec for codec in codecs}
+
+
+CODECS = available_codecs()
+
+
+def negotiate(
+    accept_encoding: str, codecs: dict[str, Codec] | None = None
+) -> Codec | None:
+    """
+    The codec to answer an ``Accept-Encoding`` header with, if any
+
+    Codings the header does not name get the weight of ``*``, or none.
+    """
+    codecs = CODECS if codecs is None else codecs
+    weights: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.partition(";")
+        name = name.strip().lower()
+        if name:
+            weights[name] = _quality(params)
+
+    best, best_quality = None, 0.0
+    for codec in codecs.values():
+        quality = weights.get(codec.name, weights.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = codec, quality
+    return best
+
+
+def _quality(params: str) -> float:
+    for param in params.split(";"):
+        key, _, value = param.partition("=")
+        if key.strip().lower() == "q":
+            try:
+                return float(value)
+            except ValueError:
+                return 0.0
+    return 1.0
+
+
+def compress(
+    body: bytes, codec: Codec, level: int | None = None, tag: str | None = None
+) -> bytes:
+    """``body`` compressed with ``codec``, reused by its strong ETag ``tag``"""
+    level = codec.level(level)
+    if tag is None or tag.startswith("W/"):
+        return codec.compress(body, level)
+    return compressed_cache.get_or_compute(
+        (tag, codec.name, level), lambda: codec.compress(body, level)
+    )
@@ -0,0 +1,79 @@
+"""
+HTTP caching of API responses: validators, freshness and conditional GETs
+
+Search and model responses carry a strong ``ETag`` computed from the encoded
+body, so it changes exactly when the results do, whether they came from the
+Hub or from a new index snapshot. ``Cache-Control`` lets browsers and proxies
+reuse a response for ``THERMAL_SCOUT_HTTP_MAX_AGE`` seconds and serve it stale
+for ``THERMAL_SCOUT_HTTP_STALE_WHILE_REVALIDATE`` more while they revalidate.
+A request whose ``If-None-Match`` names the current ETag is answered with an
+empty 304.
+
+A compressed response is a different representation, so the compression
+middleware sends it with a ``variant_tag``; ``none_match`` accepts those as
+well, since the client has the same content either way.
+"""
+
+import hashlib
+
+from fastapi import Request
+from fastapi.responses import Response
+
+from thermal_scout.config import http_max_age, http_stale_while_revalidate
+
+
+def etag(body: bytes) -> str:
+    """Strong entity tag of a response body"""
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def variant_tag(tag: str, coding: str) -> str:
+    """The entity tag of ``tag``'s body in content coding ``coding``"""
+    return f'{tag[:-1]}-{coding}"'
+
+
+def identity_tag(tag: str) -> str:
+    """The entity tag of the uncoded body of ``variant_tag``, or ``tag`` itself"""
+    base, dash, _coding = tag.rpartition("-")
+    return f'{base}"' if dash else tag
+
+
+def cache_control() -> str:
+    """``Cache-Control`` of cacheable responses, from the configuration"""
+    directives = ["public", f"max-age={http_max_age()}"]
+    stale = http_stale_while_revalidate()
+    if stale > 0:
+        directives.append(f"stale-while-revalidate={stale}")
+    return ", ".join(directives)
+
+
+def none_match(if_none_match: str | None, tag: str) -> bool:
+    """
+    Whether an ``If-None-Match`` header lists ``tag`` (or is ``*``)
+
+    As RFC 9110 requires for ``If-None-Match``, tags are compared weakly, so
+    a ``W/`` prefix added by a proxy still matches, and so do the tags of
+    compressed variants.
+    """
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or identity_tag(candidate.removeprefix("W/")) == tag:
+            return True
+    return False
+
+
+def cached_json_response(
+    request: Request, body: bytes, tag: str | None = None
+) -> Response:
+    """
+    ``body`` as a cacheable JSON response, or 304 if the client has it
+
+    ``tag`` is the ``etag`` of ``body``, when the caller already knows it.
+    """
+    tag = tag or etag(body)
+    headers = {"ETag": tag, "Cache-Control": cache_control()}
+    if none_match(request.headers.get("if-none-match"), tag):
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type="application/json", headers=headers)
@@ -0,0 +1,123 @@
+"""
+Search responses encoded straight to JSON bytes
+
+Search results come from our own search and are already in the shape of the
+response models, so ``/api/v1/search`` does not build a ``ModelInfo`` per
+result and a ``SearchResponse`` for FastAPI to validate and encode a second
+time. ``search_body`` writes the same JSON in a single pass, with orjson when
+it is installed (the ``fast`` extra) and the standard library otherwise.
+
+``response_cache`` keeps the encoded body of each recent search with the
+results it was encoded from. While ``search_cache`` hands out the same
+(immutable) records for that search, the body and its ETag are reused as
+is; once the search is recomputed, the body is encoded again.
+"""
+
+import json
+from collections.abc import Hashable, Iterable, Mapping, Sequence
+from typing import Any, NamedTuple
+
+from thermal_scout.api.conditional import etag
+from thermal_scout.cache import TTLCache
+from thermal_scout.config import search_cache_size, search_cache_ttl
+from thermal_scout.records import ModelRecord
+
+try:
+    import orjson
+except ImportError:  # the "fast" extra is not installed
+    orjson = None
+
+# (results, EncodedBody) of recent /api/v1/search responses keyed by their parameters
+response_cache = TTLCache(maxsize=search_cache_size(), ttl=search_cache_ttl())
+
+
+class EncodedBody(NamedTuple):
+    """A response body and its ``ETag``"""
+
+    body: bytes
+    etag: str
+
+
+def dumps(value: Any) -> bytes:
+    """``value`` as compact UTF-8 JSON, the way FastAPI's JSONResponse writes it"""
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def model_fields(model: Mapping[str, Any]) -> dict[str, Any]:
+    """The ``ModelInfo`` fields of a search result, in schema order"""
+    if type(model) is ModelRecord:
+        # Attributes skip the Mapping lookups; records always hold every field
+        return {
+            "modelId": model.modelId,
+            "downloads": model.downloads,
+            "likes": model.likes,
+            "tags": model.tags,
+            "pipeline_tag": model.pipeline_tag,
+            "library_name": model.library_name,
+            "parameters": model.parameters,
+            "thermal_cost": model.thermal_cost,
+        }
+    return {
+        "modelId": model["modelId"],
+        "downloads": model.get("downloads", 0),
+        "likes": model.get("likes", 0),
+        "tags": model.get("tags", []),
+        "pipeline_tag": model.get("pipeline_tag"),
+        "library_name": model.get("library_name"),
+        "parameters": model.get("parameters"),
+        "thermal_cost": model.get("thermal_cost", "Unknown"),
+    }
+
+
+def search_body(
+    results: Iterable[Mapping[str, Any]],
+    query: str,
+    limit: int,
+    thermal_aware: bool,
+    next_cursor: str | None = None,
+) -> bytes:
+    """The ``SearchResponse`` JSON of ``results``"""
+    return dumps(
+        {
+            "models": [model_fields(model) for model in results],
+            "query": query,
+            "limit": limit,
+            "thermal_aware": thermal_aware,
+            "next_cursor": next_cursor,
+        }
+    )
+
+
+def cached_search_body(
+    key: Hashable,
+    results: Sequence[Mapping[str, Any]],
+    query: str,
+    limit: int,
+    thermal_aware: bool,
+) -> EncodedBody:
+    """
+    ``search_body`` of ``results`` and its ETag, reused from ``response_cache``
+
+    ``key`` identifies the search; ``query``, ``limit`` and ``thermal_aware``
+    must be part of it. Only non-empty lists of ``ModelRecord`` are kept, as
+    other mappings may change after they are encoded.
+    """
+    cached = response_cache.get(key)
+    if cached is not None and _same_records(cached[0], results):
+        return cached[1]
+    body = search_body(results, query, limit, thermal_aware)
+    encoded = EncodedBody(body, etag(body))
+    if results and all(type(model) is ModelRecord for model in results):
+        response_cache.put(key, (list(results), encoded))
+    return encoded
+
+
+def _same_records(
+    cached: Sequence[Mapping[str, Any]], results: Sequence[Mapping[str, Any]]
+) -> bool:
+    # Records are immutable, so the same objects encode to the same bytes
+    return len(cached) == len(results) and all(
+        a is b for a, b in zip(cached, results, strict=True)
+    )
@@ -4,14 +4,74 @@ FastAPI application for Thermal Scout API
 Created with ❤️ by Claude and Tyler
 """
 
-from fastapi import FastAPI, HTTPException, Query
+import asyncio
+import json
+from collections.abc import AsyncIterator, Mapping
+from contextlib import asynccontextmanager, suppress
+from typing import Any
+
+from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from pydantic import BaseModel, Field
+
+from thermal_scout.api.conditional import cached_json_response
+from thermal_scout.api.encoding import (
+    cached_search_body,
+    dumps,
+    model_fields,
+    search_body,
+)
+from thermal_scout.api.middleware import CompressionMiddleware, TimingMiddleware
+from thermal_scout.batch import BatchResult, async_batch_search
+from thermal_scout.config import DEFAULT_BATCH_CONCURRENCY, MAX_BATCH_CONCURRENCY
+from thermal_scout.details import async_model_details, async_model_details_many
+from thermal_scout.hub import get_hub_client
+from thermal_scout.metrics import REGISTRY, sample, stage
+from thermal_scout.paging import InvalidCursor, async_search_page
+from thermal_scout.ranking import parse_sort
+from thermal_scout.search import (
+    async_stream_search,
+    async_thermal_search_raising,
+    refresh_hot_searches,
+    search_cache,
+)
+from thermal_scout.thermal import thermal_tiers
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    """
+    Open the shared Hub connection pool on startup, close it on shutdown
+
+    In between, the most requested searches are refreshed before they expire.
+    """
+    hub = get_hub_client()
+    hub.async_client()
+    refresher = asyncio.create_task(refresh_hot_searches())
+    yield
+    refresher.cancel()
+    with suppress(asyncio.CancelledError):
+        await refresher
+    await hub.aclose()
+
+
+# Most ids accepted by one models:batchGet request
+MAX_BATCH_IDS = 1000
+
+# Most results one search:stream request may ask for
+MAX_STREAM_LIMIT = 10_000
+
+# Most Hub models one filtered search may list
+MAX_FETCH_BUDGET = 10_000
+
+# Most queries accepted by one search:batch request
+MAX_BATCH_QUERIES = 10_000
 
-from thermal_scout.search import thermal_search
 
 # Create FastAPI app
 app = FastAPI(
+    lifespan=lifespan,
     title="Thermal Scout API",
     description="A thermal-aware Hugging Face model search API",
     version="0.1.0",
@@ -31,6 +91,8 @@ app = FastAPI(
     ],
 )
 
+# Innermost, so it compresses the finished body
+app.add_middleware(CompressionMiddleware)
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -38,7 +100,13 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing", "ETag"],
 )
+# Outermost, so the timings cover every other middleware
+app.add_middleware(TimingMiddleware)
+
+# Content type of the Prometheus text exposition format
+METRICS_MEDIA_TYPE = "text/plain; version=0.0.4; charset=utf-8"
 
 
 # Pydantic models
@@ -55,6 +123,7 @@ class ModelInfo(BaseModel):
     tags: list[str]
     pipeline_tag: str | None = None
     library_name: str | None = None
+    parameters: int | None = None
     thermal_cost: str
 
     class Config:
@@ -66,6 +135,7 @@ class ModelInfo(BaseModel):
                 "tags": ["transformers", "pytorch", "bert", "distilled"],
                 "pipeline_tag": "text-classification",
                 "library_name": "transformers",
+                "parameters": 66955010,
                 "thermal_cost": "Low",
             }
         }
@@ -76,6 +146,7 @@ class SearchResponse(BaseModel):
     query: str
     limit: int
     thermal_aware: bool
+    next_cursor: str | None = None
 
 
 class ModelDetailsResponse(BaseModel):
@@ -86,9 +157,71 @@ class ModelDetailsResponse(BaseModel):
     tags: list[str]
     pipeline_tag: str | None = None
     library_name: str | None = None
+    parameters: int | None = None
     description: str | None = None
 
 
+class BatchGetRequest(BaseModel):
+    ids: list[str] = Field(
+        ...,
+        min_length=1,
+        max_length=MAX_BATCH_IDS,
+        description="Model ids to look up",
+        examples=[["distilbert-base-uncased", "google/bert-tiny"]],
+    )
+
+
+class BatchSearchRequest(BaseModel):
+    queries: list[str] = Field(
+        ...,
+        min_length=1,
+        max_length=MAX_BATCH_QUERIES,
+        description="Queries or model ids to search",
+        examples=[["sentiment analysis", "google/bert-tiny"]],
+    )
+    limit: int = Field(10, ge=1, le=100, description="Results per query")
+    model_type: str | None = Field(None, description="Filter by model type/task")
+    thermal_aware: bool = Field(True, description="Enable thermal-aware sorting")
+    max_thermal: str | None = Field(
+        None, description="Only models at or below this thermal level"
+    )
+    thermal_in: list[str] | None = Field(
+        None, description="Only models of these thermal levels"
+    )
+    fetch_budget: int | None = Field(
+        None,
+        ge=1,
+        le=MAX_FETCH_BUDGET,
+        description="Most Hub models to scan per query for filtered matches",
+    )
+    sort: str | None = Field(None, description="Rank by these comma-separated keys")
+    concurrency: int = Field(
+        DEFAULT_BATCH_CONCURRENCY,
+        ge=1,
+        le=MAX_BATCH_CONCURRENCY,
+        description="Searches run at a time",
+    )
+
+
+class BatchGetResponse(BaseModel):
+    models: list[ModelDetailsResponse]
+    missing: list[str]
+
+
+class CacheStatsResponse(BaseModel):
+    hits: int
+    misses: int
+    coalesced: int
+    evictions: int
+    expirations: int
+    stale_hits: int
+    refreshes: int
+    size: int
+    maxsize: int
+    ttl: float
+    stale: float
+
+
 # Health check endpoint
 @app.get(
     "/health",
@@ -102,6 +235,67 @@ async def health_check():
     return HealthResponse(status="healthy", version="0.1.0", thermal_aware=True)
 
 
+@app.get(
+    "/api/v1/cache/stats",
+    response_model=CacheStatsResponse,
+    tags=["health"],
+    summary="Search Cache Statistics",
+    response_description="Search result cache counters",
+)
+async def cache_stats():
+    """Hit, miss and eviction counters of the search result cache"""
+    return CacheStatsResponse(**vars(search_cache.stats()))
+
+
+@app.get(
+    "/metrics",
+    response_class=PlainTextResponse,
+    tags=["health"],
+    summary="Prometheus Metrics",
+    response_description="Metrics in the Prometheus text format",
+)
+async def metrics():
+    """
+    Latency histograms and search cache counters for Prometheus to scrape
+
+    - **thermal_scout_search_seconds**: whole searches, by `cache` (hit,
+      miss, bypass or refresh) and `model_type`
+    - **thermal_scout_search_stage_seconds**: the same searches by `stage`
+      (hub, params, classify, index, rank, serialize,
+      compress)
+    - **thermal_scout_http_request_duration_seconds**: API responses by
+      `method`, `route` and `status`
+    - **thermal_scout_search_cache_...**: the counters of `/api/v1/cache/stats`
+    """
+    return PlainTextResponse(REGISTRY.render(), media_type=METRICS_MEDIA_TYPE)
+
+
+def _search_cache_metrics() -> list[str]:
+    stats = search_cache.stats()
+    counters = [
+        ("hits", "Searches answered from the cache"),
+        ("misses", "Searches computed because they were not cached"),
+        ("coalesced", "Searches that waited for an identical one in flight"),
+        ("evictions", "Entries dropped to stay within the cache size"),
+        ("expirations", "Entries dropped because their TTL ran out"),
+        ("stale_hits", "Searches answered from an expired entry being refreshed"),
+        ("refreshes", "Entries searched again in the background"),
+    ]
+    lines = []
+    for name, documentation in counters:
+        lines += sample(
+            f"thermal_scout_search_cache_{name}_total",
+            documentation,
+            getattr(stats, name),
+            kind="counter",
+        )
+    lines += sample("thermal_scout_search_cache_size", "Cached searches", stats.size)
+    return lines
+
+
+REGISTRY.collectors.append(_search_cache_metrics)
+
+
 # Search endpoint
 @app.get(
     "/api/v1/search",
@@ -133,11 +327,14 @@ async def health_check():
                 }
             },
         },
+        304: {"description": "Not modified since the ETag in If-None-Match"},
+        400: {"description": "Invalid or expired cursor"},
         422: {"description": "Validation error"},
         500: {"description": "Internal server error"},
     },
 )
 async def search_models(
+    request: Request,
     q: str = Query(
         ..., description="Search query for models", example="sentiment analysis"
     ),
@@ -150,6 +347,32 @@ async def search_models(
     thermal_aware: bool = Query(
         True, description="Enable thermal-aware sorting", example=True
     ),
+    cursor: str | None = Query(
+        None,
+        description='Page through every result: "*" for the first page, then '
+        "the previous page's next_cursor",
+        example="*",
+    ),
+    max_thermal: str | None = Query(
+        None, description="Only models at or below this thermal level", example="Medium"
+    ),
+    thermal_in: list[str] | None = Query(
+        None,
+        description="Only models of these thermal levels (repeated or comma-separated)",
+        example=["Low"],
+    ),
+    fetch_budget: int | None = Query(
+        None,
+        ge=1,
+        le=MAX_FETCH_BUDGET,
+        description="Most Hub models to scan for filtered matches",
+        example=1000,
+    ),
+    sort: str | None = Query(
+        None,
+        description="Rank by these comma-separated keys, e.g. thermal,likes*recency",
+        example="thermal,likes*recency",
+    ),
 ):
     """
     Search for models on Hugging Face Hub with thermal awareness
@@ -158,32 +381,266 @@ async def search_models(
     - **limit**: Number of results (1-100, default: 10)
     - **model_type**: Filter by model type (e.g., text-generation, text-classification)
     - **thermal_aware**: Sort by thermal efficiency (default: true)
+    - **cursor**: Page through all results; pages keep the source order, so
+      thermal-aware sorting and `sort` do not apply
+    - **max_thermal** / **thermal_in**: Keep only models of these thermal
+      levels (Low, Medium, High); both together keep their intersection
+    - **fetch_budget**: Most Hub models listed while looking for `limit`
+      filtered matches (default: `THERMAL_SCOUT_FETCH_BUDGET`)
+    - **sort**: Rank the top `5 * limit` candidates, or `fetch_budget` when
+      given, by scorers (thermal, downloads, likes, recency, relevance) and
+      return the best `limit`; overrides `thermal_aware`
+
+    Filters are applied while the source is read, so a filtered search may
+    return fewer than `limit` models once the budget is spent. Filtered
+    cursor pages of Hub results may hold fewer than `limit` models.
+
+    The body is encoded straight from the results (see
+    `thermal_scout.api.encoding`) and reused while the cached search returns
+    the same results. Responses carry an `ETag` and `Cache-Control`; a
+    request whose `If-None-Match` holds the current ETag gets an empty 304.
     """
+    tiers = _thermal_tiers(max_thermal, thermal_in)
+    _check_sort(sort, q)
     try:
-        results = thermal_search(
-            query=q, limit=limit, model_type=model_type, thermal_aware=thermal_aware
+        if cursor is not None:
+            page = await async_search_page(
+                query=q, limit=limit, model_type=model_type, cursor=cursor, tiers=tiers
+            )
+            with stage("serialize"):
+                body = search_body(page.models, q, limit, False, page.next_cursor)
+            return cached_json_response(request, body)
+
+        # Raising, so a Hub outage is an uncacheable 500, not an empty 200
+        results = await async_thermal_search_raising(
+            query=q,
+            limit=limit,
+            model_type=model_type,
+            thermal_aware=thermal_aware,
+            tiers=tiers,
+            budget=fetch_budget,
+            sort=sort,
         )
+        key = (q, limit, model_type, thermal_aware, tiers, fetch_budget, sort)
+        with stage("serialize"):
+            encoded = cached_search_body(key, results, q, limit, thermal_aware)
+        return cached_json_response(request, encoded.body, encoded.etag)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e)) from e
 
-        # Convert to Pydantic models
-        models = [
-            ModelInfo(
-                modelId=model["modelId"],
-                downloads=model.get("downloads", 0),
-                likes=model.get("likes", 0),
-                tags=model.get("tags", []),
-                pipeline_tag=model.get("pipeline_tag"),
-                library_name=model.get("library_name"),
-                thermal_cost=model.get("thermal_cost", "Unknown"),
-            )
-            for model in results
-        ]
 
-        return SearchResponse(
-            models=models, query=q, limit=limit, thermal_aware=thermal_aware
-        )
+@app.get(
+    "/api/v1/search:stream",
+    tags=["search"],
+    summary="Stream Search Results",
+    response_description="One model per line (NDJSON) or per event (SSE)",
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "description": "Models in Hub order, written as they are classified",
+            "content": {
+                "application/x-ndjson": {
+                    "example": (
+                        '{"modelId": "distilbert-base-uncased", "downloads": 1000000, '
+                        '"likes": 500, "tags": ["transformers", "bert"], '
+                        '"pipeline_tag": "text-classification", '
+                        '"library_name": "transformers", "parameters": null, '
+                        '"thermal_cost": "Low"}\n'
+                    )
+                },
+                "text/event-stream": {},
+            },
+        },
+        422: {"description": "Validation error"},
+        500: {"description": "Internal server error"},
+    },
+)
+async def stream_search_models(
+    request: Request,
+    q: str = Query(..., description="Search query for models", example="bert"),
+    limit: int = Query(
+        100,
+        ge=1,
+        le=MAX_STREAM_LIMIT,
+        description="Number of results to stream",
+        example=1000,
+    ),
+    model_type: str | None = Query(
+        None, description="Filter by model type/task", example="text-classification"
+    ),
+    max_thermal: str | None = Query(
+        None, description="Only models at or below this thermal level", example="Medium"
+    ),
+    thermal_in: list[str] | None = Query(
+        None,
+        description="Only models of these thermal levels (repeated or comma-separated)",
+        example=["Low"],
+    ),
+    fetch_budget: int | None = Query(
+        None,
+        ge=1,
+        le=MAX_FETCH_BUDGET,
+        description="Most Hub models to scan for filtered matches",
+        example=1000,
+    ),
+):
+    """
+    Stream search results as they are classified, without sorting
+
+    - **q**: Search query (required)
+    - **limit**: Number of results (1-10000, default: 100)
+    - **model_type**: Filter by model type (e.g., text-generation, text-classification)
+    - **max_thermal** / **thermal_in** / **fetch_budget**: Thermal filters,
+      as for `/api/v1/search`
+
+    Models are written in Hub order (most downloaded first), each as soon as
+    its page of the listing has been classified, with the fields of
+    `/api/v1/search` results. The body is NDJSON unless the request accepts
+    `text/event-stream`, in which case each model is a server-sent event and
+    the stream ends with a `done` event. An error after the first model ends
+    the stream with an `{"error": ...}` record (an `error` event for SSE).
+    """
+    tiers = _thermal_tiers(max_thermal, thermal_in)
+    stream = async_stream_search(
+        query=q, limit=limit, model_type=model_type, tiers=tiers, budget=fetch_budget
+    )
+    # Fail with a status code while that is still possible
+    try:
+        first = await anext(stream, None)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e)) from e
 
+    if "text/event-stream" in request.headers.get("accept", ""):
+        return StreamingResponse(
+            _sse_events(first, stream),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+    return StreamingResponse(
+        _ndjson_lines(first, stream), media_type="application/x-ndjson"
+    )
+
+
+@app.post(
+    "/api/v1/search:batch",
+    tags=["search"],
+    summary="Batch Search",
+    response_description="One line per distinct query (NDJSON)",
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "description": "Results of each query, written as it completes",
+            "content": {
+                "application/x-ndjson": {
+                    "example": (
+                        '{"query": "bert", "models": [{"modelId": '
+                        '"distilbert-base-uncased", "downloads": 1000000, '
+                        '"likes": 500, "tags": ["transformers", "bert"], '
+                        '"pipeline_tag": "text-classification", '
+                        '"library_name": "transformers", "parameters": null, '
+                        '"thermal_cost": "Low"}]}\n'
+                    )
+                },
+            },
+        },
+        422: {"description": "Validation error"},
+    },
+)
+async def batch_search_models(request: BatchSearchRequest):
+    """
+    Run many searches, `concurrency` at a time
+
+    - **queries**: Queries or model ids (1-10000); repeated queries are
+      searched once
+    - **limit**, **model_type**, **thermal_aware**, **max_thermal**,
+      **thermal_in**, **fetch_budget**, **sort**: As for `/api/v1/search`,
+      applied to every query
+    - **concurrency**: Searches in flight at a time (1-64, default: 16)
+
+    Each distinct query is written as one NDJSON line as soon as its search
+    completes, so lines come in completion order, not request order: `{"query":
+    ..., "models": [...]}`, or `{"query": ..., "error": ...}` if that search
+    failed. Results are cached and shared with `/api/v1/search`.
+    """
+    tiers = _thermal_tiers(request.max_thermal, request.thermal_in)
+    _check_sort(request.sort)
+    results = async_batch_search(
+        request.queries,
+        limit=request.limit,
+        model_type=request.model_type,
+        thermal_aware=request.thermal_aware,
+        tiers=tiers,
+        budget=request.fetch_budget,
+        sort=request.sort,
+        concurrency=request.concurrency,
+    )
+    return StreamingResponse(_batch_lines(results), media_type="application/x-ndjson")
+
+
+async def _batch_lines(results: AsyncIterator[BatchResult]) -> AsyncIterator[bytes]:
+    async for result in results:
+        if result.error is not None:
+            record = {"query": result.query, "error": result.error}
+        else:
+            models = [model_fields(model) for model in result.models]
+            record = {"query": result.query, "models": models}
+        yield dumps(record) + b"\n"
+
+
+def _check_sort(sort: str | None, query: str = "") -> None:
+    if sort is None:
+        return
+    try:
+        parse_sort(sort, query)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e)) from e
+
+
+def _thermal_tiers(
+    max_thermal: str | None, thermal_in: list[str] | None
+) -> frozenset[str] | None:
+    if thermal_in is not None:
+        thermal_in = [name for value in thermal_in for name in value.split(",")]
+    try:
+        return thermal_tiers(max_thermal, thermal_in)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e)) from e
+
+
+async def _ndjson_lines(
+    first: Mapping[str, Any] | None, stream: AsyncIterator[Mapping[str, Any]]
+) -> AsyncIterator[bytes]:
+    async for model, error in _stream_records(first, stream):
+        record = model if error is None else {"error": error}
+        yield dumps(record) + b"\n"
+
+
+async def _sse_events(
+    first: Mapping[str, Any] | None, stream: AsyncIterator[Mapping[str, Any]]
+) -> AsyncIterator[str]:
+    async for model, error in _stream_records(first, stream):
+        if error is not None:
+            yield f"event: error\ndata: {json.dumps({'error': error})}\n\n"
+            return
+        yield f"data: {json.dumps(model)}\n\n"
+    yield "event: done\ndata: {}\n\n"
+
+
+async def _stream_records(
+    first: Mapping[str, Any] | None, stream: AsyncIterator[Mapping[str, Any]]
+) -> AsyncIterator[tuple[dict[str, Any] | None, str | None]]:
+    """(model, None) per result, then (None, message) if the stream fails"""
+    if first is None:
+        return
+    yield model_fields(first), None
+    try:
+        async for model in stream:
+            yield model_fields(model), None
+    except Exception as e:
+        yield None, str(e)
+
 
 # Model details endpoint
 @app.get(
@@ -210,56 +667,79 @@ async def search_models(
                 }
             },
         },
+        304: {"description": "Not modified since the ETag in If-None-Match"},
         404: {"description": "Model not found"},
         500: {"description": "Internal server error"},
     },
 )
-async def get_model_details(model_id: str):
+async def get_model_details(request: Request, model_id: str):
     """
     Get detailed information about a specific model
 
     - **model_id**: The model ID (e.g., bert-base-uncased)
+
+    Responses carry an `ETag` and `Cache-Control`, as for `/api/v1/search`.
     """
     try:
-        # For now, we'll search for the specific model
-        # In a real implementation, we'd use HfApi.model_info()
-        results = thermal_search(query=model_id, limit=1)
-
-        if not results:
-            raise HTTPException(status_code=404, detail=f"Model {model_id} not found")
-
-        model = results[0]
-
-        # Check if this is the exact model we're looking for
-        if model["modelId"] != model_id:
-            # Try to find exact match
-            found = False
-            for result in thermal_search(query=model_id, limit=10):
-                if result["modelId"] == model_id:
-                    model = result
-                    found = True
-                    break
-
-            if not found:
-                raise HTTPException(
-                    status_code=404, detail=f"Model {model_id} not found"
-                )
-
-        return ModelDetailsResponse(
-            modelId=model["modelId"],
-            thermal_cost=model.get("thermal_cost", "Unknown"),
-            downloads=model.get("downloads", 0),
-            likes=model.get("likes", 0),
-            tags=model.get("tags", []),
-            pipeline_tag=model.get("pipeline_tag"),
-            library_name=model.get("library_name"),
-            description=None,  # Would need to fetch from model card
-        )
-    except HTTPException:
-        raise
+        model = await async_model_details(model_id)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e)) from e
 
+    if model is None:
+        raise HTTPException(status_code=404, detail=f"Model {model_id} not found")
+
+    body = dumps(_details_response(model).model_dump(mode="json"))
+    return cached_json_response(request, body)
+
+
+@app.post(
+    "/api/v1/models:batchGet",
+    response_model=BatchGetResponse,
+    tags=["models"],
+    summary="Get Many Model Details",
+    response_description="Details of every model found, in request order",
+    responses={
+        422: {"description": "Validation error"},
+        500: {"description": "Internal server error"},
+    },
+)
+async def batch_get_models(request: BatchGetRequest):
+    """
+    Look up many models in one request
+
+    - **ids**: Model ids (1-1000); repeated ids are looked up once
+
+    Ids that are neither in the local index nor on the Hub are listed in
+    **missing** instead of failing the request.
+    """
+    try:
+        found = await async_model_details_many(request.ids)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e)) from e
+
+    return BatchGetResponse(
+        models=[_details_response(model) for model in found if model is not None],
+        missing=[
+            model_id
+            for model_id, model in zip(request.ids, found, strict=True)
+            if model is None
+        ],
+    )
+
+
+def _details_response(model: Mapping[str, Any]) -> ModelDetailsResponse:
+    return ModelDetailsResponse(
+        modelId=model["modelId"],
+        thermal_cost=model.get("thermal_cost", "Unknown"),
+        downloads=model.get("downloads", 0),
+        likes=model.get("likes", 0),
+        tags=model.get("tags", []),
+        pipeline_tag=model.get("pipeline_tag"),
+        library_name=model.get("library_name"),
+        parameters=model.get("parameters"),
+        description=None,  # Would need to fetch from model card
+    )
+
 
 # Root endpoint
 @app.get("/")
@@ -0,0 +1,156 @@
+"""
+ASGI middleware for the Thermal Scout API
+"""
+
+import time
+from typing import Any
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from thermal_scout.api.compression import Codec, compress, negotiate
+from thermal_scout.api.conditional import identity_tag, variant_tag
+from thermal_scout.config import compression_level, compression_min_size
+from thermal_scout.metrics import request_seconds, request_timings, stage
+
+# Route label of requests no route matched, so unknown paths add no series
+UNMATCHED_ROUTE = "unmatched"
+
+# Media types worth compressing; everything else is sent as is
+COMPRESSIBLE_TYPES = ("application/json", "text/")
+
+
+class TimingMiddleware:
+    """
+    Time each request's stages and report them in a ``Server-Timing`` header
+
+    The request's ``Timings`` are in context while the app runs, so searches
+    add their stages to it. When the response starts, the stages and the
+    total are written to ``Server-Timing`` and the total is observed in
+    ``request_seconds`` by method, route template and status.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with request_timings() as timings:
+
+            async def send_with_timings(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    total = time.perf_counter() - timings.started
+                    headers = MutableHeaders(scope=message)
+                    headers.append("Server-Timing", timings.server_timing(total))
+                    request_seconds.observe(
+                        total, scope["method"], _route(scope), str(message["status"])
+                    )
+                await send(message)
+
+            await self.app(scope, receive, send_with_timings)
+
+
+class CompressionMiddleware:
+    """
+    Compress whole responses in the coding the client prefers
+
+    A JSON or text response sent in one piece, of at least ``minimum_size``
+    bytes, is compressed with the codec ``negotiate`` picks from
+    ``Accept-Encoding`` at ``level`` (each codec's default for ``None``);
+    both default to the configuration. Compressed bodies are reused by ETag,
+    which becomes the ``variant_tag`` of the coding. Streamed responses are
+    passed through, so their lines are not held back.
+    """
+
+    def __init__(
+        self, app: ASGIApp, minimum_size: int | None = None, level: int | None = None
+    ):
+        self.app = app
+        self.minimum_size = (
+            compression_min_size() if minimum_size is None else minimum_size
+        )
+        self.level = compression_level() if level is None else level
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = Headers(scope=scope)
+        codec = negotiate(request_headers.get("accept-encoding", ""))
+        if_none_match = request_headers.get("if-none-match", "")
+        held: Message | None = None
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal held
+            if message["type"] == "http.response.start":
+                # Held back until the body shows whether it comes in one piece
+                held = message
+                return
+            if held is not None:
+                start, held = held, None
+                if not message.get("more_body", False):
+                    message = self._encode(start, message, codec, if_none_match)
+                await send(start)
+            await send(message)
+
+        await self.app(scope, receive, send_compressed)
+
+    def _encode(
+        self, start: Message, message: Message, codec: Codec | None, if_none_match: str
+    ) -> Message:
+        headers = MutableHeaders(scope=start)
+        if start["status"] == 304:
+            _echo_variant(headers, if_none_match)
+            return message
+
+        body = message.get("body", b"")
+        if (
+            start["status"] != 200
+            or "content-encoding" in headers
+            or len(body) < self.minimum_size
+            or not headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES)
+        ):
+            return message
+
+        _vary_on_encoding(headers)
+        if codec is None:
+            return message
+        tag = headers.get("etag")
+        with stage("compress"):
+            compressed = compress(body, codec, self.level, tag)
+        if len(compressed) >= len(body):
+            return message
+
+        headers["Content-Encoding"] = codec.name
+        headers["Content-Length"] = str(len(compressed))
+        if tag is not None:
+            headers["ETag"] = variant_tag(tag, codec.name)
+        return {**message, "body": compressed}
+
+
+def _vary_on_encoding(headers: MutableHeaders) -> None:
+    vary = [value.strip().lower() for value in headers.get("vary", "").split(",")]
+    if "accept-encoding" not in vary:
+        headers.add_vary_header("Accept-Encoding")
+
+
+def _echo_variant(headers: MutableHeaders, if_none_match: str) -> None:
+    """Answer a 304 with the tag of the compressed variant the client holds"""
+    tag = headers.get("etag")
+    if tag is None:
+        return
+    _vary_on_encoding(headers)
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip().removeprefix("W/")
+        if candidate != tag and identity_tag(candidate) == tag:
+            headers["ETag"] = candidate
+            return
+
+
+def _route(scope: Scope) -> str:
+    route: Any = scope.get("route")
+    return getattr(route, "path", UNMATCHED_ROUTE)
@@ -0,0 +1,98 @@
+"""
+Many searches at once, with bounded concurrency
+
+``async_batch_search`` runs a list of queries (or model ids) through the
+cached search path of ``async_thermal_search``, at most ``concurrency`` at a
+time over the shared Hub client, and yields each query's results as soon as
+they are ready. Identical queries are searched once. Queries are read lazily,
+so a batch of any size holds only the searches in flight.
+"""
+
+import asyncio
+from collections.abc import AsyncIterator, Collection, Iterable, Iterator
+from dataclasses import dataclass
+
+from .config import DEFAULT_BATCH_CONCURRENCY
+from .hub import AsyncHubClient
+from .index import ModelIndex
+from .metrics import request_timings
+from .records import ModelRecord
+from .search import async_thermal_search_raising
+
+
+@dataclass(frozen=True)
+class BatchResult:
+    query: str
+    models: list[ModelRecord]
+    error: str | None = None  # the search failed and ``models`` is empty
+
+
+def unique_queries(lines: Iterable[str]) -> Iterator[str]:
+    """Each stripped, non-blank line once, in order"""
+    seen: set[str] = set()
+    for line in lines:
+        query = line.strip()
+        if query and query not in seen:
+            seen.add(query)
+            yield query
+
+
+async def async_batch_search(
+    queries: Iterable[str],
+    limit: int = 10,
+    model_type: str | None = None,
+    thermal_aware: bool = True,
+    index: ModelIndex | None = None,
+    client: AsyncHubClient | None = None,
+    tiers: Collection[str] | None = None,
+    budget: int | None = None,
+    sort: str | None = None,
+    concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+) -> AsyncIterator[BatchResult]:
+    """
+    A ``BatchResult`` per distinct query, in the order they complete
+
+    Each query is searched like ``async_thermal_search`` with the other
+    arguments. A failed search yields a result with its ``error`` instead of
+    ending the batch. Closing the iterator early cancels the searches in
+    flight.
+    """
+    pending = unique_queries(queries)
+    # Bounded, so a slow consumer holds the workers back
+    done: asyncio.Queue[BatchResult | None] = asyncio.Queue(maxsize=concurrency)
+
+    async def worker() -> None:
+        # Workers share the iterator; next() never awaits, so this is safe
+        for query in pending:
+            with request_timings(fresh=True):
+                try:
+                    models = await async_thermal_search_raising(
+                        query,
+                        limit,
+                        model_type,
+                        thermal_aware,
+                        index,
+                        client,
+                        tiers,
+                        budget,
+                        sort,
+                    )
+                    result = BatchResult(query, models)
+                except Exception as e:
+                    result = BatchResult(query, [], str(e))
+            await done.put(result)
+        await done.put(None)
+
+    workers = [asyncio.create_task(worker()) for _ in range(concurrency)]
+    try:
+        running = len(workers)
+        while running:
+            result = await done.get()
+            if result is None:
+                running -= 1
+            else:
+                yield result
+    finally:
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
@@ -0,0 +1,371 @@
+"""
+In-process response caching
+"""
+
+import asyncio
+import heapq
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any
+
+# Threads refreshing stale entries, shared by all caches: a thread per stale
+# hit would grow without bound under load
+REFRESH_WORKERS = 4
+_refresh_pool = ThreadPoolExecutor(
+    max_workers=REFRESH_WORKERS, thread_name_prefix="cache-refresh"
+)
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """Counters of a ``TTLCache`` since it was created or cleared"""
+
+    hits: int
+    misses: int
+    coalesced: int  # misses that waited for another caller's computation
+    evictions: int  # entries dropped to stay within maxsize
+    expirations: int  # entries dropped because their TTL ran out
+    stale_hits: int  # hits on expired entries, served while they were refreshed
+    refreshes: int  # entries recomputed in the background
+    size: int
+    maxsize: int
+    ttl: float
+    stale: float
+
+
+class _Flight:
+    """A computation in progress that concurrent callers wait on"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: BaseException | None = None
+
+
+class _Entry:
+    """A cached value, when it expires and how to refresh it"""
+
+    __slots__ = ("expires", "is_async", "refresh", "requests", "value")
+
+    def __init__(
+        self,
+        expires: float,
+        value: Any,
+        refresh: Callable[[], Any] | None,
+        is_async: bool,
+        requests: int,
+    ):
+        self.expires = expires
+        self.value = value
+        self.refresh = refresh
+        self.is_async = is_async
+        self.requests = requests  # lookups since stored, halved on each refresh
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache whose entries expire ``ttl`` seconds after being stored
+
+    ``get_or_compute`` coalesces concurrent misses on the same key: one caller
+    computes the value while the others wait for it, so a burst of identical
+    requests costs a single upstream call. Errors are handed to the waiting
+    callers and not cached. ``aget_or_compute`` does the same for coroutines;
+    async and threaded callers share entries but not in-flight computations.
+
+    With ``stale`` seconds, an expired entry is still served for that long
+    while its computation runs again in the background (a thread, or a task
+    on the caller's loop); if that fails, the entry is served until it runs
+    out. Entries count their lookups, and ``refresh_popular`` recomputes the
+    most requested ones before they expire, so they are never stale at all.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+        stale: float = 0.0,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stale = stale
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[Hashable, _Entry] = OrderedDict()
+        self._flights: dict[Hashable, _Flight] = {}
+        self._async_flights: dict[Hashable, asyncio.Task] = {}
+        self._refreshing: set[Hashable] = set()
+        self._tasks: set[asyncio.Task] = set()
+        self._reset_counters()
+
+    def _reset_counters(self) -> None:
+        self._hits = self._misses = self._coalesced = 0
+        self._evictions = self._expirations = 0
+        self._stale_hits = self._refreshes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _lookup(self, key: Hashable) -> tuple[bool, Any, _Entry | None]:
+        """
+        (hit, value, entry to refresh) for a servable entry; call with the lock held
+
+        The entry to refresh is a stale one nobody is refreshing yet; the
+        caller must start its refresh.
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            now = self._clock()
+            if now < entry.expires + self.stale:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                entry.requests += 1
+                if now < entry.expires:
+                    return True, entry.value, None
+                self._stale_hits += 1
+                if entry.refresh is None or key in self._refreshing:
+                    return True, entry.value, None
+                self._refreshing.add(key)
+                return True, entry.value, entry
+            del self._entries[key]
+            self._expirations += 1
+        return False, None, None
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Cached value for ``key``, or ``default``; counted as a hit or miss"""
+        with self._lock:
+            hit, value, _stale = self._lookup(key)
+            if not hit:
+                self._misses += 1
+                return default
+        return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Store ``value`` for ``key`` for ``ttl`` seconds, replacing any entry"""
+        self._store(key, value)
+
+    def get_or_compute(
+        self,
+        key: Hashable,
+        compute: Callable[[], Any],
+        refresh: Callable[[], Any] | None = None,
+    ) -> Any:
+        """
+        Cached value for ``key``, calling ``compute`` on a miss
+
+        ``refresh`` (default: ``compute``) recomputes the entry in the
+        background once it is stale or popular.
+        """
+        with self._lock:
+            hit, value, stale = self._lookup(key)
+            if hit:
+                if stale is not None:
+                    _refresh_pool.submit(self._refresh, key, stale)
+                return value
+
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self._misses += 1
+            else:
+                self._coalesced += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = compute()
+        except BaseException as e:
+            flight.error = e
+            raise
+        else:
+            self._store(key, flight.value, refresh or compute, is_async=False)
+            return flight.value
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    async def aget_or_compute(
+        self,
+        key: Hashable,
+        compute: Callable[[], Awaitable[Any]],
+        refresh: Callable[[], Awaitable[Any]] | None = None,
+    ) -> Any:
+        """
+        Cached value for ``key``, awaiting ``compute()`` on a miss
+
+        ``refresh`` is as for ``get_or_compute``.
+        """
+        with self._lock:
+            hit, value, stale = self._lookup(key)
+            if hit:
+                if stale is not None:
+                    self._spawn(self._arefresh(key, stale))
+                return value
+
+            loop = asyncio.get_running_loop()
+            flight = self._async_flights.get(key)
+            if flight is None or flight.get_loop() is not loop:
+                # Its own task, so cancelling the caller that started it
+                # does not cancel it for the callers waiting on it
+                flight = loop.create_task(
+                    self._acompute(key, compute, refresh or compute)
+                )
+                flight.add_done_callback(lambda done: self._landed(key, done))
+                self._async_flights[key] = flight
+                self._misses += 1
+            else:
+                self._coalesced += 1
+
+        # A cancelled caller must not cancel the shared computation
+        return await asyncio.shield(flight)
+
+    async def _acompute(
+        self,
+        key: Hashable,
+        compute: Callable[[], Awaitable[Any]],
+        refresh: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        value = await compute()
+        self._store(key, value, refresh, is_async=True)
+        return value
+
+    def _landed(self, key: Hashable, flight: asyncio.Task) -> None:
+        """Forget a finished async flight"""
+        with self._lock:
+            if self._async_flights.get(key) is flight:
+                del self._async_flights[key]
+        if not flight.cancelled():
+            flight.exception()  # retrieved, so a flight nobody awaited does not warn
+
+    async def refresh_popular(self, top: int, within: float) -> int:
+        """
+        Recompute the ``top`` most requested entries that expire within ``within``
+
+        Only entries requested since they were stored (or half as often as
+        before their last refresh) count, so interest that has died off
+        lets its entries expire. Returns the number of entries refreshed.
+        """
+        with self._lock:
+            now = self._clock()
+            candidates = [
+                (key, entry)
+                for key, entry in self._entries.items()
+                if entry.refresh is not None
+                and entry.requests > 0
+                and now < entry.expires + self.stale
+            ]
+            popular = heapq.nlargest(top, candidates, key=lambda item: item[1].requests)
+            due = [
+                (key, entry)
+                for key, entry in popular
+                if entry.expires - now <= within and key not in self._refreshing
+            ]
+            self._refreshing.update(key for key, _entry in due)
+        await asyncio.gather(*(self._arefresh(key, entry) for key, entry in due))
+        return len(due)
+
+    def _refresh(self, key: Hashable, entry: _Entry) -> None:
+        """Recompute a stale entry in ``_refresh_pool``; it was added to ``_refreshing``"""
+        try:
+            value = entry.refresh()
+        except Exception:
+            pass  # served stale until it runs out, as if never refreshed
+        else:
+            self._refreshed(key, entry, value)
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    async def _arefresh(self, key: Hashable, entry: _Entry) -> None:
+        """``_refresh`` on the event loop; threaded refreshes run in a worker"""
+        try:
+            if entry.is_async:
+                value = await entry.refresh()
+            else:
+                value = await asyncio.to_thread(entry.refresh)
+        except Exception:
+            pass  # served stale until it runs out, as if never refreshed
+        else:
+            self._refreshed(key, entry, value)
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def _refreshed(self, key: Hashable, entry: _Entry, value: Any) -> None:
+        with self._lock:
+            self._refreshes += 1
+        self._store(key, value, entry.refresh, entry.is_async, entry.requests // 2)
+
+    def _spawn(self, coroutine: Awaitable[Any]) -> None:
+        # Hold a reference, or the loop may collect the task before it is done
+        task = asyncio.ensure_future(coroutine)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _store(
+        self,
+        key: Hashable,
+        value: Any,
+        refresh: Callable[[], Any] | None = None,
+        is_async: bool = False,
+        requests: int = 1,
+    ) -> None:
+        with self._lock:
+            if self.maxsize <= 0 or self.ttl <= 0:
+                return
+            expires = self._clock() + self.ttl
+            self._entries[key] = _Entry(expires, value, refresh, is_async, requests)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def configure(
+        self,
+        maxsize: int | None = None,
+        ttl: float | None = None,
+        stale: float | None = None,
+    ) -> None:
+        """Change the limits; shrinking evicts least recently used entries"""
+        with self._lock:
+            if ttl is not None:
+                self.ttl = ttl
+            if stale is not None:
+                self.stale = stale
+            if maxsize is not None:
+                self.maxsize = maxsize
+                while len(self._entries) > max(maxsize, 0):
+                    self._entries.popitem(last=False)
+                    self._evictions += 1
+
+    def clear(self) -> None:
+        """Drop every entry and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self._reset_counters()
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                coalesced=self._coalesced,
+                evictions=self._evictions,
+                expirations=self._expirations,
+                stale_hits=self._stale_hits,
+                refreshes=self._refreshes,
+                size=len(self._entries),
+                maxsize=self.maxsize,
+                ttl=self.ttl,
+                stale=self.stale,
+            )
@@ -2,10 +2,16 @@
 Thermal Scout CLI - A thermal-aware Hugging Face model search tool
 """
 
+from pathlib import Path
+
 import typer
 from rich.console import Console
 
-from .search import thermal_search
+from .config import DEFAULT_BATCH_CONCURRENCY, MAX_BATCH_CONCURRENCY
+from .output import OutputFormat, ResultWriter
+
+# Commands import the search stack (huggingface_hub, httpx, numpy) when they
+# run, so --help and about start without it; see tests/test_startup.py
 
 app = typer.Typer(
     name="thermal-scout",
@@ -13,6 +19,8 @@ app = typer.Typer(
     no_args_is_help=True,
 )
 console = Console()
+# Messages that must not mix with results written to stdout
+errors = Console(stderr=True)
 
 
 def get_thermal_indicator(thermal_cost: str) -> str:
@@ -30,6 +38,42 @@ def search(
     no_thermal: bool = typer.Option(
         False, "--no-thermal", help="Disable thermal-aware sorting"
     ),
+    all_results: bool = typer.Option(
+        False,
+        "--all",
+        help="Stream every result page by page, unsorted (ignores --limit)",
+    ),
+    max_thermal: str | None = typer.Option(
+        None, "--max-thermal", help="Only models at or below this thermal level"
+    ),
+    thermal_in: str | None = typer.Option(
+        None,
+        "--thermal-in",
+        help="Only models of these thermal levels, comma-separated (e.g. Low,Medium)",
+    ),
+    budget: int | None = typer.Option(
+        None,
+        "--fetch-budget",
+        min=1,
+        help="Most Hub models to scan for filtered matches",
+    ),
+    sort: str | None = typer.Option(
+        None,
+        "--sort",
+        "-s",
+        help="Rank by comma-separated keys: thermal, downloads, likes, recency, "
+        "relevance (e.g. thermal,likes*recency)",
+    ),
+    no_daemon: bool = typer.Option(
+        False, "--no-daemon", help="Search in this process even if a daemon runs"
+    ),
+    output_format: OutputFormat = typer.Option(
+        OutputFormat.table,
+        "--format",
+        "-f",
+        case_sensitive=False,
+        help="table, or jsonl, csv or arrow streamed to stdout for other tools",
+    ),
 ):
     """
     Search Hugging Face Hub for models with thermal awareness
@@ -38,13 +82,66 @@ def search(
         thermal-scout search "sentiment analysis" --limit 5
         thermal-scout search "text generation" --type text-generation
         thermal-scout search "llama" --no-thermal
+        thermal-scout search "" --type text-classification --all
+        thermal-scout search "bert" --max-thermal Medium
+        thermal-scout search "llama" --sort "thermal,likes*recency"
+        thermal-scout search "" --all --format jsonl | jq .modelId
+
+    Searches are forwarded to `thermal-scout daemon` when one is running.
     """
-    console.print(f"\nSearching for: {query}")
+    thermal_levels = thermal_in.split(",") if thermal_in is not None else None
+    results = None
+    if not (all_results or no_daemon):
+        results = forward_search(
+            query=query,
+            limit=limit,
+            model_type=model_type,
+            thermal_aware=not no_thermal,
+            max_thermal=max_thermal,
+            thermal_in=thermal_levels,
+            budget=budget,
+            sort=sort,
+        )
 
-    # Perform search
-    results = thermal_search(
-        query=query, limit=limit, model_type=model_type, thermal_aware=not no_thermal
-    )
+    if results is None:
+        from .ranking import parse_sort
+        from .search import thermal_search
+        from .thermal import thermal_tiers
+
+        try:
+            tiers = thermal_tiers(max_thermal, thermal_levels)
+        except ValueError as e:
+            raise typer.BadParameter(str(e)) from e
+        if sort is not None:
+            try:
+                parse_sort(sort, query)
+            except ValueError as e:
+                raise typer.BadParameter(str(e), param_hint="--sort") from e
+
+    writer = open_writer(output_format)
+    if writer is None:
+        console.print(f"\nSearching for: {query}")
+
+    if results is None:
+        if all_results:
+            search_all(query, model_type, tiers, writer)
+            return
+
+        # Perform search
+        results = thermal_search(
+            query=query,
+            limit=limit,
+            model_type=model_type,
+            thermal_aware=not no_thermal,
+            tiers=tiers,
+            budget=budget,
+            sort=sort,
+        )
+
+    if writer is not None:
+        writer.write(results)
+        writer.close()
+        return
 
     if not results:
         console.print("[red]No models found matching your search.[/red]")
@@ -52,27 +149,300 @@ def search(
 
     # Simple text output for terminal compatibility
     console.print(f"\nFound {len(results)} models\n")
-    
-    # Header
+    print_header()
+    for model in results:
+        print_result(model)
+
+    if sort is not None:
+        console.print(f"\nResults sorted by {sort}")
+    elif not no_thermal:
+        console.print("\nResults sorted by thermal efficiency (Low -> High)")
+
+
+def forward_search(**arguments) -> list | None:
+    """Results of the search from a running daemon, or None if there is none"""
+    from .daemon import DaemonError, InvalidRequest, daemon_search
+
+    try:
+        return daemon_search(**arguments)
+    except InvalidRequest as e:
+        hint = "--sort" if e.field == "sort" else None
+        raise typer.BadParameter(str(e), param_hint=hint) from e
+    except DaemonError as e:
+        errors.print(f"[yellow]Daemon search failed, searching here: {e}[/yellow]")
+        return None
+
+
+def open_writer(output_format: OutputFormat) -> ResultWriter | None:
+    """The stdout writer of a machine-readable format, None for the table"""
+    import sys
+
+    from .output import open_writer as open_output
+
+    if output_format == OutputFormat.table:
+        return None
+    try:
+        return open_output(output_format, sys.stdout, sys.stdout.buffer)
+    except ImportError as e:
+        raise typer.BadParameter(str(e), param_hint="--format") from e
+
+
+def search_all(
+    query: str,
+    model_type: str | None,
+    tiers: frozenset[str] | None = None,
+    writer: ResultWriter | None = None,
+) -> None:
+    """Print every result of ``query``, or hand it to ``writer``, page by page"""
+    import asyncio
+
+    from .paging import async_iter_search
+
+    async def walk() -> int:
+        count = 0
+        async for page in async_iter_search(query, model_type=model_type, tiers=tiers):
+            if writer is not None:
+                writer.write(page)
+            else:
+                if not count:
+                    console.print()
+                    print_header()
+                for model in page:
+                    print_result(model)
+            count += len(page)
+        return count
+
+    try:
+        count = asyncio.run(walk())
+    except Exception as e:
+        (console if writer is None else errors).print(f"[red]Search failed: {e}[/red]")
+        raise typer.Exit(1) from e
+    finally:
+        if writer is not None:
+            writer.close()
+
+    if writer is not None:
+        return
+    if not count:
+        console.print("[red]No models found matching your search.[/red]")
+        return
+    console.print(f"\nListed {count:,} models")
+
+
+def print_header() -> None:
     console.print(
         f"{'Model ID':<40} {'Thermal':<12} {'Downloads':>10} {'Likes':>8} {'Type':<15}"
     )
     console.print("-" * 85)
-    
-    # Results
-    for model in results:
-        thermal_text = model.get("thermal_cost", "Unknown")
-        
-        console.print(
-            f"{model['modelId']:<40} "
-            f"{thermal_text:<12} "
-            f"{model.get('downloads', 0):>10,} "
-            f"{model.get('likes', 0):>8,} "
-            f"{model.get('pipeline_tag', 'n/a') or 'n/a':<15}"
+
+
+def print_result(model: dict) -> None:
+    thermal_text = model.get("thermal_cost", "Unknown")
+
+    console.print(
+        f"{model['modelId']:<40} "
+        f"{thermal_text:<12} "
+        f"{model.get('downloads', 0):>10,} "
+        f"{model.get('likes', 0):>8,} "
+        f"{model.get('pipeline_tag', 'n/a') or 'n/a':<15}"
+    )
+
+
+@app.command()
+def sync(
+    full: bool = typer.Option(
+        False, "--full", help="Relist every model and drop deleted ones"
+    ),
+    index: Path | None = typer.Option(
+        None, "--index", help="Index directory (default: $THERMAL_SCOUT_INDEX)"
+    ),
+):
+    """
+    Sync the local model index with Hugging Face Hub
+
+    Only models modified since the last sync are fetched. An interrupted
+    sync picks up where it left off the next time it runs.
+
+    Examples:
+        thermal-scout sync
+        thermal-scout sync --full
+    """
+    from .hub import hub_api
+    from .sync import sync_index
+
+    console.print("\nSyncing local index...")
+
+    def progress(processed: int, rate: float) -> None:
+        console.print(f"  {processed:,} models ({rate:,.0f} rows/sec)")
+
+    try:
+        report = sync_index(hub_api(), path=index, full=full, progress=progress)
+    except KeyboardInterrupt:
+        console.print("\n[yellow]Sync interrupted, run it again to resume.[/yellow]")
+        raise typer.Exit(130) from None
+    except Exception as e:
+        console.print(f"[red]Sync failed: {e}[/red]")
+        raise typer.Exit(1) from e
+
+    console.print(
+        f"\nSynced {report.upserted:,} models in {report.elapsed:.1f}s "
+        f"({report.rows_per_second:,.0f} rows/sec)"
+    )
+    if report.resumed:
+        console.print(f"Resumed {report.resumed:,} models from an interrupted sync")
+    if report.deleted:
+        console.print(f"Removed {report.deleted:,} deleted models")
+    console.print(f"Index now holds {report.total:,} models\n")
+
+
+@app.command()
+def batch(
+    input_file: typer.FileText = typer.Option(
+        ...,
+        "--input",
+        "-i",
+        help="File of queries or model ids, one per line (- for stdin)",
+    ),
+    limit: int = typer.Option(10, "--limit", "-l", help="Results per query"),
+    model_type: str | None = typer.Option(
+        None, "--type", "-t", help="Filter by model type/task"
+    ),
+    no_thermal: bool = typer.Option(
+        False, "--no-thermal", help="Disable thermal-aware sorting"
+    ),
+    max_thermal: str | None = typer.Option(
+        None, "--max-thermal", help="Only models at or below this thermal level"
+    ),
+    thermal_in: str | None = typer.Option(
+        None,
+        "--thermal-in",
+        help="Only models of these thermal levels, comma-separated (e.g. Low,Medium)",
+    ),
+    budget: int | None = typer.Option(
+        None,
+        "--fetch-budget",
+        min=1,
+        help="Most Hub models to scan per query for filtered matches",
+    ),
+    sort: str | None = typer.Option(
+        None, "--sort", "-s", help="Rank by comma-separated keys, as for search"
+    ),
+    concurrency: int = typer.Option(
+        DEFAULT_BATCH_CONCURRENCY,
+        "--concurrency",
+        "-c",
+        min=1,
+        max=MAX_BATCH_CONCURRENCY,
+        help="Searches run at a time",
+    ),
+):
+    """
+    Search many queries concurrently, writing JSON lines to stdout
+
+    Each distinct query is written as soon as its search completes, as
+    {"query": ..., "models": [...]} or {"query": ..., "error": ...}. Repeated
+    and blank lines are skipped; a summary goes to stderr.
+
+    Examples:
+        thermal-scout batch --input queries.txt > results.jsonl
+        cut -f1 models.tsv | thermal-scout batch -i - --max-thermal Low -c 32
+    """
+    import asyncio
+    import json
+    import sys
+
+    from .batch import async_batch_search
+    from .ranking import parse_sort
+    from .thermal import thermal_tiers
+
+    try:
+        tiers = thermal_tiers(
+            max_thermal, thermal_in.split(",") if thermal_in is not None else None
         )
+    except ValueError as e:
+        raise typer.BadParameter(str(e)) from e
+    if sort is not None:
+        try:
+            parse_sort(sort)
+        except ValueError as e:
+            raise typer.BadParameter(str(e), param_hint="--sort") from e
 
-    if not no_thermal:
-        console.print("\nResults sorted by thermal efficiency (Low -> High)")
+    async def run() -> tuple[int, int]:
+        searched = failed = 0
+        results = async_batch_search(
+            input_file,
+            limit=limit,
+            model_type=model_type,
+            thermal_aware=not no_thermal,
+            tiers=tiers,
+            budget=budget,
+            sort=sort,
+            concurrency=concurrency,
+        )
+        async for result in results:
+            record: dict = {"query": result.query}
+            if result.error is not None:
+                record["error"] = result.error
+                failed += 1
+            else:
+                record["models"] = [dict(model) for model in result.models]
+            sys.stdout.write(json.dumps(record) + "\n")
+            sys.stdout.flush()
+            searched += 1
+        return searched, failed
+
+    searched, failed = asyncio.run(run())
+    errors.print(f"Searched {searched:,} queries, {failed:,} failed")
+    if failed:
+        raise typer.Exit(1)
+
+
+@app.command()
+def daemon(
+    stop: bool = typer.Option(False, "--stop", help="Stop the running daemon"),
+    preload: bool = typer.Option(
+        True, "--preload/--no-preload", help="Open the local index on startup"
+    ),
+):
+    """
+    Keep a warm search process that `search` forwards to
+
+    The daemon holds the Hub connection pool, the search cache and the local
+    index, and listens on the Unix socket $THERMAL_SCOUT_SOCKET (default:
+    daemon.sock in the cache directory). Searches made while it runs return
+    in milliseconds once cached.
+
+    Examples:
+        thermal-scout daemon &
+        thermal-scout daemon --stop
+    """
+    import asyncio
+
+    from .config import daemon_socket
+    from .daemon import ping, serve
+    from .daemon import stop as stop_daemon
+
+    path = daemon_socket()
+    if stop:
+        if not stop_daemon(path):
+            console.print(f"[red]No daemon is listening on {path}[/red]")
+            raise typer.Exit(1)
+        console.print("Daemon stopped")
+        return
+
+    pid = ping(path)
+    if pid is not None:
+        console.print(f"[red]A daemon (pid {pid}) is already listening on {path}[/red]")
+        raise typer.Exit(1)
+
+    console.print(f"Daemon listening on {path}")
+    try:
+        asyncio.run(serve(path, preload=preload))
+    except KeyboardInterrupt:
+        console.print("\nDaemon stopped")
+    except (RuntimeError, OSError) as e:
+        console.print(f"[red]{e}[/red]")
+        raise typer.Exit(1) from e
 
 
 @app.command()
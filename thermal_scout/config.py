@@ -0,0 +1,104 @@
+"""
+Runtime configuration for Thermal Scout, read from environment variables
+"""
+
+import os
+from pathlib import Path
+
+# Searches of one batch in flight unless told otherwise
+DEFAULT_BATCH_CONCURRENCY = 16
+
+# Most searches of one batch in flight; the Hub pool holds 32 connections
+MAX_BATCH_CONCURRENCY = 64
+
+
+def cache_dir() -> Path:
+    """Directory holding local Thermal Scout state (index, caches)"""
+    default = Path.home() / ".cache" / "thermal-scout"
+    return Path(os.environ.get("THERMAL_SCOUT_CACHE_DIR", default))
+
+
+def index_dir() -> Path:
+    """Directory of the local model metadata index"""
+    return Path(os.environ.get("THERMAL_SCOUT_INDEX", cache_dir() / "index"))
+
+
+def search_cache_ttl() -> float:
+    """Seconds a search result is served from the cache (0 disables it)"""
+    return float(os.environ.get("THERMAL_SCOUT_CACHE_TTL", 300))
+
+
+def search_cache_size() -> int:
+    """Number of distinct searches kept in the cache"""
+    return int(os.environ.get("THERMAL_SCOUT_CACHE_SIZE", 1024))
+
+
+def search_cache_stale() -> float:
+    """Seconds an expired search is still served while it is refreshed (0: never)"""
+    return float(os.environ.get("THERMAL_SCOUT_CACHE_STALE", 300))
+
+
+def search_refresh_top() -> int:
+    """Most requested searches kept fresh before they expire (0 disables)"""
+    return int(os.environ.get("THERMAL_SCOUT_CACHE_REFRESH_TOP", 32))
+
+
+def search_refresh_interval() -> float:
+    """Seconds between looking for popular searches about to expire"""
+    return float(os.environ.get("THERMAL_SCOUT_CACHE_REFRESH_INTERVAL", 30))
+
+
+def fetch_budget() -> int:
+    """Most Hub models a filtered search lists before settling for fewer matches"""
+    return int(os.environ.get("THERMAL_SCOUT_FETCH_BUDGET", 1000))
+
+
+def hub_endpoint() -> str:
+    """Base URL of the Hugging Face Hub, ``HF_ENDPOINT`` as in huggingface_hub"""
+    return os.environ.get("HF_ENDPOINT", "https://huggingface.co")
+
+
+def hub_timeout() -> float:
+    """Seconds to wait for the Hub to connect or send data"""
+    return float(os.environ.get("THERMAL_SCOUT_HUB_TIMEOUT", 10))
+
+
+def hub_retries() -> int:
+    """Retries of a Hub request after connection errors, 429 or 5xx"""
+    return int(os.environ.get("THERMAL_SCOUT_HUB_RETRIES", 3))
+
+
+def hub_backoff() -> float:
+    """Seconds before the first retry, doubled on each further attempt"""
+    return float(os.environ.get("THERMAL_SCOUT_HUB_BACKOFF", 0.5))
+
+
+def hub_pool_size() -> int:
+    """Keep-alive connections held open to the Hub"""
+    return int(os.environ.get("THERMAL_SCOUT_HUB_POOL_SIZE", 32))
+
+
+def daemon_socket() -> Path:
+    """Unix socket the ``thermal-scout daemon`` listens on"""
+    return Path(os.environ.get("THERMAL_SCOUT_SOCKET", cache_dir() / "daemon.sock"))
+
+
+def http_max_age() -> int:
+    """Seconds clients and proxies may reuse a search or model response"""
+    return int(os.environ.get("THERMAL_SCOUT_HTTP_MAX_AGE", 60))
+
+
+def http_stale_while_revalidate() -> int:
+    """Further seconds a stale response may be served while it is revalidated"""
+    return int(os.environ.get("THERMAL_SCOUT_HTTP_STALE_WHILE_REVALIDATE", 300))
+
+
+def compression_min_size() -> int:
+    """Smallest response body in bytes the API compresses"""
+    return int(os.environ.get("THERMAL_SCOUT_COMPRESSION_MIN_SIZE", 1024))
+
+
+def compression_level() -> int | None:
+    """Compression level for every codec, or ``None`` for each codec's default"""
+    level = os.environ.get("THERMAL_SCOUT_COMPRESSION_LEVEL")
+    return int(level) if level else None
@@ -0,0 +1,235 @@
+"""
+A long-running search process for the CLI, on a Unix socket
+
+``thermal-scout daemon`` keeps the search stack imported, the Hub connection
+pool open, ``search_cache`` warm (its most requested searches refreshed
+before they expire) and the local index loaded. ``thermal-scout
+search`` forwards to it when it is listening, so a search costs a socket
+round trip instead of a process start and a cold cache.
+
+The protocol is one JSON object per line in each direction. A request names
+an ``op``:
+
+- ``search``: the ``thermal_search`` arguments, with thermal filters as
+  ``max_thermal`` / ``thermal_in``; answered with ``results``
+- ``ping``: answered with the daemon's ``pid``
+- ``shutdown``: stops the daemon after answering
+
+Every response has ``ok``; a failed one has ``error``, and ``field`` when
+the request had an invalid argument.
+
+The client side only needs the standard library, so forwarding does not
+pay for importing the search stack.
+"""
+
+import json
+import os
+import signal
+import socket
+from contextlib import suppress
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from .config import daemon_socket
+
+if TYPE_CHECKING:
+    import asyncio
+
+# Seconds to wait for the daemon to accept a connection before searching locally
+CONNECT_TIMEOUT = 0.5
+
+# Seconds to wait for an answer; a Hub search with retries can take a while
+RESPONSE_TIMEOUT = 120.0
+
+# Longest request line the daemon reads
+MAX_REQUEST_BYTES = 1 << 20
+
+
+class DaemonError(Exception):
+    """The daemon answered a request with an error"""
+
+
+class InvalidRequest(DaemonError):
+    """The daemon rejected an argument of the request"""
+
+    def __init__(self, message: str, field: str | None = None):
+        super().__init__(message)
+        self.field = field
+
+
+def request(
+    message: dict[str, Any],
+    path: Path | None = None,
+    timeout: float = RESPONSE_TIMEOUT,
+) -> dict[str, Any] | None:
+    """
+    The daemon's response to ``message``, or None when no daemon answers
+
+    A missing or stale socket, a refused connection and a daemon that goes
+    away mid-request all return None, so callers can fall back to working
+    in-process. Error responses raise ``DaemonError`` (``InvalidRequest``
+    for a rejected argument).
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+    path = daemon_socket() if path is None else path
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(CONNECT_TIMEOUT)
+        try:
+            sock.connect(str(path))
+            sock.settimeout(timeout)
+            sock.sendall(json.dumps(message).encode() + b"\n")
+            with sock.makefile("rb") as reader:
+                line = reader.readline()
+        except OSError:
+            return None
+    if not line:
+        return None
+
+    response = json.loads(line)
+    if not response.get("ok"):
+        if "field" in response:
+            raise InvalidRequest(response["error"], response["field"])
+        raise DaemonError(response.get("error", "unknown daemon error"))
+    return response
+
+
+def daemon_search(path: Path | None = None, **arguments: Any) -> list | None:
+    """
+    Results of a search run by the daemon, or None when no daemon answers
+
+    ``arguments`` are those of a ``search`` request (see the module
+    docstring).
+    """
+    response = request({"op": "search", **arguments}, path)
+    return None if response is None else response["results"]
+
+
+def ping(path: Path | None = None) -> int | None:
+    """The pid of the daemon listening on ``path``, or None"""
+    response = request({"op": "ping"}, path, timeout=CONNECT_TIMEOUT)
+    return None if response is None else response["pid"]
+
+
+def stop(path: Path | None = None) -> bool:
+    """Ask the daemon to shut down; False if none was listening"""
+    return request({"op": "shutdown"}, path, timeout=CONNECT_TIMEOUT) is not None
+
+
+async def serve(path: Path | None = None, preload: bool = True) -> None:
+    """
+    Answer requests on the Unix socket ``path`` until asked to shut down
+
+    ``preload`` opens the local index up front, so the first search does
+    not pay for it. Raises ``RuntimeError`` if another daemon is already
+    listening; a stale socket file left by a daemon that died is replaced.
+    """
+    import asyncio
+    from importlib import import_module
+
+    from .hub import get_hub_client
+    from .index import load_default_index
+
+    path = daemon_socket() if path is None else path
+    if ping(path) is not None:
+        raise RuntimeError(f"A daemon is already listening on {path}")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.unlink(missing_ok=True)
+
+    # Import the search stack now rather than on the first search
+    search = import_module(".search", __package__)
+    if preload:
+        load_default_index()
+    hub = get_hub_client()
+    hub.async_client()
+
+    stopping = asyncio.Event()
+    # Outside the main thread a killed daemon leaves its socket behind, which
+    # the next one replaces
+    with suppress(RuntimeError):
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, stopping.set)
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while line := await reader.readline():
+                response = await _answer(line, stopping)
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        except (ConnectionError, ValueError):
+            pass  # the client went away, or sent more than MAX_REQUEST_BYTES
+        finally:
+            writer.close()
+
+    server = await asyncio.start_unix_server(
+        handle, path=str(path), limit=MAX_REQUEST_BYTES
+    )
+    # Searches may reveal what a user looks for; keep the socket private
+    path.chmod(0o600)
+    refresher = asyncio.create_task(search.refresh_hot_searches())
+    try:
+        async with server:
+            await stopping.wait()
+    finally:
+        refresher.cancel()
+        with suppress(asyncio.CancelledError):
+            await refresher
+        path.unlink(missing_ok=True)
+        await hub.aclose()
+
+
+async def _answer(line: bytes, stopping: "asyncio.Event") -> dict[str, Any]:
+    try:
+        message = json.loads(line)
+        op = message.pop("op")
+    except (ValueError, KeyError, AttributeError):
+        return {"ok": False, "error": "Malformed request"}
+
+    if op == "ping":
+        return {"ok": True, "pid": os.getpid()}
+    if op == "shutdown":
+        stopping.set()
+        return {"ok": True}
+    if op == "search":
+        try:
+            return {"ok": True, "results": await _search(**message)}
+        except InvalidRequest as e:
+            return {"ok": False, "error": str(e), "field": e.field}
+        except TypeError as e:
+            return {"ok": False, "error": f"Malformed search request: {e}"}
+    return {"ok": False, "error": f"Unknown op {op!r}"}
+
+
+async def _search(
+    query: str,
+    limit: int = 10,
+    model_type: str | None = None,
+    thermal_aware: bool = True,
+    max_thermal: str | None = None,
+    thermal_in: list[str] | None = None,
+    budget: int | None = None,
+    sort: str | None = None,
+) -> list[dict[str, Any]]:
+    from .ranking import parse_sort
+    from .search import async_thermal_search
+    from .thermal import thermal_tiers
+
+    try:
+        tiers = thermal_tiers(max_thermal, thermal_in)
+    except ValueError as e:
+        raise InvalidRequest(str(e), "tiers") from e
+    if sort is not None:
+        try:
+            parse_sort(sort, query)
+        except ValueError as e:
+            raise InvalidRequest(str(e), "sort") from e
+
+    results = await async_thermal_search(
+        query=query,
+        limit=limit,
+        model_type=model_type,
+        thermal_aware=thermal_aware,
+        tiers=tiers,
+        budget=budget,
+        sort=sort,
+    )
+    return [dict(model) for model in results]
@@ -0,0 +1,144 @@
+"""
+Direct lookup of individual models by id
+
+A details request is answered from the local index when the snapshot holds
+the id, otherwise with a single ``model_info`` call, instead of searching for
+the id and hoping it ranks first. Lookups are cached per id.
+"""
+
+import asyncio
+from collections.abc import Iterable
+
+import httpx
+from huggingface_hub.utils import RepositoryNotFoundError
+
+from .cache import TTLCache
+from .config import search_cache_size, search_cache_ttl
+from .hub import AsyncHubClient, get_async_client, hub_api
+from .index import ModelIndex, load_default_index
+from .records import ModelRecord
+from .search import model_to_record
+
+# Fields requested from model_info; "safetensors" gives the exact parameter count
+DETAILS_EXPAND = [
+    "downloads",
+    "likes",
+    "tags",
+    "pipeline_tag",
+    "library_name",
+    "lastModified",
+    "sha",
+    "safetensors",
+]
+
+# Concurrent Hub lookups of one batch
+MAX_LOOKUP_CONCURRENCY = 16
+
+# Recent lookups keyed by (model id, index generation); None records a miss
+details_cache = TTLCache(maxsize=search_cache_size(), ttl=search_cache_ttl())
+
+
+def model_details(model_id: str, index: ModelIndex | None = None) -> ModelRecord | None:
+    """
+    One model in the shape ``thermal_search`` returns, or ``None`` if unknown
+
+    Like ``thermal_search``, Hub errors are reported and answered with
+    ``None``; they are not cached, so the next lookup tries again.
+    """
+    try:
+        if index is not None:
+            return _model_details(model_id, index)
+
+        index = load_default_index()
+        key = (model_id, index.generation if index is not None else None)
+        return details_cache.get_or_compute(
+            key, lambda: _model_details(model_id, index)
+        )
+
+    except Exception as e:
+        print(f"Error looking up model {model_id}: {e}")
+        return None
+
+
+def _model_details(model_id: str, index: ModelIndex | None) -> ModelRecord | None:
+    if index is not None:
+        row = index.find(model_id)
+        if row is not None:
+            return index.model(row)
+
+    try:
+        info = hub_api().model_info(model_id, expand=DETAILS_EXPAND)
+    except RepositoryNotFoundError:
+        return None
+    return model_to_record(info)
+
+
+async def async_model_details(
+    model_id: str,
+    index: ModelIndex | None = None,
+    client: AsyncHubClient | None = None,
+) -> ModelRecord | None:
+    """``model_details`` for the event loop; shares ``details_cache``"""
+    try:
+        if index is not None:
+            return await _async_model_details(model_id, index, client)
+
+        index = load_default_index()
+        key = (model_id, index.generation if index is not None else None)
+        return await details_cache.aget_or_compute(
+            key, lambda: _async_model_details(model_id, index, client)
+        )
+
+    except Exception as e:
+        print(f"Error looking up model {model_id}: {e}")
+        return None
+
+
+async def async_model_details_many(
+    model_ids: Iterable[str],
+    index: ModelIndex | None = None,
+    client: AsyncHubClient | None = None,
+    concurrency: int = MAX_LOOKUP_CONCURRENCY,
+) -> list[ModelRecord | None]:
+    """
+    ``async_model_details`` for each id, in order
+
+    Repeated ids are looked up once and at most ``concurrency`` Hub lookups
+    run at a time.
+    """
+    model_ids = list(model_ids)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def lookup(model_id: str) -> ModelRecord | None:
+        async with semaphore:
+            return await async_model_details(model_id, index, client)
+
+    unique = list(dict.fromkeys(model_ids))
+    found = dict(zip(unique, await asyncio.gather(*map(lookup, unique)), strict=True))
+    return [found[model_id] for model_id in model_ids]
+
+
+async def _async_model_details(
+    model_id: str, index: ModelIndex | None, client: AsyncHubClient | None
+) -> ModelRecord | None:
+    if index is not None:
+        row = index.find(model_id)
+        if row is not None:
+            return index.model(row)
+
+    client = client if client is not None else get_async_client()
+    try:
+        info = await client.model_info(model_id, expand=DETAILS_EXPAND)
+    except httpx.HTTPStatusError as e:
+        if _repository_not_found(e.response):
+            return None
+        raise
+    return model_to_record(info)
+
+
+def _repository_not_found(response: httpx.Response) -> bool:
+    # Without a token the Hub answers 401 for repositories that do not exist
+    return response.status_code == 404 or (
+        response.status_code == 401
+        and response.headers.get("X-Error-Code") == "RepoNotFound"
+    )
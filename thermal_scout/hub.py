@@ -0,0 +1,347 @@
+"""
+Shared, pooled access to the Hugging Face Hub
+
+``HubClient`` is the process-wide owner of every Hub connection: the
+``requests`` session behind ``HfApi`` and one ``AsyncHubClient`` per event
+loop. Both keep connections alive in a bounded pool, apply a default timeout
+and retry transient failures (connection errors, 429 and 5xx) with
+exponential backoff. Use ``hub_api()`` and ``get_async_client()`` rather than
+constructing clients per call.
+"""
+
+import asyncio
+import threading
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from typing import Any
+from urllib.parse import quote
+
+import httpx
+import requests
+from huggingface_hub import HfApi, ModelInfo, configure_http_backend
+from huggingface_hub.utils import build_hf_headers
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .config import (
+    hub_backoff,
+    hub_endpoint,
+    hub_pool_size,
+    hub_retries,
+    hub_timeout,
+)
+
+# Responses worth retrying: rate limited or a transient server error
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Upper bound on a single backoff sleep, whatever Retry-After says
+MAX_BACKOFF = 30.0
+
+
+@dataclass(frozen=True)
+class HubSettings:
+    """Connection settings shared by the sync and async clients"""
+
+    endpoint: str
+    timeout: float
+    retries: int
+    backoff: float  # first retry delay in seconds, doubled on each attempt
+    pool_size: int  # connections kept alive per host
+
+    @classmethod
+    def from_env(cls) -> "HubSettings":
+        return cls(
+            endpoint=hub_endpoint(),
+            timeout=hub_timeout(),
+            retries=hub_retries(),
+            backoff=hub_backoff(),
+            pool_size=hub_pool_size(),
+        )
+
+
+class _TimeoutAdapter(HTTPAdapter):
+    """HTTPAdapter that applies a default timeout (HfApi listings pass none)"""
+
+    def __init__(self, timeout: float, **kwargs: Any):
+        self.timeout = timeout
+        super().__init__(**kwargs)
+
+    def send(self, request: requests.PreparedRequest, **kwargs: Any):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+        return super().send(request, **kwargs)
+
+
+class AsyncHubClient:
+    """Pooled async client for the Hub's model endpoints"""
+
+    def __init__(
+        self,
+        endpoint: str | None = None,
+        settings: HubSettings | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        self.settings = settings if settings is not None else HubSettings.from_env()
+        self.endpoint = (endpoint or self.settings.endpoint).rstrip("/")
+        self._client = httpx.AsyncClient(
+            base_url=self.endpoint,
+            headers=build_hf_headers(),
+            timeout=self.settings.timeout,
+            limits=httpx.Limits(
+                max_connections=self.settings.pool_size * 2,
+                max_keepalive_connections=self.settings.pool_size,
+            ),
+            transport=transport,
+        )
+
+    async def _get(self, url: str, params: dict[str, Any] | None) -> httpx.Response:
+        """GET with retries on connection errors, 429 and 5xx"""
+        attempt = 0
+        while True:
+            response = None
+            try:
+                response = await self._client.get(url, params=params)
+            except httpx.TransportError:
+                if attempt >= self.settings.retries:
+                    raise
+            else:
+                if (
+                    response.status_code not in RETRY_STATUSES
+                    or attempt >= self.settings.retries
+                ):
+                    response.raise_for_status()
+                    return response
+            await asyncio.sleep(self._delay(attempt, response))
+            attempt += 1
+
+    def _delay(self, attempt: int, response: httpx.Response | None) -> float:
+        retry_after = response.headers.get("Retry-After") if response else None
+        if retry_after is not None and retry_after.isdigit():
+            return min(float(retry_after), MAX_BACKOFF)
+        return min(self.settings.backoff * 2**attempt, MAX_BACKOFF)
+
+    async def list_models(
+        self,
+        search: str | None = None,
+        task: str | None = None,
+        sort: str | None = None,
+        direction: int | None = None,
+        limit: int | None = None,
+        expand: list[str] | None = None,
+    ) -> list[ModelInfo]:
+        """Like ``HfApi.list_models``, collected into a list"""
+        models: list[ModelInfo] = []
+        async for page in self.list_model_pages(
+            search=search,
+            task=task,
+            sort=sort,
+            direction=direction,
+            limit=limit,
+            expand=expand,
+        ):
+            models.extend(page)
+        return models
+
+    async def list_model_pages(
+        self,
+        search: str | None = None,
+        task: str | None = None,
+        sort: str | None = None,
+        direction: int | None = None,
+        limit: int | None = None,
+        expand: list[str] | None = None,
+    ) -> AsyncIterator[list[ModelInfo]]:
+        """
+        ``list_models`` one Hub page at a time
+
+        The next page is only requested once the caller asks for it, so
+        results can be handed on while later pages are still on the Hub.
+        """
+        params = _list_params(search, task, sort, direction, limit, expand)
+        remaining = limit
+        url: str | None = "/api/models"
+        while url is not None:
+            page, url = await self._models_page(url, params)
+            page = page[:remaining]
+            if page:
+                yield page
+            if remaining is not None:
+                remaining -= len(page)
+                if remaining <= 0:
+                    return
+            params = None
+
+    async def list_models_page(
+        self,
+        next_query: str | None = None,
+        search: str | None = None,
+        task: str | None = None,
+        sort: str | None = None,
+        direction: int | None = None,
+        limit: int | None = None,
+        expand: list[str] | None = None,
+    ) -> tuple[list[ModelInfo], str | None]:
+        """
+        One page of ``list_models`` and the query string of the next page
+
+        Pass a returned ``next_query`` back to continue the listing; only
+        ``limit`` (the page size) is applied on top of it. ``None`` is returned
+        once the listing is exhausted.
+        """
+        if next_query is None:
+            url = "/api/models"
+            params = _list_params(search, task, sort, direction, limit, expand)
+        else:
+            url = str(httpx.URL("/api/models", query=next_query.encode()))
+            if limit is not None:
+                url = str(httpx.URL(url).copy_set_param("limit", limit))
+            params = None
+
+        page, next_url = await self._models_page(url, params)
+        if next_url is None:
+            return page, None
+        return page, httpx.URL(next_url).query.decode()
+
+    async def _models_page(
+        self, url: str, params: dict[str, Any] | None
+    ) -> tuple[list[ModelInfo], str | None]:
+        """Models of one listing page and the URL of the next, if any"""
+        response = await self._get(url, params)
+        page = []
+        for item in response.json():
+            item.setdefault("siblings", None)
+            page.append(ModelInfo(**item))
+        # Later pages carry their parameters in the Link header
+        return page, response.links.get("next", {}).get("url")
+
+    async def model_info(
+        self,
+        repo_id: str,
+        revision: str | None = None,
+        expand: list[str] | None = None,
+    ) -> ModelInfo:
+        """Like ``HfApi.model_info``"""
+        path = f"/api/models/{repo_id}"
+        if revision is not None:
+            path += f"/revision/{quote(revision, safe='')}"
+        response = await self._get(path, {"expand": expand} if expand else None)
+        return ModelInfo(**response.json())
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+def _list_params(
+    search: str | None,
+    task: str | None,
+    sort: str | None,
+    direction: int | None,
+    limit: int | None,
+    expand: list[str] | None,
+) -> dict[str, Any]:
+    """Query parameters of the Hub's /api/models listing"""
+    params: dict[str, Any] = {}
+    if search:
+        params["search"] = search
+    if task:
+        params["filter"] = task
+    if sort is not None:
+        params["sort"] = sort
+    if direction is not None:
+        params["direction"] = direction
+    if limit is not None:
+        params["limit"] = limit
+    if expand:
+        params["expand"] = expand
+    return params
+
+
+class HubClient:
+    """
+    Owner of the process's Hub connections
+
+    Installs a pooled, retrying ``requests`` session factory for
+    ``huggingface_hub`` (which keeps one session per thread) and hands out a
+    single ``HfApi`` plus one ``AsyncHubClient`` per event loop.
+    """
+
+    def __init__(self, settings: HubSettings | None = None):
+        self.settings = settings if settings is not None else HubSettings.from_env()
+        configure_http_backend(backend_factory=self.session)
+        self.api = HfApi(endpoint=self.settings.endpoint)
+        self._async_clients: dict[asyncio.AbstractEventLoop, AsyncHubClient] = {}
+        self._lock = threading.Lock()
+
+    def session(self) -> requests.Session:
+        """A new session configured with the pool, timeout and retry settings"""
+        settings = self.settings
+        retry = Retry(
+            total=settings.retries,
+            backoff_factor=settings.backoff,
+            backoff_max=MAX_BACKOFF,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods={"GET", "HEAD"},
+            # The last response is returned so huggingface_hub reports it
+            raise_on_status=False,
+        )
+        adapter = _TimeoutAdapter(
+            settings.timeout,
+            pool_connections=settings.pool_size,
+            pool_maxsize=settings.pool_size,
+            max_retries=retry,
+        )
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def async_client(self) -> AsyncHubClient:
+        """
+        Client for the running event loop
+
+        httpx connections belong to the loop that opened them, so each loop
+        gets its own client; clients of closed loops are dropped.
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._async_clients.get(loop)
+            if client is None:
+                for other in [
+                    other for other in self._async_clients if other.is_closed()
+                ]:
+                    del self._async_clients[other]
+                client = self._async_clients[loop] = AsyncHubClient(
+                    settings=self.settings
+                )
+            return client
+
+    async def aclose(self) -> None:
+        """Close the running loop's async client"""
+        with self._lock:
+            client = self._async_clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+
+_hub_client: HubClient | None = None
+_hub_client_lock = threading.Lock()
+
+
+def get_hub_client() -> HubClient:
+    """The process-wide ``HubClient``, created on first use"""
+    global _hub_client
+
+    with _hub_client_lock:
+        if _hub_client is None:
+            _hub_client = HubClient()
+        return _hub_client
+
+
+def hub_api() -> HfApi:
+    """Shared ``HfApi`` on the pooled session"""
+    return get_hub_client().api
+
+
+def get_async_client() -> AsyncHubClient:
+    """Shared ``AsyncHubClient`` for the running event loop"""
+    return get_hub_client().async_client()
@@ -0,0 +1,468 @@
+"""
+Local columnar index of Hugging Face model metadata
+
+Every column lives in its own ``.npy`` file and is memory-mapped on open, so
+queries are answered from the page cache instead of a Hub round trip.
+``meta.json`` names the current snapshot generation and is replaced last when
+writing, which makes a rewrite atomic for readers.
+"""
+
+import json
+from collections.abc import Collection, Iterable, Iterator, Mapping
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from .cache import TTLCache
+from .config import index_dir, search_cache_ttl
+from .records import TAG_ID_TYPE, ModelRecord, TagVocabulary, parse_timestamp
+from .text_index import (
+    DOWNLOADS_WEIGHT,
+    TEXT_COLUMNS,
+    TextIndex,
+    document_terms,
+    has_terms,
+    write_text_index,
+)
+from .thermal import (
+    DEFAULT_THRESHOLDS,
+    THERMAL_LEVELS,
+    THERMAL_ORDER,
+    ThermalFeatures,
+    ThermalThresholds,
+    ThermalTier,
+    model_features,
+    thermal_levels,
+)
+
+INDEX_FORMAT = 4
+
+# Full result orders kept per open index for paging, see ModelIndex.ranked
+RANKED_QUERIES = 16
+
+# Column name -> dtype
+COLUMNS = {
+    "id_data": np.uint8,  # UTF-8 model ids, concatenated
+    "id_offsets": np.int64,  # n + 1 offsets into id_data
+    "downloads": np.int64,
+    "likes": np.int64,
+    "last_modified": np.float64,  # POSIX timestamp, NaN if unknown
+    "thermal": np.uint8,  # index into THERMAL_LEVELS
+    "pipeline_tag": np.int32,  # index into meta["pipeline_tags"], -1 if unset
+    "library_name": np.int32,  # index into meta["library_names"], -1 if unset
+    "tag_offsets": np.int64,  # n + 1 offsets into tag_codes
+    "tag_codes": np.int32,  # indices into meta["tags"]
+    # Thermal score inputs, see thermal_scout.thermal.ThermalFeatures
+    "size_score": np.int8,
+    "param_score": np.int8,
+    "param_count": np.float64,
+    "tag_flags": np.uint8,
+    "parameters": np.int64,  # exact count from safetensors metadata, 0 if unknown
+}
+
+
+class ModelIndex:
+    """Read-only view over an on-disk model metadata snapshot"""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.meta = json.loads((self.path / "meta.json").read_text())
+        if self.meta.get("format") != INDEX_FORMAT:
+            raise ValueError(f"Unsupported index format in {self.path}")
+
+        generation = self.meta["generation"]
+        self.columns = {
+            name: np.load(self.path / f"{name}.{generation}.npy", mmap_mode="r")
+            for name in COLUMNS
+        }
+        self.pipeline_tags: list[str] = self.meta["pipeline_tags"]
+        self.library_names: list[str] = self.meta["library_names"]
+        self.tags: list[str] = self.meta["tags"]
+        self._ids: bytes | None = None
+        self._ids_lower: bytes | None = None
+        self._text: TextIndex | None = None
+        self._vocabulary: TagVocabulary | None = None
+        self._ranked = TTLCache(maxsize=RANKED_QUERIES, ttl=search_cache_ttl())
+
+    @property
+    def generation(self) -> int:
+        return self.meta["generation"]
+
+    @property
+    def text(self) -> TextIndex:
+        """Full-text index of the same snapshot, opened on first use"""
+        if self._text is None:
+            self._text = TextIndex(self.path, self.generation)
+        return self._text
+
+    def __len__(self) -> int:
+        return len(self.columns["downloads"])
+
+    @property
+    def thermal_features(self) -> ThermalFeatures:
+        """Thermal score inputs parsed when the snapshot was written"""
+        cols = self.columns
+        return ThermalFeatures(
+            size_score=cols["size_score"],
+            param_score=cols["param_score"],
+            param_count=cols["param_count"],
+            tag_flags=cols["tag_flags"],
+            parameters=cols["parameters"],
+        )
+
+    def rescore(self, thresholds: ThermalThresholds = DEFAULT_THRESHOLDS) -> None:
+        """
+        Re-tier every model under ``thresholds``, in memory
+
+        The stored feature columns are scored with NumPy, so no id is parsed
+        again; the snapshot on disk is left as written.
+        """
+        self.columns["thermal"] = thermal_levels(self.thermal_features, thresholds)
+        self._ranked.clear()  # thermal filters may now select other rows
+
+    def model_id(self, row: int) -> str:
+        offsets = self.columns["id_offsets"]
+        data = self.columns["id_data"][offsets[row] : offsets[row + 1]]
+        return data.tobytes().decode()
+
+    def find(self, model_id: str) -> int | None:
+        """Row holding exactly ``model_id``, or ``None`` if it is not indexed"""
+        if self._ids is None:
+            self._ids = self.columns["id_data"].tobytes()
+        needle = model_id.encode()
+        offsets = self.columns["id_offsets"]
+
+        start = self._ids.find(needle)
+        while start != -1:
+            row = int(np.searchsorted(offsets, start, side="right")) - 1
+            if offsets[row] == start and offsets[row + 1] == start + len(needle):
+                return row
+            start = self._ids.find(needle, start + 1)
+        return None
+
+    @property
+    def vocabulary(self) -> TagVocabulary:
+        """
+        This snapshot's tags, with tag codes as ids
+
+        Rows decode without string lookups, and the vocabulary is freed with
+        the snapshot and the records read from it.
+        """
+        if self._vocabulary is None:
+            self._vocabulary = TagVocabulary(self.tags)
+        return self._vocabulary
+
+    def model(self, row: int) -> ModelRecord:
+        """Materialize one row as the ``ModelRecord`` ``thermal_search`` returns"""
+        cols = self.columns
+        tag_codes = cols["tag_codes"][
+            cols["tag_offsets"][row] : cols["tag_offsets"][row + 1]
+        ]
+        pipeline = int(cols["pipeline_tag"][row])
+        library = int(cols["library_name"][row])
+        parameters = int(cols["parameters"][row])
+        modified = float(cols["last_modified"][row])
+        return ModelRecord(
+            self.model_id(row),
+            int(cols["downloads"][row]),
+            int(cols["likes"][row]),
+            tag_codes.astype(TAG_ID_TYPE).tobytes(),
+            self.pipeline_tags[pipeline] if pipeline >= 0 else None,
+            self.library_names[library] if library >= 0 else None,
+            parameters or None,
+            None if np.isnan(modified) else modified,
+            ThermalTier(int(cols["thermal"][row])),
+            self.vocabulary,
+        )
+
+    def records(self) -> Iterator[ModelRecord]:
+        """Iterate over every row in storage order"""
+        for row in range(len(self)):
+            yield self.model(row)
+
+    def match(self, search: str | None) -> np.ndarray:
+        """Rows whose id contains ``search`` (case-insensitive), like the Hub"""
+        if not search:
+            return np.arange(len(self), dtype=np.int64)
+
+        if self._ids_lower is None:
+            self._ids_lower = self.columns["id_data"].tobytes().lower()
+        needle = search.lower().encode()
+
+        positions = []
+        start = self._ids_lower.find(needle)
+        while start != -1:
+            positions.append(start)
+            start = self._ids_lower.find(needle, start + 1)
+        if not positions:
+            return np.empty(0, dtype=np.int64)
+
+        offsets = self.columns["id_offsets"]
+        starts = np.asarray(positions, dtype=np.int64)
+        rows = np.searchsorted(offsets, starts, side="right") - 1
+        # Drop matches that straddle two adjacent ids
+        rows = rows[starts + len(needle) <= offsets[rows + 1]]
+        return np.unique(rows)
+
+    def list_models(
+        self,
+        search: str | None = None,
+        task: str | None = None,
+        limit: int | None = None,
+        tiers: Collection[str] | None = None,
+    ) -> list[ModelRecord]:
+        """
+        Query the snapshot the way ``HfApi.list_models`` is queried
+
+        Results are ordered by downloads, most downloaded first. ``tiers``
+        keeps only models of those thermal levels.
+        """
+        rows = self.match(search)
+
+        if task:
+            if task not in self.pipeline_tags:
+                return []
+            code = self.pipeline_tags.index(task)
+            rows = rows[self.columns["pipeline_tag"][rows] == code]
+        if tiers is not None:
+            rows = rows[self._in_tiers(rows, tiers)]
+
+        downloads = self.columns["downloads"][rows]
+        if limit is not None and limit < len(rows):
+            top = np.argpartition(-downloads, limit - 1)[:limit]
+            rows, downloads = rows[top], downloads[top]
+        rows = rows[np.argsort(-downloads, kind="stable")]
+
+        return [self.model(int(row)) for row in rows]
+
+    def search(
+        self,
+        query: str,
+        task: str | None = None,
+        limit: int | None = None,
+        tiers: Collection[str] | None = None,
+    ) -> list[ModelRecord]:
+        """
+        Full-text search, ranked by BM25 relevance blended with downloads
+
+        See ``thermal_scout.text_index`` for the query syntax. A query with no
+        term to look up (empty, ``*``, ``-``) falls back to ``list_models``:
+        ids containing it, wildcards removed, by downloads. ``tiers`` keeps
+        only models of those thermal levels, before the top ``limit`` are
+        picked.
+        """
+        if not has_terms(query):
+            return self.list_models(
+                _substring(query), task=task, limit=limit, tiers=tiers
+            )
+
+        rows, scores = self.text.match(query)
+
+        if task:
+            if task not in self.pipeline_tags:
+                return []
+            code = self.pipeline_tags.index(task)
+            keep = self.columns["pipeline_tag"][rows] == code
+            rows, scores = rows[keep], scores[keep]
+        if tiers is not None:
+            keep = self._in_tiers(rows, tiers)
+            rows, scores = rows[keep], scores[keep]
+
+        scores = scores + DOWNLOADS_WEIGHT * np.log1p(self.columns["downloads"][rows])
+        if limit is not None and limit < len(rows):
+            top = np.argpartition(-scores, limit - 1)[:limit]
+            rows, scores = rows[top], scores[top]
+        rows = rows[np.lexsort((rows, -scores))]
+
+        return [self.model(int(row)) for row in rows]
+
+    def ranked(
+        self,
+        query: str,
+        task: str | None = None,
+        tiers: Collection[str] | None = None,
+    ) -> np.ndarray:
+        """
+        Every row ``search`` can return for ``query``, in ``search`` order
+
+        Orders are kept for a few recent queries, so walking a long result
+        list page by page ranks it once and then slices it.
+        """
+        key = (query, task, None if tiers is None else tuple(sorted(tiers)))
+        return self._ranked.get_or_compute(
+            key, lambda: self._rank_all(query, task, tiers)
+        )
+
+    def _rank_all(
+        self, query: str, task: str | None, tiers: Collection[str] | None
+    ) -> np.ndarray:
+        downloads = self.columns["downloads"]
+        if has_terms(query):
+            rows, scores = self.text.match(query)
+            scores = scores + DOWNLOADS_WEIGHT * np.log1p(downloads[rows])
+        else:
+            rows = self.match(_substring(query))
+            scores = downloads[rows]
+
+        if task:
+            if task not in self.pipeline_tags:
+                return np.empty(0, dtype=np.int64)
+            code = self.pipeline_tags.index(task)
+            keep = self.columns["pipeline_tag"][rows] == code
+            rows, scores = rows[keep], scores[keep]
+        if tiers is not None:
+            keep = self._in_tiers(rows, tiers)
+            rows, scores = rows[keep], scores[keep]
+
+        return rows[np.lexsort((rows, -scores))]
+
+    def _in_tiers(self, rows: np.ndarray, tiers: Collection[str]) -> np.ndarray:
+        """Mask of ``rows`` whose thermal level is one of ``tiers``"""
+        codes = [THERMAL_LEVELS.index(level) for level in tiers]
+        return np.isin(self.columns["thermal"][rows], codes)
+
+
+def write_index(path: str | Path, models: Iterable[Mapping[str, Any]]) -> ModelIndex:
+    """
+    Write ``models`` (thermal_search-shaped records or dicts) as a new snapshot
+
+    Models without a ``thermal_cost`` are classified on the way in, from the
+    same feature columns that are stored for ``ModelIndex.rescore``.
+    """
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+
+    previous = None
+    if (path / "meta.json").exists():
+        previous = json.loads((path / "meta.json").read_text())
+    generation = previous["generation"] + 1 if previous else 1
+
+    vocabularies: dict[str, dict[str, int]] = {
+        "pipeline_tags": {},
+        "library_names": {},
+        "tags": {},
+    }
+
+    def code(vocabulary: str, value: str | None) -> int:
+        if value is None:
+            return -1
+        return vocabularies[vocabulary].setdefault(value, len(vocabularies[vocabulary]))
+
+    id_data = bytearray()
+    id_offsets = [0]
+    tag_codes: list[int] = []
+    tag_offsets = [0]
+    documents = []
+    features = []
+    given_thermal = []  # THERMAL_ORDER code, -1 to classify
+    values: dict[str, list[float]] = {
+        "downloads": [],
+        "likes": [],
+        "last_modified": [],
+        "pipeline_tag": [],
+        "library_name": [],
+    }
+
+    for model in models:
+        id_data += model["modelId"].encode()
+        id_offsets.append(len(id_data))
+        tag_codes.extend(code("tags", tag) for tag in model.get("tags") or [])
+        tag_offsets.append(len(tag_codes))
+        documents.append(document_terms(model["modelId"], model.get("tags") or []))
+
+        features.append(model_features(model))
+        given_thermal.append(THERMAL_ORDER.get(model.get("thermal_cost"), -1))
+        values["downloads"].append(model.get("downloads") or 0)
+        values["likes"].append(model.get("likes") or 0)
+        values["last_modified"].append(_posix(model.get("lastModified")))
+        values["pipeline_tag"].append(code("pipeline_tags", model.get("pipeline_tag")))
+        values["library_name"].append(code("library_names", model.get("library_name")))
+
+    size, param, count, flags, parameters = (
+        zip(*features, strict=True) if features else ((),) * 5
+    )
+    thermal_columns = {
+        "size_score": size,
+        "param_score": param,
+        "param_count": count,
+        "tag_flags": flags,
+        "parameters": parameters,
+    }
+    given = np.asarray(given_thermal, dtype=np.int64)
+    classified = thermal_levels(
+        ThermalFeatures(
+            **{
+                name: np.asarray(column, dtype=COLUMNS[name])
+                for name, column in thermal_columns.items()
+            }
+        )
+    )
+
+    arrays = {
+        "id_data": id_data,
+        "thermal": np.where(given >= 0, given, classified),
+        **thermal_columns,
+        "id_offsets": id_offsets,
+        "tag_offsets": tag_offsets,
+        "tag_codes": tag_codes,
+        **values,
+    }
+    for name, dtype in COLUMNS.items():
+        np.save(
+            path / f"{name}.{generation}.npy", np.asarray(arrays[name], dtype=dtype)
+        )
+    write_text_index(path, generation, documents)
+
+    meta = {
+        "format": INDEX_FORMAT,
+        "generation": generation,
+        "count": len(id_offsets) - 1,
+        **{name: list(vocabulary) for name, vocabulary in vocabularies.items()},
+    }
+    tmp = path / "meta.json.tmp"
+    tmp.write_text(json.dumps(meta))
+    tmp.replace(path / "meta.json")
+
+    # Readers that still map the old generation keep their open file handles
+    if previous:
+        for name in [*COLUMNS, *TEXT_COLUMNS]:
+            (path / f"{name}.{previous['generation']}.npy").unlink(missing_ok=True)
+
+    return ModelIndex(path)
+
+
+def _substring(query: str) -> str:
+    """The id substring a query without terms stands for; "*" matches all"""
+    return query.replace("*", "").strip()
+
+
+def _posix(value: str | None) -> float:
+    modified = parse_timestamp(value)
+    return np.nan if modified is None else modified
+
+
+_default_index: ModelIndex | None = None
+
+
+def load_default_index() -> ModelIndex | None:
+    """
+    Open the index at ``THERMAL_SCOUT_INDEX`` if one has been written
+
+    The open index is reused until a newer snapshot generation appears.
+    """
+    global _default_index
+
+    path = index_dir()
+    meta = path / "meta.json"
+    if not meta.exists():
+        return None
+
+    current = _default_index
+    if current is not None and current.path == path:
+        generation = json.loads(meta.read_text())["generation"]
+        if generation == current.generation:
+            return current
+
+    _default_index = ModelIndex(path)
+    return _default_index
@@ -0,0 +1,285 @@
+"""
+Per-stage timings and Prometheus metrics
+
+Searches are split into timed stages (``hub``, ``classify``, ``index``,
+``rank``, and ``serialize`` in the API). Each stage is observed
+into the ``thermal_scout_search_stage_seconds`` histogram, labelled with the
+stage, whether the search cache was hit, and the model type. Each stage is
+also added to the ``Timings`` of the request in progress, which the API
+returns as a ``Server-Timing`` header.
+
+Recording is lock-free. Every thread writes to its own shard of each
+histogram, so the hot path is a bisect and a few increments. ``render``
+merges the shards when ``/metrics`` is scraped. A lock is only taken the
+first time a thread or a label set is seen.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any
+
+# Upper bounds in seconds, from a local index lookup to a slow Hub scan
+DEFAULT_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+# Label sets kept per histogram; later ones are counted under "other"
+MAX_SERIES = 1000
+
+OTHER = "other"
+
+# Label value when a label does not apply
+NONE = "none"
+
+
+class Histogram:
+    """
+    A Prometheus histogram with per-thread shards
+
+    ``observe`` only touches the calling thread's shard. Shards are merged
+    when the histogram is rendered, so a scrape may miss observations that
+    are still being written, which Prometheus tolerates.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+        max_series: int = MAX_SERIES,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = tuple(sorted(buckets))
+        self.max_series = max_series
+        self._local = threading.local()
+        self._shards: list[dict[tuple[str, ...], list[float]]] = []
+        self._series: set[tuple[str, ...]] = set()
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        """Record ``value`` under ``labels`` (one per label name, in order)"""
+        try:
+            shard = self._local.shard
+        except AttributeError:
+            shard = self._new_shard()
+        series = shard.get(labels)
+        if series is None:
+            series = shard[labels] = self._new_series(labels, shard)
+        # Counts per bucket (the last is +Inf), then the sum
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def _new_shard(self) -> dict[tuple[str, ...], list[float]]:
+        shard: dict[tuple[str, ...], list[float]] = {}
+        self._local.shard = shard
+        with self._lock:
+            self._shards.append(shard)
+        return shard
+
+    def _new_series(
+        self, labels: tuple[str, ...], shard: dict[tuple[str, ...], list[float]]
+    ) -> list[float]:
+        if labels not in self._series:
+            with self._lock:
+                if labels not in self._series and len(self._series) >= self.max_series:
+                    # The shard keeps this label set as an alias of "other"
+                    labels = (OTHER,) * len(self.labelnames)
+                self._series.add(labels)
+        series = shard.get(labels)
+        if series is None:
+            series = shard[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        return series
+
+    def collect(self) -> dict[tuple[str, ...], list[float]]:
+        """Bucket counts and sum per label set, merged across threads"""
+        with self._lock:
+            shards = list(self._shards)
+            known = set(self._series)
+        merged: dict[tuple[str, ...], list[float]] = {}
+        for shard in shards:
+            for labels, series in list(shard.items()):
+                if labels not in known:
+                    continue  # an alias, counted under "other"
+                total = merged.setdefault(labels, [0] * len(series))
+                for i, value in enumerate(series):
+                    total[i] += value
+        return merged
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} histogram"
+        for labels, series in sorted(self.collect().items()):
+            pairs = list(zip(self.labelnames, labels, strict=True))
+            cumulative = 0
+            bounds = [*map(_format_value, self.buckets), "+Inf"]
+            for bound, count in zip(bounds, series, strict=False):
+                cumulative += count
+                yield f"{self.name}_bucket{_labels([*pairs, ('le', bound)])} {cumulative}"
+            yield f"{self.name}_sum{_labels(pairs)} {_format_value(series[-1])}"
+            yield f"{self.name}_count{_labels(pairs)} {cumulative}"
+
+    def clear(self) -> None:
+        with self._lock:
+            for shard in self._shards:
+                shard.clear()
+            self._series.clear()
+
+
+class Registry:
+    """Histograms plus callbacks producing extra samples at scrape time"""
+
+    def __init__(self):
+        self.histograms: list[Histogram] = []
+        self.collectors: list[Callable[[], Iterable[str]]] = []
+
+    def histogram(self, *args: Any, **kwargs: Any) -> Histogram:
+        histogram = Histogram(*args, **kwargs)
+        self.histograms.append(histogram)
+        return histogram
+
+    def render(self) -> str:
+        """Every metric in the Prometheus text exposition format (0.0.4)"""
+        lines = [line for h in self.histograms for line in h.render()]
+        for collector in self.collectors:
+            lines.extend(collector())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+search_seconds = REGISTRY.histogram(
+    "thermal_scout_search_seconds",
+    "Time to answer a search, from the cache or the source",
+    ("cache", "model_type"),
+)
+
+stage_seconds = REGISTRY.histogram(
+    "thermal_scout_search_stage_seconds",
+    "Time spent in each stage of a search",
+    ("stage", "cache", "model_type"),
+)
+
+request_seconds = REGISTRY.histogram(
+    "thermal_scout_http_request_duration_seconds",
+    "Time to produce an API response, until its headers are sent",
+    ("method", "route", "status"),
+)
+
+
+class Timings:
+    """
+    Stage durations of one request or search, in seconds
+
+    Stages are recorded under ``cache`` ("hit", "miss" or "bypass") and
+    ``model_type``, which a search sets as it learns them; both are "none"
+    outside a search.
+    """
+
+    def __init__(self):
+        self.stages: dict[str, float] = {}
+        self.cache = NONE
+        self.model_type = NONE
+        self.started = time.perf_counter()
+
+    def add(self, name: str, seconds: float) -> None:
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+        stage_seconds.observe(seconds, name, self.cache, self.model_type)
+
+    def server_timing(self, total: float | None = None) -> str:
+        """The stages as a ``Server-Timing`` header value, in milliseconds"""
+        metrics = [
+            f"{name};dur={seconds * 1e3:.2f}" for name, seconds in self.stages.items()
+        ]
+        if self.cache != NONE:
+            metrics.append(f'cache;desc="{self.cache}"')
+        if total is not None:
+            metrics.append(f"total;dur={total * 1e3:.2f}")
+        return ", ".join(metrics)
+
+
+_timings: ContextVar[Timings | None] = ContextVar("thermal_scout_timings", default=None)
+
+
+def current_timings() -> Timings | None:
+    return _timings.get()
+
+
+@contextmanager
+def request_timings(fresh: bool = False) -> Iterator[Timings]:
+    """
+    The ``Timings`` in progress, or a new one for the duration of the block
+
+    ``fresh`` always starts a new one, for one of several concurrent
+    searches that would otherwise relabel each other's stages.
+    """
+    timings = _timings.get()
+    if timings is not None and not fresh:
+        yield timings
+        return
+    timings = Timings()
+    token = _timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _timings.reset(token)
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Time the block as stage ``name`` of the search in progress"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        timings = _timings.get()
+        if timings is not None:
+            timings.add(name, elapsed)
+        else:
+            stage_seconds.observe(elapsed, name, NONE, NONE)
+
+
+def sample(
+    name: str, documentation: str, value: float, kind: str = "gauge"
+) -> list[str]:
+    """The exposition lines of a single unlabelled sample, for collectors"""
+    return [
+        f"# HELP {name} {documentation}",
+        f"# TYPE {name} {kind}",
+        f"{name} {_format_value(value)}",
+    ]
+
+
+def _labels(pairs: Iterable[tuple[str, str]]) -> str:
+    pairs = list(pairs)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value))
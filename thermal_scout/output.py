@@ -0,0 +1,162 @@
+"""
+Machine-readable output of search results
+
+Every format writes pages of results as they arrive, straight to a stream
+and without rich, so ``search --all`` output can be piped into other tools
+while the listing is still running:
+
+- ``jsonl``: one JSON object per model, with every field of the result
+- ``csv``: a header and one row per model, with the ``COLUMNS``
+- ``arrow``: an Arrow IPC stream, one record batch per page, that pandas,
+  polars and pyarrow read without parsing (needs the ``arrow`` extra)
+
+Only the standard library is imported up front; pyarrow is imported when an
+Arrow writer is opened.
+"""
+
+import csv
+import json
+from collections.abc import Mapping
+from enum import StrEnum
+from typing import Any, BinaryIO, Protocol, TextIO
+
+
+class OutputFormat(StrEnum):
+    table = "table"
+    jsonl = "jsonl"
+    csv = "csv"
+    arrow = "arrow"
+
+
+# Fields written by the tabular formats, in order
+COLUMNS = [
+    "modelId",
+    "thermal_cost",
+    "downloads",
+    "likes",
+    "pipeline_tag",
+    "library_name",
+    "parameters",
+    "tags",
+    "lastModified",
+]
+
+_TAGS = COLUMNS.index("tags")
+
+
+class ResultWriter(Protocol):
+    def write(self, models: list[Mapping[str, Any]]) -> None: ...
+
+    def close(self) -> None: ...
+
+
+class JsonLinesWriter:
+    def __init__(self, stream: TextIO):
+        self.stream = stream
+
+    def write(self, models: list[Mapping[str, Any]]) -> None:
+        # One write per page rather than per model
+        self.stream.write("".join(json.dumps(dict(model)) + "\n" for model in models))
+        self.stream.flush()
+
+    def close(self) -> None:
+        self.stream.flush()
+
+
+class CsvWriter:
+    """Tags are joined with commas into a single (quoted) cell"""
+
+    def __init__(self, stream: TextIO):
+        self.stream = stream
+        self._writer = csv.writer(stream, lineterminator="\n")
+        self._writer.writerow(COLUMNS)
+
+    def write(self, models: list[Mapping[str, Any]]) -> None:
+        rows = []
+        for model in models:
+            row = list(_row(model))
+            row[_TAGS] = ",".join(row[_TAGS])
+            rows.append(row)
+        self._writer.writerows(rows)
+        self.stream.flush()
+
+    def close(self) -> None:
+        self.stream.flush()
+
+
+class ArrowWriter:
+    """An Arrow IPC stream with one record batch per page"""
+
+    def __init__(self, stream: BinaryIO):
+        import pyarrow as pa
+
+        self._pa = pa
+        self.stream = stream
+        self.schema = pa.schema(
+            [
+                ("modelId", pa.string()),
+                ("thermal_cost", pa.string()),
+                ("downloads", pa.int64()),
+                ("likes", pa.int64()),
+                ("pipeline_tag", pa.string()),
+                ("library_name", pa.string()),
+                ("parameters", pa.int64()),
+                ("tags", pa.list_(pa.string())),
+                ("lastModified", pa.string()),
+            ]
+        )
+        self._writer = pa.ipc.new_stream(stream, self.schema)
+
+    def write(self, models: list[Mapping[str, Any]]) -> None:
+        if not models:
+            return
+        columns = list(zip(*map(_row, models), strict=True))
+        batch = self._pa.RecordBatch.from_arrays(
+            [
+                self._pa.array(column, type=field.type)
+                for column, field in zip(columns, self.schema, strict=True)
+            ],
+            schema=self.schema,
+        )
+        self._writer.write_batch(batch)
+        self.stream.flush()
+
+    def close(self) -> None:
+        self._writer.close()
+        self.stream.flush()
+
+
+def open_writer(
+    output_format: OutputFormat, text: TextIO, binary: BinaryIO
+) -> ResultWriter:
+    """
+    A writer of ``output_format`` (not ``table``) to ``text`` or ``binary``
+
+    Raises ImportError, with the install hint, for Arrow without pyarrow.
+    """
+    if output_format == OutputFormat.jsonl:
+        return JsonLinesWriter(text)
+    if output_format == OutputFormat.csv:
+        return CsvWriter(text)
+    if output_format == OutputFormat.arrow:
+        try:
+            return ArrowWriter(binary)
+        except ImportError as e:
+            raise ImportError(
+                "Arrow output needs pyarrow: pip install 'thermal-scout[arrow]'"
+            ) from e
+    raise ValueError(f"No writer for {output_format.value!r} output")
+
+
+def _row(model: Mapping[str, Any]) -> tuple:
+    return (
+        model["modelId"],
+        model.get("thermal_cost", "Unknown"),
+        model.get("downloads") or 0,
+        model.get("likes") or 0,
+        model.get("pipeline_tag"),
+        model.get("library_name"),
+        model.get("parameters"),
+        list(model.get("tags") or []),
+        model.get("lastModified"),
+    )
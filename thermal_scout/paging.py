@@ -0,0 +1,199 @@
+"""
+Cursor pagination over search results
+
+A search is walked page by page with opaque cursors, like Solr's
+``cursorMark``: the first page is requested with ``FIRST_PAGE`` ("*") and
+each page returns the cursor of the next one, or ``None`` after the last.
+Pages keep the source order (relevance for the local index, downloads for
+the Hub) so they stay stable while a caller walks them.
+
+A local index cursor records the snapshot generation and an offset into the
+query's ranked rows, which the index keeps for recent queries. A Hub cursor
+carries the Hub's own continuation from the listing's Link header. Either
+way a page costs one page of work, and earlier pages are never fetched again.
+
+Thermal filters are applied per page: index pages skip filtered-out rows, so
+they stay full, while a Hub page may hold fewer than ``limit`` matches (or
+none) and still carry a cursor to the rest of the listing.
+"""
+
+import base64
+import binascii
+import json
+from collections.abc import AsyncIterator, Collection
+from dataclasses import dataclass
+from typing import Any
+
+from .hub import AsyncHubClient, get_async_client
+from .index import ModelIndex, load_default_index
+from .records import ModelRecord
+from .search import HUB_EXPAND, classify_listing, in_tiers, search_cache
+
+FIRST_PAGE = "*"
+
+# Results per page when walking a whole result list
+PAGE_SIZE = 100
+
+
+class InvalidCursor(ValueError):
+    """A cursor that is malformed, stale or from a different search"""
+
+
+@dataclass(frozen=True)
+class SearchPage:
+    models: list[ModelRecord]
+    next_cursor: str | None  # None once the results are exhausted
+
+
+def encode_cursor(state: dict[str, Any]) -> str:
+    data = json.dumps(state, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dict[str, Any]:
+    try:
+        data = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        state = json.loads(data)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise InvalidCursor("Malformed cursor") from e
+    if not isinstance(state, dict):
+        raise InvalidCursor("Malformed cursor")
+    return state
+
+
+async def async_search_page(
+    query: str,
+    limit: int = 10,
+    model_type: str | None = None,
+    cursor: str = FIRST_PAGE,
+    index: ModelIndex | None = None,
+    client: AsyncHubClient | None = None,
+    tiers: Collection[str] | None = None,
+) -> SearchPage:
+    """
+    The page of ``query`` results at ``cursor``
+
+    The cursor must come from the same query, model type and ``tiers``
+    (see ``thermal.thermal_tiers``), and a local
+    index cursor from the same snapshot generation; otherwise
+    ``InvalidCursor`` is raised. Hub errors are raised too, so a failed page
+    is never mistaken for the end of the results. Pages are kept in
+    ``search_cache``.
+    """
+    if index is None:
+        index = load_default_index()
+
+    state = None
+    if cursor != FIRST_PAGE:
+        state = decode_cursor(cursor)
+        if (
+            state.get("q") != query
+            or state.get("type") != model_type
+            or state.get("tiers") != _tiers_state(tiers)
+        ):
+            raise InvalidCursor("Cursor belongs to a different search")
+
+    if index is not None:
+        return _index_page(index, query, limit, model_type, tiers, state)
+
+    tiers_key = None if tiers is None else frozenset(tiers)
+    key = ("page", query, limit, model_type, tiers_key, cursor)
+    return await search_cache.aget_or_compute(
+        key, lambda: _hub_page(client, query, limit, model_type, tiers, state)
+    )
+
+
+def _tiers_state(tiers: Collection[str] | None) -> list[str] | None:
+    return None if tiers is None else sorted(tiers)
+
+
+def _cursor(
+    query: str, model_type: str | None, tiers: Collection[str] | None, **state: Any
+) -> str:
+    return encode_cursor(
+        {"q": query, "type": model_type, "tiers": _tiers_state(tiers), **state}
+    )
+
+
+def _index_page(
+    index: ModelIndex,
+    query: str,
+    limit: int,
+    model_type: str | None,
+    tiers: Collection[str] | None,
+    state: dict[str, Any] | None,
+) -> SearchPage:
+    offset = 0
+    if state is not None:
+        offset = state.get("offset")
+        if not isinstance(offset, int) or offset < 0:
+            raise InvalidCursor("Cursor is not an index cursor")
+        if state.get("gen") != index.generation:
+            raise InvalidCursor("Cursor is from another index snapshot")
+
+    rows = index.ranked(query, model_type, tiers)
+    page = rows[offset : offset + limit]
+    end = offset + len(page)
+    next_cursor = None
+    if end < len(rows):
+        next_cursor = _cursor(
+            query, model_type, tiers, gen=index.generation, offset=end
+        )
+    return SearchPage([index.model(int(row)) for row in page], next_cursor)
+
+
+async def _hub_page(
+    client: AsyncHubClient | None,
+    query: str,
+    limit: int,
+    model_type: str | None,
+    tiers: Collection[str] | None,
+    state: dict[str, Any] | None,
+) -> SearchPage:
+    next_query = None
+    if state is not None:
+        next_query = state.get("hub")
+        if not isinstance(next_query, str):
+            raise InvalidCursor("Cursor is not a Hub cursor")
+
+    client = client if client is not None else get_async_client()
+    models, next_query = await client.list_models_page(
+        next_query,
+        search=query,
+        task=model_type,
+        sort="downloads",
+        direction=-1,
+        limit=limit,
+        expand=HUB_EXPAND,
+    )
+    page = classify_listing(models)
+
+    next_cursor = None
+    if next_query is not None:
+        next_cursor = _cursor(query, model_type, tiers, hub=next_query)
+    return SearchPage(in_tiers(page, tiers), next_cursor)
+
+
+async def async_iter_search(
+    query: str,
+    model_type: str | None = None,
+    page_size: int = PAGE_SIZE,
+    index: ModelIndex | None = None,
+    client: AsyncHubClient | None = None,
+    tiers: Collection[str] | None = None,
+) -> AsyncIterator[list[ModelRecord]]:
+    """Every result of ``query``, one page at a time, following cursors"""
+    cursor: str | None = FIRST_PAGE
+    while cursor is not None:
+        page = await async_search_page(
+            query,
+            page_size,
+            model_type,
+            cursor,
+            index=index,
+            client=client,
+            tiers=tiers,
+        )
+        if page.models:
+            yield page.models
+        cursor = page.next_cursor
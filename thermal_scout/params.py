@@ -0,0 +1,194 @@
+"""
+Exact parameter counts from safetensors metadata
+
+The Hub reports ``safetensors.total`` for models stored as safetensors, in
+listings that expand it and in ``model_info``. Searches expand it, so their
+counts arrive with the listing and nothing is looked up or stored.
+
+For listings without it, ``resolve_parameters`` fetches counts with
+``model_info``. A count only changes with a new revision, so fetched counts
+are kept in a persistent key-value store keyed by model id and commit sha,
+and each revision is fetched at most once.
+"""
+
+import asyncio
+import sqlite3
+import threading
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+from .config import cache_dir
+
+CACHE_FILE = "parameters.sqlite"
+
+# Concurrent model_info lookups for revisions missing from the cache
+MAX_FETCH_WORKERS = 8
+
+_MISSING = object()
+
+
+class ParameterCache:
+    """
+    Persistent (model id, sha) -> parameter count store
+
+    A stored ``None`` records that the revision has no safetensors metadata,
+    so it is not fetched again either.
+    """
+
+    def __init__(self, path: str | Path | None = None):
+        self.path = Path(path) if path is not None else cache_dir() / CACHE_FILE
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS parameters ("
+            " model_id TEXT NOT NULL, sha TEXT NOT NULL, total INTEGER,"
+            " PRIMARY KEY (model_id, sha))"
+        )
+        self._db.commit()
+
+    def get(self, model_id: str, sha: str, default: Any = None) -> Any:
+        """Stored count (possibly ``None``), or ``default`` if never stored"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT total FROM parameters WHERE model_id = ? AND sha = ?",
+                (model_id, sha),
+            ).fetchone()
+        return default if row is None else row[0]
+
+    def put_many(self, entries: Iterable[tuple[str, str, int | None]]) -> None:
+        """Store (model id, sha, count) triples; older revisions are dropped"""
+        entries = list(entries)
+        if not entries:
+            return
+        with self._lock, self._db:
+            self._db.executemany(
+                "DELETE FROM parameters WHERE model_id = ? AND sha != ?",
+                [(model_id, sha) for model_id, sha, _ in entries],
+            )
+            self._db.executemany(
+                "INSERT OR REPLACE INTO parameters VALUES (?, ?, ?)", entries
+            )
+
+    def put(self, model_id: str, sha: str, total: int | None) -> None:
+        self.put_many([(model_id, sha, total)])
+
+    def close(self) -> None:
+        self._db.close()
+
+
+def safetensors_total(model: Any) -> int | None:
+    """``safetensors.total`` of a ModelInfo, if it carries one"""
+    total = getattr(getattr(model, "safetensors", None), "total", None)
+    return total if isinstance(total, int) and total > 0 else None
+
+
+def resolve_parameters(
+    api: Any, models: list[Any], cache: ParameterCache | None = None
+) -> list[int | None]:
+    """
+    Exact parameter count of each listed model, ``None`` where unknown
+
+    Counts already in the listing are used as they are. Otherwise the cache
+    answers for revisions seen before, and the rest are fetched with
+    ``model_info(expand=["safetensors"])`` in parallel. Models without a sha
+    cannot be keyed and are left unknown.
+    """
+    cache = cache if cache is not None else default_cache()
+    totals, missing = _from_listing(models, cache)
+    learned: list[tuple[str, str, int | None]] = []
+
+    def fetch(i: int) -> int | None:
+        model = models[i]
+        info = api.model_info(model.id, revision=model.sha, expand=["safetensors"])
+        return safetensors_total(info)
+
+    if missing:
+        workers = min(MAX_FETCH_WORKERS, len(missing))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {i: pool.submit(fetch, i) for i in missing}
+        for i, future in futures.items():
+            try:
+                totals[i] = future.result()
+            except Exception:
+                # Not cached, so the next call tries again
+                continue
+            learned.append((models[i].id, models[i].sha, totals[i]))
+
+    cache.put_many(learned)
+    return totals
+
+
+async def async_resolve_parameters(
+    client: Any, models: list[Any], cache: ParameterCache | None = None
+) -> list[int | None]:
+    """``resolve_parameters`` with an ``AsyncHubClient``"""
+    cache = cache if cache is not None else default_cache()
+    totals, missing = _from_listing(models, cache)
+    learned: list[tuple[str, str, int | None]] = []
+
+    semaphore = asyncio.Semaphore(MAX_FETCH_WORKERS)
+
+    async def fetch(i: int) -> int | None:
+        model = models[i]
+        async with semaphore:
+            info = await client.model_info(
+                model.id, revision=model.sha, expand=["safetensors"]
+            )
+        return safetensors_total(info)
+
+    fetched = await asyncio.gather(*(fetch(i) for i in missing), return_exceptions=True)
+    for i, total in zip(missing, fetched, strict=True):
+        if isinstance(total, Exception):
+            # Not cached, so the next call tries again
+            continue
+        totals[i] = total
+        learned.append((models[i].id, models[i].sha, total))
+
+    cache.put_many(learned)
+    return totals
+
+
+def _from_listing(
+    models: list[Any], cache: ParameterCache
+) -> tuple[list[int | None], list[int]]:
+    """
+    Counts known without fetching, and rows to fetch
+
+    Listed counts are not stored: the listing that supplied them will again.
+    """
+    totals: list[int | None] = [None] * len(models)
+    missing: list[int] = []
+
+    for i, model in enumerate(models):
+        sha = getattr(model, "sha", None)
+        total = safetensors_total(model)
+        if total is not None or not isinstance(sha, str):
+            totals[i] = total
+        else:
+            cached = cache.get(model.id, sha, _MISSING)
+            if cached is _MISSING:
+                missing.append(i)
+            else:
+                totals[i] = cached
+
+    return totals, missing
+
+
+_default_cache: ParameterCache | None = None
+_default_cache_lock = threading.Lock()
+
+
+def default_cache() -> ParameterCache:
+    """Process-wide cache under ``cache_dir()``, reopened if that moves"""
+    global _default_cache
+
+    path = cache_dir() / CACHE_FILE
+    with _default_cache_lock:
+        if _default_cache is None or _default_cache.path != path:
+            if _default_cache is not None:
+                _default_cache.close()
+            _default_cache = ParameterCache(path)
+        return _default_cache
@@ -0,0 +1,211 @@
+"""
+Composable ranking of search results
+
+A sort order is a comma-separated list of keys compared in turn, like SQL's
+``ORDER BY``: ``thermal,downloads`` puts the coolest models first and the
+most downloaded first within a thermal level. A key is a sum of terms, each a
+product of scorers and numeric weights, so ``thermal,likes*recency`` ranks
+cool models by likes discounted by age. A leading ``-`` reverses a key.
+
+Every scorer maps a result to a number, higher is better:
+
+- ``thermal``: 0 for Low, -1 for Medium, -2 for High
+- ``downloads`` / ``likes``: the raw counts
+- ``recency``: 1 for a model modified now, halving every
+  ``RECENCY_HALF_LIFE_DAYS``; 0 when the date is unknown
+- ``relevance``: field-weighted count of query terms in the id and tags
+
+``top_k`` keeps the best ``k`` results with a bounded heap, so ranking ``n``
+results costs O(n log k) instead of a full sort.
+"""
+
+import heapq
+import math
+import re
+import time
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass
+from typing import Any
+
+from .records import ModelRecord, parse_timestamp
+from .text_index import ID_WEIGHT, TAG_WEIGHT, tokenize
+from .thermal import THERMAL_ORDER
+
+Scorer = Callable[[Mapping[str, Any]], float]
+
+# Builds a scorer for one ranking from its query and clock
+ScorerFactory = Callable[["RankContext"], Scorer]
+
+# The order thermal-aware searches have always used
+DEFAULT_SORT = "thermal,downloads"
+
+RECENCY_HALF_LIFE_DAYS = 180
+
+_NUMBER = re.compile(r"\d+(\.\d*)?|\.\d+")
+
+
+@dataclass(frozen=True)
+class RankContext:
+    query: str
+    now: float  # POSIX timestamp the ranking measures age from
+
+
+SCORERS: dict[str, ScorerFactory] = {}
+
+
+def register_scorer(name: str) -> Callable[[ScorerFactory], ScorerFactory]:
+    """Make a scorer factory available to sort orders under ``name``"""
+
+    def register(factory: ScorerFactory) -> ScorerFactory:
+        SCORERS[name] = factory
+        return factory
+
+    return register
+
+
+@register_scorer("thermal")
+def _thermal(_context: RankContext) -> Scorer:
+    # Like the original sort, a missing cost counts as High and an unknown
+    # one as hotter still
+    order = THERMAL_ORDER
+    return lambda model: -order.get(model.get("thermal_cost", "High"), 3)
+
+
+@register_scorer("downloads")
+def _downloads(_context: RankContext) -> Scorer:
+    return lambda model: model.get("downloads") or 0
+
+
+@register_scorer("likes")
+def _likes(_context: RankContext) -> Scorer:
+    return lambda model: model.get("likes") or 0
+
+
+@register_scorer("recency")
+def _recency(context: RankContext) -> Scorer:
+    half_life = RECENCY_HALF_LIFE_DAYS * 86400
+
+    def recency(model: Mapping[str, Any]) -> float:
+        if type(model) is ModelRecord:
+            modified = model.modified  # skips formatting and parsing the date
+        else:
+            modified = parse_timestamp(model.get("lastModified"))
+        if modified is None:
+            return 0.0
+        age = max(0.0, context.now - modified)
+        return 0.5 ** (age / half_life)
+
+    return recency
+
+
+@register_scorer("relevance")
+def _relevance(context: RankContext) -> Scorer:
+    terms = frozenset(tokenize(context.query))
+    tag_scores: dict[str, int] = {}  # tags repeat across models
+
+    def matches(text: str) -> int:
+        # Tokens are substrings of the lowercased text, so most texts are
+        # ruled out without being tokenized
+        lowered = text.lower()
+        if not any(term in lowered for term in terms):
+            return 0
+        return sum(token in terms for token in tokenize(text))
+
+    def relevance(model: Mapping[str, Any]) -> float:
+        # Same as summing document_terms() over the query terms
+        score = ID_WEIGHT * matches(model["modelId"])
+        for tag in model.get("tags") or []:
+            tag_score = tag_scores.get(tag)
+            if tag_score is None:
+                tag_score = tag_scores[tag] = TAG_WEIGHT * matches(tag)
+            score += tag_score
+        return score
+
+    return relevance
+
+
+@dataclass(frozen=True)
+class Ranking:
+    """A parsed sort order; ``key`` is larger for better results"""
+
+    sort: str
+    key: Callable[[Mapping[str, Any]], Any]
+
+    def top_k(
+        self, models: Iterable[Mapping[str, Any]], k: int
+    ) -> list[Mapping[str, Any]]:
+        return top_k(models, k, self.key)
+
+
+def parse_sort(
+    sort: str = DEFAULT_SORT, query: str = "", now: float | None = None
+) -> Ranking:
+    """
+    The ``Ranking`` for a sort order such as ``"thermal,likes*recency"``
+
+    ``query`` feeds the ``relevance`` scorer and ``now`` (default: the
+    current time) the ``recency`` one. Raises ValueError for an unknown
+    scorer or a malformed order.
+    """
+    context = RankContext(query=query, now=time.time() if now is None else now)
+    keys = [_parse_key(key, context) for key in sort.split(",")]
+    if len(keys) == 1:
+        return Ranking(sort, keys[0])
+    if len(keys) == 2:
+        first, second = keys
+        return Ranking(sort, lambda model: (first(model), second(model)))
+    return Ranking(sort, lambda model: tuple([key(model) for key in keys]))
+
+
+def top_k(
+    models: Iterable[Mapping[str, Any]], k: int, key: Callable[[Mapping[str, Any]], Any]
+) -> list[Mapping[str, Any]]:
+    """
+    The ``k`` models with the largest ``key``, best first
+
+    Ties keep their input order, as with a stable ``sorted``.
+    """
+    return heapq.nlargest(k, models, key=key)
+
+
+def _parse_key(key: str, context: RankContext) -> Scorer:
+    key = key.strip()
+    sign = 1
+    if key.startswith("-"):
+        sign, key = -1, key[1:]
+    terms = [_parse_term(term, context) for term in key.split("+")]
+
+    if len(terms) == 1:
+        term = terms[0]
+        return term if sign == 1 else lambda model: -term(model)
+    if len(terms) == 2:
+        first, second = terms
+        return lambda model: sign * (first(model) + second(model))
+    return lambda model: sign * sum([term(model) for term in terms])
+
+
+def _parse_term(term: str, context: RankContext) -> Scorer:
+    weight = 1.0
+    scorers = []
+    for factor in term.split("*"):
+        factor = factor.strip()
+        if _NUMBER.fullmatch(factor):
+            weight *= float(factor)
+        elif factor in SCORERS:
+            scorers.append(SCORERS[factor](context))
+        else:
+            raise ValueError(
+                f"Unknown sort key {factor!r}, expected one of "
+                f"{', '.join(SCORERS)} or a number"
+            )
+    if not scorers:
+        raise ValueError(f"Sort term {term.strip()!r} has no scorer")
+
+    # Keys run once per result, so common shapes avoid a generic loop
+    if len(scorers) == 1:
+        scorer = scorers[0]
+        return scorer if weight == 1.0 else lambda model: weight * scorer(model)
+    if len(scorers) == 2:
+        first, second = scorers
+        return lambda model: weight * first(model) * second(model)
+    return lambda model: weight * math.prod([scorer(model) for scorer in scorers])
@@ -0,0 +1,262 @@
+"""
+Compact search result records
+
+Search results are held in bulk by the search and details caches, cursor
+pages and batch jobs. As dicts, each one carried nine keys, a list of tag
+strings parsed separately for every model, a ``thermal_cost`` string and an
+ISO timestamp. ``ModelRecord`` keeps its id and its pipeline tag and library
+name (interned, so equal names are one string) in ``__slots__``, and packs
+everything else into a single ``bytes``:
+
+- counts, the parameter count and ``lastModified`` as a POSIX timestamp
+- the thermal level as a ``ThermalTier``
+- tags as ids into a ``TagVocabulary`` the record refers to
+
+Packed fields are unpacked when they are read. Records from the Hub share
+the vocabulary ``shared_tags`` returns until it holds ``VOCABULARY_SIZE``
+tags, when a new one is started; an index's rows use one of the index's
+tags. A vocabulary is freed with the last record referring to it, so
+high-cardinality tags (``base_model:*``, ``arxiv:*``) age out with the
+cached results that carry them.
+
+A record is a read-only ``Mapping`` with the keys and values of those dicts,
+so ``record["modelId"]``, ``record.get("tags")``, ``dict(record)`` and
+comparisons with dicts work unchanged. Pass ``dict(record)`` to
+``json.dumps``.
+"""
+
+import math
+import struct
+import sys
+import threading
+from array import array
+from collections.abc import Iterable, Iterator, Mapping
+from datetime import UTC, datetime
+from typing import Any
+
+from .thermal import THERMAL_LEVELS, THERMAL_TIERS, ThermalTier
+
+# Keys of a record, in the order search results have always had
+KEYS = (
+    "modelId",
+    "downloads",
+    "likes",
+    "tags",
+    "pipeline_tag",
+    "library_name",
+    "parameters",
+    "lastModified",
+    "thermal_cost",
+)
+_KEYS = frozenset(KEYS)
+
+# Type code of packed tag ids
+TAG_ID_TYPE = "I"
+
+# Tags a shared vocabulary takes before records move on to a new one
+VOCABULARY_SIZE = 1 << 16
+
+_NO_TAGS = b""
+
+# Numeric fields packed at the start of a record's data, ahead of its tag ids:
+# downloads, likes, parameters (0 if unknown), lastModified (NaN if unknown)
+# and thermal tier, as in the columns of the local index
+_NUMBERS = struct.Struct("=qqqdB")
+_COUNT = struct.Struct("=q")
+_TIMESTAMP = struct.Struct("=d")
+_DOWNLOADS, _LIKES, _PARAMETERS, _MODIFIED, _TIER = 0, 8, 16, 24, 32
+
+_TIERS = tuple(ThermalTier)
+
+
+class TagVocabulary:
+    """
+    Tag names interned as small ints
+
+    Ids are never reused or removed, so packed ids stay valid for as long as
+    the vocabulary lives. ``names`` are numbered in order.
+    """
+
+    def __init__(self, names: Iterable[str] = ()):
+        self.names: list[str] = list(names)
+        self._ids: dict[str, int] = {name: i for i, name in enumerate(self.names)}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def id(self, name: str) -> int:
+        tag_id = self._ids.get(name)
+        if tag_id is None:
+            with self._lock:
+                tag_id = self._ids.get(name)
+                if tag_id is None:
+                    tag_id = len(self.names)
+                    # Named before the id is published, so decode() never misses
+                    self.names.append(name)
+                    self._ids[name] = tag_id
+        return tag_id
+
+    def encode(self, tags: Iterable[str]) -> bytes:
+        """``tags`` as packed ids"""
+        return array(TAG_ID_TYPE, map(self.id, tags)).tobytes() or _NO_TAGS
+
+    def decode(self, data: bytes | memoryview) -> list[str]:
+        names = self.names
+        return [names[tag_id] for tag_id in memoryview(data).cast(TAG_ID_TYPE)]
+
+
+_shared = TagVocabulary()
+_shared_lock = threading.Lock()
+
+
+def shared_tags() -> TagVocabulary:
+    """The vocabulary new records from the Hub encode their tags with"""
+    global _shared
+    if len(_shared) >= VOCABULARY_SIZE:
+        with _shared_lock:
+            if len(_shared) >= VOCABULARY_SIZE:
+                _shared = TagVocabulary()
+    return _shared
+
+
+class ModelRecord(Mapping[str, Any]):
+    """One search result; see the module docstring"""
+
+    __slots__ = ("_data", "_vocabulary", "library_name", "modelId", "pipeline_tag")
+
+    def __init__(
+        self,
+        modelId: str,
+        downloads: int = 0,
+        likes: int = 0,
+        tags: bytes = _NO_TAGS,
+        pipeline_tag: str | None = None,
+        library_name: str | None = None,
+        parameters: int | None = None,
+        modified: float | None = None,
+        tier: ThermalTier = ThermalTier.HIGH,
+        vocabulary: TagVocabulary | None = None,
+    ):
+        """
+        A record from stored values: ``tags`` packed by ``vocabulary.encode``
+        (default: ``shared_tags()``) and ``modified`` a POSIX timestamp.
+        ``from_mapping`` takes result fields.
+        """
+        self.modelId = modelId
+        self._vocabulary = shared_tags() if vocabulary is None else vocabulary
+        self.pipeline_tag = _intern(pipeline_tag)
+        self.library_name = _intern(library_name)
+        self._data = (
+            _NUMBERS.pack(
+                downloads,
+                likes,
+                parameters or 0,
+                math.nan if modified is None else modified,
+                tier,
+            )
+            + tags
+        )
+
+    @classmethod
+    def from_mapping(
+        cls, model: Mapping[str, Any], thermal_cost: str | None = None
+    ) -> "ModelRecord":
+        """
+        The record of a result dict, classified as ``thermal_cost`` if given
+
+        Raises KeyError without a ``modelId``, or without a ``thermal_cost``
+        when none is given.
+        """
+        if isinstance(model, ModelRecord) and thermal_cost is None:
+            return model
+        vocabulary = shared_tags()
+        return cls(
+            model["modelId"],
+            model.get("downloads") or 0,
+            model.get("likes") or 0,
+            vocabulary.encode(model.get("tags") or ()),
+            model.get("pipeline_tag"),
+            model.get("library_name"),
+            model.get("parameters"),
+            parse_timestamp(model.get("lastModified")),
+            THERMAL_TIERS[thermal_cost or model["thermal_cost"]],
+            vocabulary,
+        )
+
+    @property
+    def downloads(self) -> int:
+        return _COUNT.unpack_from(self._data, _DOWNLOADS)[0]
+
+    @property
+    def likes(self) -> int:
+        return _COUNT.unpack_from(self._data, _LIKES)[0]
+
+    @property
+    def parameters(self) -> int | None:
+        return _COUNT.unpack_from(self._data, _PARAMETERS)[0] or None
+
+    @property
+    def modified(self) -> float | None:
+        """``lastModified`` as a POSIX timestamp"""
+        modified = _TIMESTAMP.unpack_from(self._data, _MODIFIED)[0]
+        return None if math.isnan(modified) else modified
+
+    @property
+    def tier(self) -> ThermalTier:
+        return _TIERS[self._data[_TIER]]
+
+    @property
+    def tags(self) -> list[str]:
+        return self._vocabulary.decode(memoryview(self._data)[_NUMBERS.size :])
+
+    @property
+    def thermal_cost(self) -> str:
+        return THERMAL_LEVELS[self._data[_TIER]]
+
+    @property
+    def lastModified(self) -> str | None:
+        modified = self.modified
+        return None if modified is None else format_timestamp(modified)
+
+    def __getitem__(self, key: str) -> Any:
+        if key in _KEYS:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key) if key in _KEYS else default
+
+    def __contains__(self, key: object) -> bool:
+        return key in _KEYS
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(KEYS)
+
+    def __len__(self) -> int:
+        return len(KEYS)
+
+    def __repr__(self) -> str:
+        return f"ModelRecord({dict(self)!r})"
+
+    def __reduce__(self) -> tuple:
+        # Tag ids only mean something with their vocabulary; pickle the fields
+        return ModelRecord.from_mapping, (dict(self),)
+
+
+def parse_timestamp(value: str | None) -> float | None:
+    """POSIX timestamp of an ISO 8601 ``lastModified``; naive means UTC"""
+    if not value:
+        return None
+    modified = datetime.fromisoformat(value)
+    if modified.tzinfo is None:
+        modified = modified.replace(tzinfo=UTC)
+    return modified.timestamp()
+
+
+def format_timestamp(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, UTC).isoformat()
+
+
+def _intern(value: str | None) -> str | None:
+    return None if value is None else sys.intern(value)
@@ -2,131 +2,544 @@
 Thermal-aware search functionality for Hugging Face models
 """
 
-import re
+import asyncio
+import itertools
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable, Collection, Iterable
+from datetime import datetime
+from functools import partial
 from typing import Any
 
-from huggingface_hub import HfApi
+from .cache import TTLCache
+from .config import (
+    fetch_budget,
+    search_cache_size,
+    search_cache_stale,
+    search_cache_ttl,
+    search_refresh_interval,
+    search_refresh_top,
+)
+from .hub import AsyncHubClient, get_async_client, hub_api
+from .index import ModelIndex, load_default_index
+from .metrics import Timings, request_timings, search_seconds, stage
+from .params import safetensors_total
+from .ranking import DEFAULT_SORT, parse_sort
+from .records import ModelRecord
+from .thermal import classify_batch, estimate_thermal_cost
 
+# Fields requested from list_models; "safetensors" carries exact parameter
+# counts, so no model is looked up on its own
+HUB_EXPAND = [
+    "downloads",
+    "likes",
+    "tags",
+    "pipeline_tag",
+    "library_name",
+    "lastModified",
+    "safetensors",
+]
+
+# Largest page requested from the Hub while scanning for filtered matches
+HUB_PAGE_SIZE = 1000
+
+# Candidates a sorted search ranks per result unless given a fetch budget
+SORT_CANDIDATES = 5
+
+# Recent results keyed by (query, limit, model_type, sort order, tiers, models
+# ranked, models scanned, index generation), served stale while refreshed
+search_cache = TTLCache(
+    maxsize=search_cache_size(), ttl=search_cache_ttl(), stale=search_cache_stale()
+)
 
-def estimate_thermal_cost(model_info: dict[str, Any]) -> str:
-    """
-    Estimate the thermal cost of a model based on its characteristics
 
-    Returns: "Low", "Medium", or "High"
+def thermal_search(
+    query: str,
+    limit: int = 10,
+    model_type: str | None = None,
+    thermal_aware: bool = True,
+    index: ModelIndex | None = None,
+    tiers: Collection[str] | None = None,
+    budget: int | None = None,
+    sort: str | None = None,
+) -> list[ModelRecord]:
     """
-    # Extract model size indicators
-    model_id = model_info.get("modelId", "").lower()
-    tags = [tag.lower() for tag in model_info.get("tags", [])]
+    Search Hugging Face Hub for models with optional thermal awareness
 
-    # Size patterns
-    size_patterns = {
-        "tiny": 1,
-        "small": 1,
-        "base": 3,
-        "large": 4,
-        "xl": 5,
-        "xxl": 6,
-    }
+    Queries are answered from the local index when one exists (see
+    ``thermal_scout.index``), ranked by text relevance, otherwise from the Hub.
 
-    # Check for parameter counts (order matters - most specific first)
-    param_patterns = [
-        (r"(?:^|-)(\d{2,})b(?:$|-)", 5),  # 10B+
-        (r"(?:^|-)([7-9])b(?:$|-)", 4),  # 7-9B
-        (r"(?:^|-)([4-6])b(?:$|-)", 4),  # 4-6B
-        (r"(?:^|-)([1-3])b(?:$|-)", 3),  # 1-3B
-        (r"(?:^|-)(\d+)b(?:$|-)", 4),  # Any B
-        (r"(?:^|-)(\d+)m(?:$|-)", 1),  # Millions
-    ]
+    ``tiers`` (see ``thermal.thermal_tiers``) keeps only models of those
+    thermal levels. The filter is applied while reading the source: the
+    index filters before picking its top results, and Hub pages are
+    classified one at a time until ``limit`` matches are found or ``budget``
+    models (default ``THERMAL_SCOUT_FETCH_BUDGET``) have been listed.
 
-    thermal_score = 3  # Default medium
+    Thermal-aware results are the source's top ``limit`` reordered coolest
+    first. A ``sort`` order (see ``thermal_scout.ranking``) instead picks the
+    best ``limit`` of the source's top ``budget`` candidates.
 
-    # Check model ID for size indicators
-    for pattern, score in size_patterns.items():
-        if pattern in model_id:
-            thermal_score = score
-            break
+    Results for the default index or the Hub are kept in ``search_cache``, and
+    concurrent identical searches share one upstream call. An expired result
+    is still returned for ``THERMAL_SCOUT_CACHE_STALE`` seconds while it is
+    searched again in the background. Results are read-only ``ModelRecord``
+    mappings, possibly shared with other callers.
+
+    Each stage is timed (see ``thermal_scout.metrics``), and the whole search
+    is observed in ``search_seconds`` as a cache ``hit``, ``miss`` or
+    ``bypass`` (an explicit ``index``); background refreshes are observed as
+    ``refresh``.
+    """
+    with request_timings() as timings:
+        start = _start(timings, model_type)
+        try:
+            plan = _plan(limit, thermal_aware, tiers, budget, sort)
+            if index is not None:
+                timings.cache = "bypass"
+                return _thermal_search(query, limit, model_type, index, tiers, *plan)
+
+            index = load_default_index()
+            # A new index generation must not be answered from older results
+            source = index.generation if index is not None else None
+            key = _cache_key(query, limit, model_type, tiers, plan, source)
+            search = partial(
+                _thermal_search, query, limit, model_type, index, tiers, *plan
+            )
+            results = search_cache.get_or_compute(
+                key, _missed(timings, search), _refresher(model_type, search)
+            )
+            return list(results)
+
+        except Exception as e:
+            print(f"Error searching models: {e}")
+            return []
+        finally:
+            _observe(timings, start)
 
-    # Check for parameter count (overrides size patterns)
-    for pattern, score in param_patterns:
-        if re.search(pattern, model_id):
-            thermal_score = score
-            break
 
-    # Adjust based on tags
-    if any("tiny" in tag for tag in tags):
-        thermal_score = 1
-    elif any("efficient" in tag or "distil" in tag for tag in tags):
-        thermal_score = max(1, thermal_score - 2)
-    elif any("large" in tag or "xxl" in tag for tag in tags):
-        thermal_score = max(thermal_score, 5)
-
-    # Map to thermal categories
-    if thermal_score <= 1:
-        return "Low"
-    elif thermal_score <= 3:
-        return "Medium"
+def _thermal_search(
+    query: str,
+    limit: int,
+    model_type: str | None,
+    index: ModelIndex | None,
+    tiers: Collection[str] | None,
+    order: str | None,
+    want: int,
+    scan: int,
+) -> list[ModelRecord]:
+    if index is not None:
+        with stage("index"):
+            results = index.search(query, task=model_type, limit=want, tiers=tiers)
     else:
-        return "High"
+        results = _search_hub(query, want, model_type, tiers, scan)
 
+    with stage("rank"):
+        return _rank(results, limit, order, query)
 
-def thermal_search(
+
+async def async_thermal_search(
     query: str,
     limit: int = 10,
     model_type: str | None = None,
     thermal_aware: bool = True,
-) -> list[dict[str, Any]]:
-    """
-    Search Hugging Face Hub for models with optional thermal awareness
+    index: ModelIndex | None = None,
+    client: AsyncHubClient | None = None,
+    tiers: Collection[str] | None = None,
+    budget: int | None = None,
+    sort: str | None = None,
+) -> list[ModelRecord]:
     """
-    api = HfApi()
+    ``thermal_search`` for the event loop
 
+    Hub queries go through a pooled ``AsyncHubClient`` (the loop's shared one
+    unless ``client`` is given), so concurrent searches share connections
+    instead of each blocking a worker. Shares ``search_cache`` and the
+    metrics of ``thermal_search``.
+    """
     try:
-        # Search models
-        search_kwargs = {
-            "search": query,
-            "limit": limit * 2
-            if thermal_aware
-            else limit,  # Get extra for thermal filtering
-            "sort": "downloads",
-            "direction": -1,
-        }
+        return await async_thermal_search_raising(
+            query, limit, model_type, thermal_aware, index, client, tiers, budget, sort
+        )
+    except Exception as e:
+        print(f"Error searching models: {e}")
+        return []
 
-        if model_type:
-            search_kwargs["task"] = model_type
 
-        models = api.list_models(**search_kwargs)
+async def async_thermal_search_raising(
+    query: str,
+    limit: int = 10,
+    model_type: str | None = None,
+    thermal_aware: bool = True,
+    index: ModelIndex | None = None,
+    client: AsyncHubClient | None = None,
+    tiers: Collection[str] | None = None,
+    budget: int | None = None,
+    sort: str | None = None,
+) -> list[ModelRecord]:
+    """
+    ``async_thermal_search`` raising errors instead of reporting them
 
-        results = []
-        for model in models:
-            model_dict = {
-                "modelId": model.id,
-                "downloads": getattr(model, "downloads", 0),
-                "likes": getattr(model, "likes", 0),
-                "tags": getattr(model, "tags", []),
-                "pipeline_tag": getattr(model, "pipeline_tag", None),
-                "library_name": getattr(model, "library_name", None),
-            }
-
-            if thermal_aware:
-                model_dict["thermal_cost"] = estimate_thermal_cost(model_dict)
-            else:
-                model_dict["thermal_cost"] = estimate_thermal_cost(model_dict)
-
-            results.append(model_dict)
-
-        # Sort by thermal cost if thermal aware
-        if thermal_aware:
-            # Define sort order
-            thermal_order = {"Low": 0, "Medium": 1, "High": 2}
-            results.sort(
-                key=lambda x: (
-                    thermal_order.get(x.get("thermal_cost", "High"), 3),
-                    -x.get("downloads", 0),
+    For callers that report errors per search, like ``thermal_scout.batch``.
+    """
+    with request_timings() as timings:
+        start = _start(timings, model_type)
+        try:
+            plan = _plan(limit, thermal_aware, tiers, budget, sort)
+            if index is not None:
+                timings.cache = "bypass"
+                return await _async_thermal_search(
+                    query, limit, model_type, index, client, tiers, *plan
                 )
+
+            index = load_default_index()
+            source = index.generation if index is not None else None
+            key = _cache_key(query, limit, model_type, tiers, plan, source)
+            search = partial(
+                _async_thermal_search,
+                query,
+                limit,
+                model_type,
+                index,
+                client,
+                tiers,
+                *plan,
+            )
+            results = await search_cache.aget_or_compute(
+                key, _missed(timings, search), _async_refresher(model_type, search)
             )
+            return list(results)
+        finally:
+            _observe(timings, start)
+
+
+async def _async_thermal_search(
+    query: str,
+    limit: int,
+    model_type: str | None,
+    index: ModelIndex | None,
+    client: AsyncHubClient | None,
+    tiers: Collection[str] | None,
+    order: str | None,
+    want: int,
+    scan: int,
+) -> list[ModelRecord]:
+    if index is not None:
+        # Memory-mapped and answered in milliseconds, no need for a thread
+        with stage("index"):
+            results = index.search(query, task=model_type, limit=want, tiers=tiers)
+    else:
+        client = client if client is not None else get_async_client()
+        results = []
+        async for page in _async_hub_pages(client, query, want, model_type, scan):
+            results.extend(in_tiers(page, tiers))
+            if len(results) >= want:
+                break
+
+    with stage("rank"):
+        return _rank(results, limit, order, query)
+
+
+async def async_stream_search(
+    query: str,
+    limit: int = 10,
+    model_type: str | None = None,
+    index: ModelIndex | None = None,
+    client: AsyncHubClient | None = None,
+    tiers: Collection[str] | None = None,
+    budget: int | None = None,
+) -> AsyncIterator[ModelRecord]:
+    """
+    Yield classified results in source order as they arrive
+
+    Unlike ``async_thermal_search`` nothing is sorted, buffered or cached:
+    each Hub page is classified and handed on before the next one is
+    requested, so the first results come back after one round trip and
+    memory stays bounded by the page size whatever ``limit`` is. ``tiers``
+    and ``budget`` filter as in ``thermal_search``. Errors are raised to the
+    consumer.
+    """
+    if index is None:
+        index = load_default_index()
+
+    if index is not None:
+        for model in index.search(query, task=model_type, limit=limit, tiers=tiers):
+            yield model
+        return
+
+    budget = fetch_budget() if budget is None else budget
+    client = client if client is not None else get_async_client()
+    sent = 0
+    async for page in _async_hub_pages(
+        client, query, limit, model_type, _scan_size(limit, tiers, budget)
+    ):
+        for model in in_tiers(page, tiers):
+            yield model
+            sent += 1
+            if sent >= limit:
+                return
+
+
+def _start(timings: Timings, model_type: str | None) -> float:
+    """Label ``timings`` for a search starting now; returns the start time"""
+    # Until the cache runs the computation
+    timings.cache = "hit"
+    timings.model_type = model_type or "none"
+    return time.perf_counter()
+
+
+def _missed(timings: Timings, compute: Callable[[], Any]) -> Callable[[], Any]:
+    """``compute``, marking the search a cache miss when it runs"""
+
+    def computed() -> Any:
+        timings.cache = "miss"
+        return compute()
+
+    return computed
+
+
+def _refresher(model_type: str | None, compute: Callable[[], Any]) -> Callable[[], Any]:
+    """``compute`` for a background refresh, observed as a search of its own"""
+
+    def refreshed() -> Any:
+        with request_timings(fresh=True) as timings:
+            start = _start(timings, model_type)
+            timings.cache = "refresh"
+            try:
+                return compute()
+            except Exception as e:
+                print(f"Error refreshing search: {e}")
+                raise
+            finally:
+                _observe(timings, start)
+
+    return refreshed
 
+
+def _async_refresher(
+    model_type: str | None, compute: Callable[[], Awaitable[Any]]
+) -> Callable[[], Awaitable[Any]]:
+    """``_refresher`` for coroutines"""
+
+    async def refreshed() -> Any:
+        with request_timings(fresh=True) as timings:
+            start = _start(timings, model_type)
+            timings.cache = "refresh"
+            try:
+                return await compute()
+            except Exception as e:
+                print(f"Error refreshing search: {e}")
+                raise
+            finally:
+                _observe(timings, start)
+
+    return refreshed
+
+
+async def refresh_hot_searches(
+    top: int | None = None, interval: float | None = None
+) -> None:
+    """
+    Keep the ``top`` most requested searches fresh in ``search_cache``
+
+    Every ``interval`` seconds, the most popular searches that would expire
+    before the next two rounds are searched again, so nobody waits for them
+    to be recomputed. Defaults come from the configuration; runs until
+    cancelled, or returns at once if ``top`` is 0.
+    """
+    top = search_refresh_top() if top is None else top
+    interval = search_refresh_interval() if interval is None else interval
+    if top <= 0:
+        return
+    while True:
+        await asyncio.sleep(interval)
+        await search_cache.refresh_popular(top, within=2 * interval)
+
+
+def _observe(timings: Timings, start: float) -> None:
+    elapsed = time.perf_counter() - start
+    search_seconds.observe(elapsed, timings.cache, timings.model_type)
+
+
+def _plan(
+    limit: int,
+    thermal_aware: bool,
+    tiers: Collection[str] | None,
+    budget: int | None,
+    sort: str | None,
+) -> tuple[str | None, int, int]:
+    """
+    (sort order, models to rank, models to scan at most) for a search
+
+    An explicit ``sort`` ranks the source's top ``SORT_CANDIDATES`` per
+    result, or up to ``budget`` candidates when one is given; otherwise only
+    the ``limit`` results the source puts first are reordered.
+    """
+    pool = SORT_CANDIDATES * limit if budget is None else budget
+    budget = fetch_budget() if budget is None else budget
+    if sort is not None:
+        want = max(limit, min(pool, budget))
+    else:
+        sort = DEFAULT_SORT if thermal_aware else None
+        want = limit
+    return sort, want, _scan_size(want, tiers, budget)
+
+
+def _rank(
+    results: list[ModelRecord], limit: int, order: str | None, query: str
+) -> list[ModelRecord]:
+    """The best ``limit`` results under ``order``, or the first if unsorted"""
+    if order is None:
         return results[:limit]
+    # Bounded heap, O(n log limit); ties keep their order as with sorted()
+    return parse_sort(order, query).top_k(results, limit)
 
-    except Exception as e:
-        print(f"Error searching models: {e}")
-        return []
+
+def _cache_key(
+    query: str,
+    limit: int,
+    model_type: str | None,
+    tiers: Collection[str] | None,
+    plan: tuple[str | None, int, int],
+    source: int | None,
+) -> tuple:
+    tiers_key = None if tiers is None else tuple(sorted(tiers))
+    return (query, limit, model_type, tiers_key, *plan, source)
+
+
+def _scan_size(limit: int, tiers: Collection[str] | None, budget: int) -> int:
+    """Hub models to list at most: one per result unless filtering"""
+    return limit if tiers is None else max(limit, budget)
+
+
+def in_tiers(
+    models: list[ModelRecord], tiers: Collection[str] | None
+) -> list[ModelRecord]:
+    """The ``models`` of thermal levels in ``tiers``, or all of them for ``None``"""
+    if tiers is None:
+        return models
+    return [model for model in models if model["thermal_cost"] in tiers]
+
+
+def _search_hub(
+    query: str,
+    limit: int,
+    model_type: str | None,
+    tiers: Collection[str] | None,
+    scan: int,
+) -> list[ModelRecord]:
+    """
+    Classify ``list_models`` results until ``limit`` of them are in ``tiers``
+
+    ``HfApi`` pages the listing lazily; it is classified ``limit`` models at
+    a time. At most ``scan`` models are listed.
+    """
+    api = hub_api()
+    models = api.list_models(**_list_models_kwargs(query, scan, model_type))
+    batches = itertools.batched(models, limit)
+
+    results: list[ModelRecord] = []
+    while True:
+        # The listing is requested from the Hub as it is read
+        with stage("hub"):
+            batch = next(batches, None)
+        if batch is None:
+            break
+        with stage("classify"):
+            page = classify_listing(batch)
+        results.extend(in_tiers(page, tiers))
+        if len(results) >= limit:
+            break
+    return results
+
+
+async def _async_hub_pages(
+    client: AsyncHubClient,
+    query: str,
+    limit: int,
+    model_type: str | None,
+    scan: int,
+) -> AsyncIterator[list[ModelRecord]]:
+    """
+    Classified Hub pages of at most ``scan`` models in total
+
+    The first page holds ``limit`` models and each following one twice as
+    many (up to ``HUB_PAGE_SIZE``), so an unfiltered search makes a single
+    request and a filtered one reaches deep results in a few.
+    """
+    next_query = None
+    listed = 0
+    size = limit
+    while listed < scan:
+        size = min(size, scan - listed, HUB_PAGE_SIZE)
+        with stage("hub"):
+            models, next_query = await client.list_models_page(
+                next_query, **_list_models_kwargs(query, size, model_type)
+            )
+        listed += len(models)
+        with stage("classify"):
+            page = classify_listing(models)
+        yield page
+        if next_query is None or not models:
+            return
+        size *= 2
+
+
+def _list_models_kwargs(
+    query: str, limit: int, model_type: str | None
+) -> dict[str, Any]:
+    search_kwargs = {
+        "search": query,
+        "limit": limit,
+        "sort": "downloads",
+        "direction": -1,
+        "expand": HUB_EXPAND,
+    }
+
+    if model_type:
+        search_kwargs["task"] = model_type
+
+    return search_kwargs
+
+
+def classify_listing(models: Iterable[Any]) -> list[ModelRecord]:
+    """
+    Records of listed models
+
+    Parameter counts come with the listing, which expands ``safetensors``; a
+    model listed without one has no safetensors metadata to look up either.
+    """
+    results = [_model_fields(model) for model in models]
+    return [
+        ModelRecord.from_mapping(model_dict, thermal_cost)
+        for model_dict, thermal_cost in zip(
+            results, classify_batch(results), strict=True
+        )
+    ]
+
+
+def model_to_record(model: Any) -> ModelRecord:
+    """Convert an ``HfApi`` ModelInfo into a classified result record"""
+    return ModelRecord.from_mapping(model_to_dict(model))
+
+
+def model_to_dict(model: Any) -> dict[str, Any]:
+    """Convert an ``HfApi`` ModelInfo into a classified result dict, for JSON"""
+    model_dict = _model_fields(model)
+    model_dict["thermal_cost"] = estimate_thermal_cost(model_dict)
+    return model_dict
+
+
+def _model_fields(model: Any) -> dict[str, Any]:
+    return {
+        "modelId": model.id,
+        "downloads": getattr(model, "downloads", 0),
+        "likes": getattr(model, "likes", 0),
+        "tags": getattr(model, "tags", []),
+        "pipeline_tag": getattr(model, "pipeline_tag", None),
+        "library_name": getattr(model, "library_name", None),
+        "parameters": safetensors_total(model),
+        "lastModified": _isoformat(getattr(model, "last_modified", None)),
+    }
+
+
+def _isoformat(value: Any) -> str | None:
+    return value.isoformat() if isinstance(value, datetime) else None
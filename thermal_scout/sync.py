@@ -0,0 +1,201 @@
+"""
+Incremental synchronization of the local model index with the Hub
+
+Models are listed newest-modified first and the listing stops at the
+high-water mark left by the previous sync, so a refresh only costs as much as
+what changed. Every model seen is appended to a journal before the snapshot
+is rewritten; an interrupted sync resumes from the journal instead of
+classifying those models again.
+"""
+
+import json
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+from .config import index_dir
+from .index import ModelIndex, write_index
+from .search import model_to_dict
+
+STATE_FILE = "sync.json"
+JOURNAL_FILE = "sync.journal.jsonl"
+
+# Fields requested from list_models; lastModified drives the high-water mark
+EXPAND = [
+    "downloads",
+    "likes",
+    "tags",
+    "pipeline_tag",
+    "library_name",
+    "lastModified",
+    "safetensors",
+]
+
+JOURNAL_FLUSH_EVERY = 1000
+
+
+@dataclass
+class SyncReport:
+    """Outcome of a sync run"""
+
+    upserted: int
+    deleted: int
+    resumed: int
+    total: int
+    elapsed: float
+    high_water_mark: str | None
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.upserted / self.elapsed if self.elapsed > 0 else 0.0
+
+
+def sync_index(
+    api: Any,
+    path: str | Path | None = None,
+    full: bool = False,
+    progress: Callable[[int, float], None] | None = None,
+) -> SyncReport:
+    """
+    Bring the index at ``path`` up to date with the models listed by ``api``
+
+    Incremental runs only see models modified since the last sync, so they
+    cannot notice deletions; ``full=True`` relists everything and drops models
+    that are gone from the Hub. ``progress`` is called with the number of
+    models processed and the current rows/sec.
+    """
+    path = Path(path) if path is not None else index_dir()
+    path.mkdir(parents=True, exist_ok=True)
+    state = _load_state(path)
+    journal_path = path / JOURNAL_FILE
+
+    # A journal left behind by an interrupted run carries its mode along
+    journaled = _read_journal(journal_path)
+    if journaled:
+        full = state.get("in_progress", {}).get("full", full)
+    state["in_progress"] = {"full": full}
+    _save_state(path, state)
+
+    high_water_mark = None if full else state.get("high_water_mark")
+    newest = max(
+        (entry["lastModified"] for entry in journaled.values()),
+        default=high_water_mark,
+    )
+
+    started = time.perf_counter()
+    upserted = 0
+    with journal_path.open("a") as journal:
+        for model in api.list_models(sort="lastModified", direction=-1, expand=EXPAND):
+            modified = _timestamp(model.last_modified)
+            if high_water_mark is not None and modified <= high_water_mark:
+                break
+            if model.id in journaled:
+                continue
+
+            entry = {"lastModified": modified, "model": model_to_dict(model)}
+            journal.write(json.dumps(entry) + "\n")
+            journaled[model.id] = entry
+            newest = max(newest or modified, modified)
+
+            upserted += 1
+            if upserted % JOURNAL_FLUSH_EVERY == 0:
+                journal.flush()
+                if progress is not None:
+                    elapsed = time.perf_counter() - started
+                    progress(upserted, upserted / elapsed if elapsed > 0 else 0.0)
+
+    changes = {model_id: entry["model"] for model_id, entry in journaled.items()}
+    total, deleted = _apply(path, changes, full)
+
+    state = {"high_water_mark": newest}
+    _save_state(path, state)
+    journal_path.unlink()
+
+    return SyncReport(
+        upserted=upserted,
+        deleted=deleted,
+        resumed=len(journaled) - upserted,
+        total=total,
+        elapsed=time.perf_counter() - started,
+        high_water_mark=newest,
+    )
+
+
+def _apply(
+    path: Path, changes: dict[str, dict[str, Any]], full: bool
+) -> tuple[int, int]:
+    """Rewrite the snapshot with ``changes`` applied, returning (total, deleted)"""
+    existing = None
+    if (path / "meta.json").exists():
+        try:
+            existing = ModelIndex(path)
+        except ValueError:
+            # A full sync relists everything, so it can replace a snapshot
+            # written in an older format
+            if not full:
+                raise
+    deleted = 0
+    models: list[dict[str, Any]] = []
+
+    if existing is not None:
+        for model in existing.records():
+            if model["modelId"] in changes:
+                continue
+            if full:
+                # Everything still on the Hub was relisted into ``changes``
+                deleted += 1
+                continue
+            models.append(model)
+
+    models.extend(changes.values())
+    write_index(path, models)
+    return len(models), deleted
+
+
+def _timestamp(value: datetime | str | None) -> str:
+    """Fixed-width UTC ISO timestamp, so string order is time order"""
+    if value is None:
+        value = datetime.min.replace(tzinfo=UTC)
+    elif isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=UTC)
+    return value.astimezone(UTC).isoformat(timespec="microseconds")
+
+
+def _load_state(path: Path) -> dict[str, Any]:
+    state_path = path / STATE_FILE
+    if not state_path.exists():
+        return {}
+    return json.loads(state_path.read_text())
+
+
+def _save_state(path: Path, state: dict[str, Any]) -> None:
+    tmp = path / f"{STATE_FILE}.tmp"
+    tmp.write_text(json.dumps(state))
+    tmp.replace(path / STATE_FILE)
+
+
+def _read_journal(journal_path: Path) -> dict[str, dict[str, Any]]:
+    """Models recorded by an interrupted run, keyed by id"""
+    journaled: dict[str, dict[str, Any]] = {}
+    if not journal_path.exists():
+        return journaled
+
+    intact = 0
+    with journal_path.open("rb+") as journal:
+        for line in journal:
+            if not line.endswith(b"\n"):
+                break
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                break
+            journaled[entry["model"]["modelId"]] = entry
+            intact += len(line)
+        # Cut off a torn final line so new entries start on a clean line
+        journal.truncate(intact)
+    return journaled
@@ -0,0 +1,276 @@
+"""
+Inverted full-text index over model ids and tags
+
+Model ids are split on ``/``, ``-``, ``_``, ``.`` and at digit/letter
+boundaries; tags are split the same way. Postings are stored as CSR arrays
+next to the columnar index snapshot and memory-mapped on open, so nothing is
+rebuilt at startup.
+
+Query syntax:
+    bert base          both terms (AND)
+    bert OR roberta    either group
+    llam*              prefix
+A plain term matches tokens equal to it, starting with it, or containing it,
+scored in that order of preference. ``OR`` with no terms to join is the word
+"or"; a query without any term (``*``, ``-``) has nothing to look up here,
+see ``has_terms``.
+"""
+
+import math
+import re
+from bisect import bisect_left
+from collections import Counter
+from collections.abc import Iterable
+from pathlib import Path
+
+import numpy as np
+
+TEXT_COLUMNS = {
+    "text_terms": np.uint8,  # sorted vocabulary, newline separated
+    "text_term_offsets": np.int64,  # V + 1 offsets into text_terms
+    "text_postings_offsets": np.int64,  # V + 1 offsets into the postings
+    "text_postings_docs": np.int32,
+    "text_postings_tf": np.uint16,  # field-weighted term frequency
+    "text_doc_len": np.uint16,
+}
+
+# Tokens from the model id count more than tokens from tags
+ID_WEIGHT = 2
+TAG_WEIGHT = 1
+
+# Discount for tokens that only start with / contain the query term
+EXACT_WEIGHT = 1.0
+PREFIX_WEIGHT = 0.7
+INFIX_WEIGHT = 0.4
+
+# Cap on vocabulary expansion per query term, most frequent tokens first
+MAX_EXPANSIONS = 128
+MAX_INFIX_SCAN = 8 * MAX_EXPANSIONS
+
+MAX_CACHED_EXPANSIONS = 4096
+
+# Shorter terms only expand to prefixes; infixes would match most of the vocabulary
+MIN_INFIX_LENGTH = 3
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Blend of relevance and popularity: score = bm25 + weight * log1p(downloads)
+DOWNLOADS_WEIGHT = 0.1
+
+_SEPARATORS = re.compile(r"[\s/\-_.:]+")
+_DIGIT_LETTER = re.compile(r"\d+|[^\W\d]+")
+
+
+def tokenize(text: str) -> list[str]:
+    """Split an id or tag into lowercase tokens"""
+    tokens = []
+    for chunk in _SEPARATORS.split(text.lower()):
+        if not chunk:
+            continue
+        tokens.append(chunk)
+        parts = _DIGIT_LETTER.findall(chunk)
+        if len(parts) > 1:
+            tokens.extend(parts)
+    return tokens
+
+
+def document_terms(model_id: str, tags: Iterable[str]) -> Counter[str]:
+    """Field-weighted term frequencies for one model"""
+    terms: Counter[str] = Counter()
+    for token in tokenize(model_id):
+        terms[token] += ID_WEIGHT
+    for tag in tags:
+        for token in tokenize(tag):
+            terms[token] += TAG_WEIGHT
+    return terms
+
+
+def write_text_index(
+    path: Path, generation: int, documents: list[Counter[str]]
+) -> None:
+    """Write postings for ``documents`` (one term Counter per row)"""
+    vocabulary: dict[str, int] = {}
+    term_ids: list[int] = []
+    doc_ids: list[int] = []
+    frequencies: list[int] = []
+    doc_len = np.zeros(len(documents), dtype=np.int64)
+
+    for doc, terms in enumerate(documents):
+        for term, tf in terms.items():
+            term_ids.append(vocabulary.setdefault(term, len(vocabulary)))
+            doc_ids.append(doc)
+            frequencies.append(tf)
+        doc_len[doc] = sum(terms.values())
+
+    terms_sorted = sorted(vocabulary)
+    rank = np.empty(len(vocabulary), dtype=np.int64)
+    rank[[vocabulary[term] for term in terms_sorted]] = np.arange(len(terms_sorted))
+
+    term_arr = rank[np.asarray(term_ids, dtype=np.int64)]
+    doc_arr = np.asarray(doc_ids, dtype=np.int64)
+    order = np.lexsort((doc_arr, term_arr))
+    counts = np.bincount(term_arr, minlength=len(terms_sorted))
+
+    blob = "\n".join(terms_sorted).encode()
+    term_offsets = np.zeros(len(terms_sorted) + 1, dtype=np.int64)
+    lengths = [len(term.encode()) + 1 for term in terms_sorted]
+    term_offsets[1:] = np.cumsum(lengths)
+
+    arrays = {
+        "text_terms": np.frombuffer(blob, dtype=np.uint8),
+        "text_term_offsets": term_offsets,
+        "text_postings_offsets": np.concatenate(([0], np.cumsum(counts))),
+        "text_postings_docs": doc_arr[order],
+        "text_postings_tf": np.minimum(np.asarray(frequencies)[order], 65535),
+        "text_doc_len": np.minimum(doc_len, 65535),
+    }
+    for name, dtype in TEXT_COLUMNS.items():
+        np.save(
+            path / f"{name}.{generation}.npy", np.asarray(arrays[name], dtype=dtype)
+        )
+
+
+class TextIndex:
+    """BM25 matching over the postings written by ``write_text_index``"""
+
+    def __init__(self, path: Path, generation: int):
+        self.columns = {
+            name: np.load(path / f"{name}.{generation}.npy", mmap_mode="r")
+            for name in TEXT_COLUMNS
+        }
+        self._blob = self.columns["text_terms"].tobytes()
+        self.terms = self._blob.decode().split("\n") if self._blob else []
+        doc_len = self.columns["text_doc_len"]
+        self.avg_doc_len = float(doc_len.mean()) if len(doc_len) else 0.0
+        # Vocabulary expansions only depend on the term, so hot terms skip the scan
+        self._expansions: dict[tuple[str, bool], list[tuple[int, float]]] = {}
+
+    def __len__(self) -> int:
+        return len(self.columns["text_doc_len"])
+
+    def match(self, query: str) -> tuple[np.ndarray, np.ndarray]:
+        """Rows matching ``query`` with their BM25 scores, in row order"""
+        result = None
+
+        for group in _parse(query):
+            group_docs, group_scores = None, None
+            for term, prefix_only in group:
+                docs, scores = self._term(term, prefix_only)
+                if group_docs is None:
+                    group_docs, group_scores = docs, scores
+                else:
+                    _, left, right = np.intersect1d(
+                        group_docs, docs, assume_unique=True, return_indices=True
+                    )
+                    group_docs = group_docs[left]
+                    group_scores = group_scores[left] + scores[right]
+            if result is None:
+                result = group_docs, group_scores
+            else:
+                result = _union(*result, group_docs, group_scores)
+
+        if result is None:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+        return result
+
+    def _term(self, term: str, prefix_only: bool) -> tuple[np.ndarray, np.ndarray]:
+        """Per-document BM25 score of one query term and its expansions"""
+        expansions = self._expand(term, prefix_only)
+        if not expansions:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+
+        offsets = self.columns["text_postings_offsets"]
+        postings_docs = self.columns["text_postings_docs"]
+        postings_tf = self.columns["text_postings_tf"]
+        doc_len = self.columns["text_doc_len"]
+        n = len(self)
+
+        all_docs, all_scores = [], []
+        for term_id, weight in expansions:
+            start, end = offsets[term_id], offsets[term_id + 1]
+            docs = postings_docs[start:end].astype(np.int64)
+            tf = postings_tf[start:end].astype(np.float64)
+            df = end - start
+            idf = math.log(1 + (n - df + 0.5) / (df + 0.5))
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * doc_len[docs] / self.avg_doc_len)
+            all_docs.append(docs)
+            all_scores.append(weight * idf * tf * (BM25_K1 + 1) / (tf + norm))
+
+        docs = np.concatenate(all_docs)
+        scores = np.concatenate(all_scores)
+        if len(expansions) == 1:
+            return docs, scores
+
+        # A document matching several expansions keeps its best one. Each
+        # postings list is already sorted by doc, and a stable sort merges
+        # those runs instead of sorting from scratch.
+        order = np.argsort(docs, kind="stable")
+        docs, scores = docs[order], scores[order]
+        starts = np.flatnonzero(np.diff(docs, prepend=-1))
+        return docs[starts], np.maximum.reduceat(scores, starts)
+
+    def _expand(self, term: str, prefix_only: bool) -> list[tuple[int, float]]:
+        """Vocabulary entries matching ``term`` with their weights"""
+        cached = self._expansions.get((term, prefix_only))
+        if cached is not None:
+            return cached
+
+        lo = bisect_left(self.terms, term)
+        hi = bisect_left(self.terms, term + "\U0010ffff")
+        matches: dict[int, float] = dict.fromkeys(range(lo, hi), PREFIX_WEIGHT)
+        if lo < len(self.terms) and self.terms[lo] == term:
+            matches[lo] = EXACT_WEIGHT
+
+        if not prefix_only and len(term) >= MIN_INFIX_LENGTH:
+            offsets = self.columns["text_term_offsets"]
+            needle = term.encode()
+            start = self._blob.find(needle)
+            while start != -1 and len(matches) < MAX_INFIX_SCAN:
+                term_id = int(np.searchsorted(offsets, start, side="right")) - 1
+                matches.setdefault(term_id, INFIX_WEIGHT)
+                start = self._blob.find(needle, start + 1)
+
+        if len(matches) > MAX_EXPANSIONS:
+            df = np.diff(self.columns["text_postings_offsets"])
+            ranked = sorted(matches, key=lambda t: (-matches[t], -df[t]))
+            matches = {t: matches[t] for t in ranked[:MAX_EXPANSIONS]}
+
+        if len(self._expansions) >= MAX_CACHED_EXPANSIONS:
+            self._expansions.clear()
+        expansions = self._expansions[term, prefix_only] = list(matches.items())
+        return expansions
+
+
+def has_terms(query: str) -> bool:
+    """Whether ``query`` has a term to look up, not just wildcards or separators"""
+    return bool(_parse(query))
+
+
+def _parse(query: str) -> list[list[tuple[str, bool]]]:
+    """Split a query into OR groups of (term, prefix_only) AND terms"""
+    # "OR" alone, or only between wildcards, is a word and not an operator
+    return _groups(query, operators=True) or _groups(query, operators=False)
+
+
+def _groups(query: str, operators: bool) -> list[list[tuple[str, bool]]]:
+    groups: list[list[tuple[str, bool]]] = [[]]
+    for word in query.split():
+        if operators and word == "OR":
+            groups.append([])
+            continue
+        prefix_only = word.endswith("*")
+        chunks = [c for c in _SEPARATORS.split(word.rstrip("*").lower()) if c]
+        for i, chunk in enumerate(chunks):
+            # Only the last chunk of "llama-2*" is a prefix
+            groups[-1].append((chunk, prefix_only and i == len(chunks) - 1))
+    return [group for group in groups if group]
+
+
+def _union(
+    a_docs: np.ndarray, a_scores: np.ndarray, b_docs: np.ndarray, b_scores: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    docs = np.concatenate((a_docs, b_docs))
+    scores = np.concatenate((a_scores, b_scores))
+    unique, inverse = np.unique(docs, return_inverse=True)
+    return unique, np.bincount(inverse, weights=scores, minlength=len(unique))
@@ -0,0 +1,352 @@
+"""
+Thermal cost estimation for Hugging Face models
+"""
+
+import re
+from collections.abc import Iterable
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Any
+
+import numpy as np
+
+# Thermal categories, coolest first
+THERMAL_LEVELS = ("Low", "Medium", "High")
+THERMAL_ORDER = {level: rank for rank, level in enumerate(THERMAL_LEVELS)}
+
+
+class ThermalTier(IntEnum):
+    """A thermal level as a small int, indexing ``THERMAL_LEVELS``"""
+
+    LOW = 0
+    MEDIUM = 1
+    HIGH = 2
+
+    @property
+    def label(self) -> str:
+        return THERMAL_LEVELS[self]
+
+
+# Tier of each level name; faster than ThermalTier(THERMAL_ORDER[level])
+THERMAL_TIERS = {level: ThermalTier(rank) for level, rank in THERMAL_ORDER.items()}
+
+
+# Size words checked against the model id, first listed wins
+SIZE_PATTERNS = (
+    ("tiny", 1),
+    ("small", 1),
+    ("base", 3),
+    ("large", 4),
+    ("xl", 5),
+    ("xxl", 6),
+)
+
+# Parameter counts such as "7b" or "350m", bounded by "-" or the ends of the id.
+# A single pass finds all of them; the most specific one decides the score:
+#   10B+ -> 5, 7-9B -> 4, 4-6B -> 4, 1-3B -> 3, any other B -> 4, millions -> 1
+PARAM_PATTERN = re.compile(r"(?<![^-])(\d+)([bm])(?=$|-)")
+_SINGLE_DIGIT_BILLIONS = {
+    "7": (1, 4),
+    "8": (1, 4),
+    "9": (1, 4),
+    "4": (2, 4),
+    "5": (2, 4),
+    "6": (2, 4),
+    "1": (3, 3),
+    "2": (3, 3),
+    "3": (3, 3),
+}
+_ANY_BILLIONS = (4, 4)
+_MILLIONS = (5, 1)
+
+# Exact parameter counts (from safetensors metadata) are tiered directly:
+# below 1B -> Low, below 3B -> Medium, otherwise High
+PARAMETER_BOUNDS = (1e9, 3e9)
+
+# Joins tags so a single lower() and substring test covers all of them
+_TAG_SEPARATOR = "\0"
+
+
+def thermal_tiers(
+    max_thermal: str | None = None, thermal_in: Iterable[str] | None = None
+) -> frozenset[str] | None:
+    """
+    Thermal levels allowed by a ``max_thermal`` ceiling and a ``thermal_in`` list
+
+    Both are case-insensitive and combine as an intersection. ``None`` means
+    every level is allowed. Raises ValueError for an unknown level.
+    """
+    levels = {level.lower(): level for level in THERMAL_LEVELS}
+
+    def level(name: str) -> str:
+        try:
+            return levels[name.strip().lower()]
+        except KeyError:
+            raise ValueError(
+                f"Unknown thermal level {name!r}, expected one of "
+                f"{', '.join(THERMAL_LEVELS)}"
+            ) from None
+
+    tiers = None
+    if max_thermal is not None:
+        ceiling = THERMAL_ORDER[level(max_thermal)]
+        tiers = frozenset(THERMAL_LEVELS[: ceiling + 1])
+    if thermal_in is not None:
+        chosen = frozenset(level(name) for name in thermal_in)
+        tiers = chosen if tiers is None else tiers & chosen
+    return tiers
+
+
+def estimate_thermal_cost(model_info: dict[str, Any]) -> str:
+    """
+    Estimate the thermal cost of a model based on its characteristics
+
+    An exact ``parameters`` count decides the tier on its own; otherwise it
+    is guessed from size words and parameter counts in the id, and the tags.
+
+    Returns: "Low", "Medium", or "High"
+    """
+    parameters = model_info.get("parameters")
+    if parameters:
+        return thermal_from_parameters(parameters)
+    return _thermal_level(
+        _thermal_score(
+            model_info.get("modelId", "").lower(),
+            _TAG_SEPARATOR.join(model_info.get("tags", [])).lower(),
+        )
+    )
+
+
+def classify_batch(models: Iterable[dict[str, Any]]) -> list[str]:
+    """
+    Estimate the thermal cost of many models at once
+
+    Same result as calling ``estimate_thermal_cost`` on each model, without
+    the per-call overhead.
+    """
+    score = _thermal_score
+    join = _TAG_SEPARATOR.join
+    levels = _LEVEL_FOR_SCORE
+    return [
+        thermal_from_parameters(m["parameters"])
+        if m.get("parameters")
+        else levels[
+            score(m.get("modelId", "").lower(), join(m.get("tags", [])).lower())
+        ]
+        for m in models
+    ]
+
+
+def thermal_from_parameters(parameters: float) -> str:
+    """Thermal cost of a model with a known parameter count"""
+    low, medium = PARAMETER_BOUNDS
+    if parameters < low:
+        return "Low"
+    elif parameters < medium:
+        return "Medium"
+    else:
+        return "High"
+
+
+def param_score(model_id: str) -> int | None:
+    """Score implied by a parameter count in a lowercased model id, if any"""
+    match = _param_match(model_id)
+    return match[0] if match is not None else None
+
+
+def _param_match(model_id: str) -> tuple[int, float] | None:
+    """(score, parameter count) of the most specific count in the id"""
+    best = None
+    best_digits, best_unit = "", ""
+    for digits, unit in PARAM_PATTERN.findall(model_id):
+        if unit == "m":
+            candidate = _MILLIONS
+        elif len(digits) >= 2:
+            return 5, int(digits) * 1e9
+        else:
+            candidate = _SINGLE_DIGIT_BILLIONS.get(digits, _ANY_BILLIONS)
+        if best is None or candidate < best:
+            best, best_digits, best_unit = candidate, digits, unit
+    if best is None:
+        return None
+    return best[1], int(best_digits) * (1e6 if best_unit == "m" else 1e9)
+
+
+def _thermal_score(model_id: str, tags: str) -> int:
+    """Raw 1-6 score from a lowercased id and lowercased, joined tags"""
+    thermal_score = 3  # Default medium
+
+    # Check model ID for size indicators
+    for pattern, score in SIZE_PATTERNS:
+        if pattern in model_id:
+            thermal_score = score
+            break
+
+    # Check for parameter count (overrides size patterns)
+    if "b" in model_id or "m" in model_id:
+        from_params = param_score(model_id)
+        if from_params is not None:
+            thermal_score = from_params
+
+    # Adjust based on tags
+    if "tiny" in tags:
+        thermal_score = 1
+    elif "efficient" in tags or "distil" in tags:
+        thermal_score = max(1, thermal_score - 2)
+    elif "large" in tags or "xxl" in tags:
+        thermal_score = max(thermal_score, 5)
+
+    return thermal_score
+
+
+def _thermal_level(thermal_score: int) -> str:
+    # Map to thermal categories
+    if thermal_score <= 1:
+        return "Low"
+    elif thermal_score <= 3:
+        return "Medium"
+    else:
+        return "High"
+
+
+_LEVEL_FOR_SCORE = {score: _thermal_level(score) for score in range(1, 7)}
+
+
+# Vectorized scoring
+#
+# ``thermal_features`` parses each model once into small numeric columns;
+# ``thermal_levels`` then scores whole columns with NumPy, so a snapshot can be
+# re-tiered under new thresholds without touching the per-model dicts again.
+
+TAG_TINY = 1
+TAG_EFFICIENT = 2  # "efficient" or "distil"
+TAG_LARGE = 4  # "large" or "xxl"
+
+
+@dataclass(frozen=True)
+class ThermalThresholds:
+    """
+    Knobs of the thermal score, defaulting to ``estimate_thermal_cost``
+
+    ``param_bins`` re-scores models with a parameter count in their id from
+    the count itself: ``((min_params, score), ...)``, checked from the largest
+    bound down. When unset, the id patterns' own scores are used.
+
+    ``parameter_bounds`` are the Low and Medium upper bounds for models with
+    an exact parameter count, which bypass the score entirely.
+    """
+
+    low_max: int = 1
+    medium_max: int = 3
+    default_score: int = 3
+    tiny_score: int = 1
+    efficient_discount: int = 2
+    large_floor: int = 5
+    param_bins: tuple[tuple[float, int], ...] | None = None
+    parameter_bounds: tuple[float, float] = PARAMETER_BOUNDS
+
+
+DEFAULT_THRESHOLDS = ThermalThresholds()
+
+
+@dataclass(frozen=True)
+class ThermalFeatures:
+    """Per-model inputs to the thermal score, one array element per model"""
+
+    size_score: np.ndarray  # int8, 0 when no size word
+    param_score: np.ndarray  # int8, 0 when no parameter count
+    param_count: np.ndarray  # float64, NaN when no parameter count
+    tag_flags: np.ndarray  # uint8, TAG_* bits
+    parameters: np.ndarray  # int64 exact count, 0 when unknown
+
+    def __len__(self) -> int:
+        return len(self.size_score)
+
+
+def model_features(model: dict[str, Any]) -> tuple[int, int, float, int, int]:
+    """(size_score, param_score, param_count, tag_flags, parameters) for one model"""
+    model_id = model.get("modelId", "").lower()
+    tags = _TAG_SEPARATOR.join(model.get("tags", [])).lower()
+
+    size = 0
+    for pattern, score in SIZE_PATTERNS:
+        if pattern in model_id:
+            size = score
+            break
+
+    param, count = 0, float("nan")
+    if "b" in model_id or "m" in model_id:
+        match = _param_match(model_id)
+        if match is not None:
+            param, count = match
+
+    flags = 0
+    if "tiny" in tags:
+        flags |= TAG_TINY
+    if "efficient" in tags or "distil" in tags:
+        flags |= TAG_EFFICIENT
+    if "large" in tags or "xxl" in tags:
+        flags |= TAG_LARGE
+
+    return size, param, count, flags, model.get("parameters") or 0
+
+
+def thermal_features(models: Iterable[dict[str, Any]]) -> ThermalFeatures:
+    """Parse ``models`` into feature columns (the only per-model Python pass)"""
+    rows = [model_features(model) for model in models]
+    size, param, count, flags, parameters = (
+        zip(*rows, strict=True) if rows else ((),) * 5
+    )
+    return ThermalFeatures(
+        size_score=np.asarray(size, dtype=np.int8),
+        param_score=np.asarray(param, dtype=np.int8),
+        param_count=np.asarray(count, dtype=np.float64),
+        tag_flags=np.asarray(flags, dtype=np.uint8),
+        parameters=np.asarray(parameters, dtype=np.int64),
+    )
+
+
+def thermal_scores(
+    features: ThermalFeatures, thresholds: ThermalThresholds = DEFAULT_THRESHOLDS
+) -> np.ndarray:
+    """Raw scores for every model, as ``_thermal_score`` computes them one by one"""
+    scores = np.where(
+        features.size_score > 0, features.size_score, thresholds.default_score
+    ).astype(np.int8)
+
+    if thresholds.param_bins is None:
+        has_param = features.param_score > 0
+        scores = np.where(has_param, features.param_score, scores)
+    else:
+        bins = sorted(thresholds.param_bins)
+        bounds = np.asarray([bound for bound, _ in bins], dtype=np.float64)
+        # Below the smallest bound falls back to the smallest bin's score
+        bin_scores = np.asarray([bins[0][1]] + [score for _, score in bins])
+        binned = bin_scores[np.searchsorted(bounds, features.param_count, "right")]
+        scores = np.where(np.isnan(features.param_count), scores, binned)
+
+    flags = features.tag_flags
+    return np.select(
+        [flags & TAG_TINY > 0, flags & TAG_EFFICIENT > 0, flags & TAG_LARGE > 0],
+        [
+            thresholds.tiny_score,
+            np.maximum(1, scores - thresholds.efficient_discount),
+            np.maximum(scores, thresholds.large_floor),
+        ],
+        scores,
+    ).astype(np.int8)
+
+
+def thermal_levels(
+    features: ThermalFeatures, thresholds: ThermalThresholds = DEFAULT_THRESHOLDS
+) -> np.ndarray:
+    """Index into ``THERMAL_LEVELS`` for every model (uint8)"""
+    scores = thermal_scores(features, thresholds)
+    from_scores = (scores > thresholds.low_max).astype(np.uint8) + (
+        scores > thresholds.medium_max
+    ).astype(np.uint8)
+    bounds = np.asarray(thresholds.parameter_bounds, dtype=np.float64)
+    from_parameters = np.searchsorted(bounds, features.parameters, "right")
+    return np.where(features.parameters > 0, from_parameters, from_scores).astype(
+        np.uint8
+    )